@@ -49,6 +49,7 @@ def readme():
 extras = {
     "geography": ["GeoAlchemy2", "shapely"],
     "alembic": ["alembic"],
+    "asyncio": ["sqlalchemy[asyncio]"],
     "tests": ["packaging", "pytz"],
     # Keep the no-op bqstorage extra for backward compatibility.
     # See: https://github.com/googleapis/python-bigquery/issues/757
@@ -125,7 +126,10 @@ setup(
     python_requires=">=3.8, <3.15",
     tests_require=["packaging", "pytz"],
     entry_points={
-        "sqlalchemy.dialects": ["bigquery = sqlalchemy_bigquery:BigQueryDialect"]
+        "sqlalchemy.dialects": [
+            "bigquery = sqlalchemy_bigquery:BigQueryDialect",
+            "bigquery.asyncio = sqlalchemy_bigquery.asyncio:BigQueryAsyncDialect",
+        ]
     },
     # Document that this replaces pybigquery, however, this isn't
     # enforced by pip, because doing so would allow rogue packages to
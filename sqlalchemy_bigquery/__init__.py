@@ -25,6 +25,7 @@ import warnings
 from .version import __version__
 
 from .base import BigQueryDialect, dialect
+from .dml import merge
 from ._types import (
     ARRAY,
     BIGNUMERIC,
@@ -77,6 +78,7 @@ __all__ = [
     "FLOAT64",
     "INT64",
     "INTEGER",
+    "merge",
     "NUMERIC",
     "RECORD",
     "STRING",
@@ -0,0 +1,138 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Time-limited, size-limited caches"""
+
+import collections
+import collections.abc
+import json
+import threading
+import time
+
+
+class TTLCache:
+    """Thread-safe cache whose entries expire after ``ttl`` seconds
+
+    At most ``maxsize`` entries are kept, evicting the least recently used.
+    The cache is disabled if ``ttl`` or ``maxsize`` isn't positive. If
+    ``max_bytes`` is given, entries are also evicted to keep the total of
+    their sizes, given by ``sizeof(value)``, within it.
+
+    Hits and misses are counted, to help tune the cache.
+    """
+
+    def __init__(self, ttl, maxsize, timer=time.monotonic, max_bytes=None, sizeof=None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.timer = timer
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.ttl and self.ttl > 0 and self.maxsize and self.maxsize > 0)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        if not self.enabled:
+            return default
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value, _ = entry
+                if expires > self.timer():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self.__remove(key)
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        if not self.enabled:
+            return
+
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        with self._lock:
+            self.__remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            self._entries[key] = self.timer() + self.ttl, value, size
+            self.bytes += size
+            while len(self._entries) > self.maxsize or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+
+    def invalidate(self, key):
+        with self._lock:
+            self.__remove(key)
+
+    def invalidate_matching(self, predicate):
+        """Remove the entries whose values match a predicate"""
+        with self._lock:
+            for key in [
+                key for key, (_, value, _) in self._entries.items() if predicate(value)
+            ]:
+                self.__remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+
+def query_key(client, operation, query_parameters=(), job_config=None):
+    """Get a cache key for a query, e.g. for its results or its cost
+
+    Query parameters are either a sequence of query parameters or a
+    mapping of DB-API-style parameter values. The client's default job
+    configuration, e.g. its default dataset, is part of the key.
+    """
+    if isinstance(query_parameters, collections.abc.Mapping):
+        query_parameters = sorted(query_parameters.items())
+    return (
+        operation,
+        repr(list(query_parameters)),
+        client.project,
+        getattr(client, "location", None),
+        _config_key(getattr(client, "default_query_job_config", None)),
+        _config_key(job_config),
+    )
+
+
+def _config_key(config):
+    if config is None:
+        return None
+    return json.dumps(config.to_api_repr(), sort_keys=True, default=str)
@@ -0,0 +1,198 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""A process-wide registry of BigQuery clients, shared by engines
+
+Building a client reads and parses its credentials, and each client has
+its own HTTP session and access token. Engines with the same settings can
+instead share a client.
+"""
+
+import collections
+import hashlib
+import json
+import os
+import threading
+import time
+
+from . import _cache
+
+
+class ClientRegistry:
+    """Thread-safe registry of clients, by key, with the number of users
+
+    Clients are acquired by users, e.g. engines, and released when they're
+    no longer needed. Clients no one is using are kept, for other users to
+    acquire, for up to ``idle_ttl`` seconds, and at most ``max_idle`` of
+    them, evicting the least recently released. Evicted clients are closed.
+
+    Hits and misses are counted, to help tune the registry.
+    """
+
+    def __init__(self, max_idle=16, idle_ttl=600, timer=time.monotonic):
+        self.max_idle = max_idle
+        self.idle_ttl = idle_ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        # key -> [client, users, time released]
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def acquire(self, key, create):
+        """Get the client for a key, creating it with ``create()`` if needed"""
+        with self._lock:
+            client = self.__acquire(key)
+            if client is not None:
+                self.hits += 1
+                return client
+            self.misses += 1
+
+        # Create clients without holding the lock, as it may take a while.
+        client = create()
+        with self._lock:
+            existing = self.__acquire(key)
+            if existing is None:
+                self._entries[key] = [client, 1, None]
+        if existing is not None:
+            # Another thread created a client for the key first.
+            _close(client)
+            return existing
+        return client
+
+    def __acquire(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry[1] += 1
+        entry[2] = None
+        return entry[0]
+
+    def release(self, key):
+        """Stop using the client for a key"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > 0:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    entry[2] = self.timer()
+                    self._entries.move_to_end(key)
+            evicted = self.__evict()
+        for client in evicted:
+            _close(client)
+
+    def evict(self):
+        """Close idle clients that have been idle for too long"""
+        with self._lock:
+            evicted = self.__evict()
+        for client in evicted:
+            _close(client)
+
+    def __evict(self):
+        # Idle entries, least recently released first.
+        idle = [key for key, (_, users, _) in self._entries.items() if users == 0]
+        now = self.timer()
+        evicted = []
+        for i, key in enumerate(idle):
+            if (
+                len(idle) - i > self.max_idle
+                or now - self._entries[key][2] >= self.idle_ttl
+            ):
+                evicted.append(self._entries.pop(key)[0])
+        return evicted
+
+    def dispose(self):
+        """Close and forget all of the clients, e.g. when shutting down
+
+        Engines still using a client keep it, but it opens new HTTP
+        connections if they use it again.
+        """
+        with self._lock:
+            clients = [client for client, _, _ in self._entries.values()]
+            self._entries.clear()
+        for client in clients:
+            _close(client)
+
+
+def _close(client):
+    close = getattr(client, "close", None)
+    if close is not None:
+        close()
+
+
+def client_key(
+    credentials_info=None,
+    credentials_path=None,
+    credentials_base64=None,
+    default_query_job_config=None,
+    location=None,
+    project_id=None,
+    user_agent=None,
+    default_job_creation_mode=None,
+    http_pool_connections=None,
+    http_pool_maxsize=None,
+):
+    """Get the registry key for the arguments of ``create_bigquery_client()``
+
+    Credentials are identified by their source: a hash of their contents,
+    or their file's path and modification time, so that a replaced key
+    file gets a new client.
+    """
+    if credentials_path:
+        path = os.path.abspath(credentials_path)
+        try:
+            modified = os.stat(path).st_mtime_ns
+        except OSError:
+            modified = None
+        credentials = ("path", path, modified)
+    elif credentials_base64:
+        credentials = ("base64", _hash(credentials_base64))
+    elif credentials_info:
+        credentials = (
+            "info",
+            _hash(json.dumps(credentials_info, sort_keys=True, default=str)),
+        )
+    else:
+        credentials = ("default",)
+
+    return (
+        credentials,
+        project_id,
+        location,
+        _cache._config_key(default_query_job_config),
+        default_job_creation_mode,
+        None if user_agent is None else str(user_agent),
+        http_pool_connections,
+        http_pool_maxsize,
+    )
+
+
+def _hash(secret):
+    # Keys don't keep the credentials themselves.
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+# The registry shared by engines with shared_client=True.
+registry = ClientRegistry()
@@ -0,0 +1,385 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Cursor that runs queries with the BigQuery client directly
+
+Used for statements compiled with native query parameters, and when
+results are fetched in ways the DB-API doesn't support.
+"""
+
+import collections.abc
+import concurrent.futures
+import copy
+import itertools
+import queue
+import threading
+import weakref
+
+from google.cloud.bigquery import QueryJobConfig
+from google.cloud.bigquery.dbapi import _helpers as dbapi_helpers
+from google.cloud.bigquery.dbapi import cursor as dbapi_cursor
+from google.cloud.bigquery.dbapi import exceptions
+import google.cloud.exceptions
+
+
+class RestApiFetcher:
+    """Fetches query results a page at a time with the BigQuery REST API"""
+
+    def pages(self, rows, connection):
+        """Iterate over pages (iterables of rows) of query results"""
+        return rows.pages
+
+    def record_batches(self, rows, connection):
+        """Iterate over the results as Arrow record batches"""
+        return rows.to_arrow_iterable()
+
+
+class StorageApiFetcher:
+    """Downloads query results with the BigQuery Storage Read API
+
+    Results are downloaded as Arrow record batches. If a BigQuery Storage
+    client isn't available, or if the results are small enough to have
+    been returned with the query, results are fetched with the REST API.
+    """
+
+    def pages(self, rows, connection):
+        for batch in self.record_batches(rows, connection):
+            yield record_batch_rows(batch)
+
+    def record_batches(self, rows, connection):
+        bqstorage_client = getattr(connection, "_bqstorage_client", None)
+        return rows.to_arrow_iterable(bqstorage_client=bqstorage_client)
+
+
+class PagePrefetcher:
+    """Iterate over pages, fetching up to ``size`` pages ahead on a worker thread
+
+    Lets the next pages download while rows of the current page are being
+    processed. Pages are converted to lists of rows on the worker thread.
+    """
+
+    _done = object()
+
+    def __init__(self, pages, size):
+        self._queue = queue.Queue()
+        # A slot is taken for each page fetched and given back as pages are
+        # consumed, to limit how far ahead the worker gets.
+        self._slots = threading.Semaphore(size)
+        self._stopped = threading.Event()
+        self._finished = False
+        # The worker only gets the state it shares with us, not us, so if
+        # we're dropped without being closed we're still collected, and the
+        # finalizer stops the worker and frees the pages it buffered.
+        self._thread = threading.Thread(
+            target=_prefetch,
+            args=(pages, self._queue, self._slots, self._stopped),
+            name="sqlalchemy-bigquery-prefetch",
+            daemon=True,
+        )
+        self._thread.start()
+        self._stop = weakref.finalize(
+            self, _stop_prefetching, self._slots, self._stopped
+        )
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._finished:
+            raise StopIteration
+
+        page = self._queue.get()
+        if page is self._done:
+            self._finished = True
+            raise StopIteration
+        if isinstance(page, _PrefetchError):
+            self._finished = True
+            raise page.exc
+
+        self._slots.release()
+        return page
+
+    def close(self):
+        """Stop fetching pages"""
+        self._finished = True
+        self._stop()
+
+
+def _prefetch(pages, pages_queue, slots, stopped):
+    try:
+        pages = iter(pages)
+        while True:
+            slots.acquire()
+            if stopped.is_set():
+                return
+            page = next(pages, PagePrefetcher._done)
+            if page is PagePrefetcher._done:
+                pages_queue.put(page)
+                return
+            pages_queue.put(list(page))
+    except Exception as exc:
+        pages_queue.put(_PrefetchError(exc))
+
+
+def _stop_prefetching(slots, stopped):
+    stopped.set()
+    # Wake the worker if it's waiting for a slot.
+    slots.release()
+
+
+class _PrefetchError:
+    def __init__(self, exc):
+        self.exc = exc
+
+
+def record_batch_rows(batch):
+    """Convert an Arrow record batch to a list of row tuples"""
+    return list(zip(*(column.to_pylist() for column in batch.columns)))
+
+
+class Cursor:
+    """DB-API-style cursor that runs queries with the BigQuery client
+
+    Operations are submitted, with their query parameters, to
+    ``Client.query_and_wait``. Query parameters are either a sequence of
+    already-built query parameters, for operations with ``@name``
+    parameters, or a mapping of values for operations with DB-API-style
+    ``%(name:TYPE)s`` parameters.
+
+    Results are fetched with a fetcher, which provides pages of rows, and
+    can also provide the results as Arrow record batches. If
+    ``prefetch_pages`` is set, up to that many pages are fetched ahead on a
+    worker thread as rows are fetched.
+
+    Queries create jobs as the client's ``default_job_creation_mode``
+    says, unless ``job_creation_mode`` is ``JOB_CREATION_REQUIRED``, in
+    which case they're started as jobs.
+
+    If ``jobs``, a ``_jobs.RunningJobs``, is given, queries are instead
+    started as jobs, which are tracked while they're waited for, for at
+    most ``timeout`` seconds, so that they can be cancelled, e.g. when the
+    cursor is closed.
+    """
+
+    def __init__(
+        self,
+        connection,
+        fetcher=None,
+        prefetch_pages=0,
+        jobs=None,
+        timeout=None,
+        job_creation_mode=None,
+    ):
+        self.connection = connection
+        self.fetcher = fetcher or RestApiFetcher()
+        self.prefetch_pages = prefetch_pages
+        self.jobs = jobs
+        self.timeout = timeout
+        self.job_creation_mode = job_creation_mode
+        self.description = None
+        self.rowcount = -1
+        self.arraysize = None
+        # The (last) query job, if queries are run as jobs.
+        self.job = None
+        self._query_rows = None
+        self._query_data = None
+        self._prefetcher = None
+
+    @property
+    def job_running(self):
+        """Whether a query job is being waited for"""
+        return self.job is not None and self.jobs is not None and self.job in self.jobs
+
+    def close(self):
+        if self.job is not None and self.jobs is not None:
+            # Cancel the job if it's still being waited for, e.g. by
+            # another thread.
+            self.jobs.cancel(self.job)
+        self.__reset()
+
+    def __reset(self):
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+        self._query_rows = None
+        self._query_data = None
+
+    def execute(self, operation, query_parameters=(), job_config=None):
+        self.__reset()
+        self.description = None
+        self.rowcount = -1
+        self.job = None
+
+        if isinstance(query_parameters, collections.abc.Mapping):
+            operation, query_parameters = _format_operation(operation, query_parameters)
+
+        # The job configuration is passed as an execution option, so
+        # don't modify it.
+        config = copy.deepcopy(job_config) if job_config else QueryJobConfig()
+        config.query_parameters = list(query_parameters)
+
+        client = self.connection._client
+        try:
+            if self.jobs is not None and not config.dry_run:
+                rows = self.__wait(client.query(operation, job_config=config))
+            elif self.__job_required(client):
+                self.job = client.query(operation, job_config=config)
+                rows = self.job.result(page_size=self.arraysize)
+            elif hasattr(client, "query_and_wait"):
+                rows = client.query_and_wait(
+                    operation, job_config=config, page_size=self.arraysize
+                )
+            else:  # pragma: NO COVER
+                # google-cloud-bigquery < 3.14
+                rows = client.query(operation, job_config=config).result(
+                    page_size=self.arraysize
+                )
+        except google.cloud.exceptions.GoogleCloudError as exc:
+            raise exceptions.DatabaseError(exc)
+
+        if config.dry_run:
+            self.rowcount = 0
+            return
+
+        self.description = _description(rows.schema)
+        self.rowcount = _rowcount(rows)
+        self._query_rows = rows
+
+    def __job_required(self, client):
+        # Whether a job is required, but the client's queries may not
+        # create one. Requests get their job creation mode from the
+        # client, so the query is started as a job instead.
+        return (
+            self.job_creation_mode == "JOB_CREATION_REQUIRED"
+            and getattr(client, "default_job_creation_mode", None)
+            == "JOB_CREATION_OPTIONAL"
+        )
+
+    def __wait(self, job):
+        self.job = job
+        with self.jobs.waiting(self.connection, job):
+            try:
+                return job.result(page_size=self.arraysize, timeout=self.timeout)
+            except concurrent.futures.TimeoutError:
+                raise exceptions.DatabaseError(
+                    f"Query job {job.job_id} didn't finish within"
+                    f" {self.timeout} seconds."
+                )
+
+    def executemany(self, operation, seq_of_query_parameters, job_config=None):
+        rowcount = 0
+        for query_parameters in seq_of_query_parameters:
+            self.execute(operation, query_parameters, job_config)
+            rowcount += self.rowcount
+        self.rowcount = rowcount
+
+    def buffer(self):
+        """Fetch the remaining rows, keeping them to be fetched, and return them"""
+        rows = list(self.__data())
+        self._query_data = iter(rows)
+        return rows
+
+    def load(self, description, rowcount, rows):
+        """Set results that have already been fetched, e.g. cached ones"""
+        self.__reset()
+        self.description = description
+        self.rowcount = rowcount
+        self._query_data = iter(rows)
+
+    def fetchone(self):
+        return next(self.__data(), None)
+
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize or 1
+        return list(itertools.islice(self.__data(), size))
+
+    def fetchall(self):
+        return list(self.__data())
+
+    def record_batches(self):
+        """Iterate over the (unfetched) results as Arrow record batches"""
+        if self._query_data is not None:
+            raise exceptions.InterfaceError(
+                "Can't get record batches after starting to fetch rows."
+            )
+
+        rows = self._query_rows
+        self._query_data = iter(())
+        if rows is None:
+            return iter(())
+
+        return self.fetcher.record_batches(rows, self.connection)
+
+    def __data(self):
+        if self._query_data is None:
+            rows = self._query_rows
+            if rows is None:
+                self._query_data = iter(())
+            else:
+                pages = self.fetcher.pages(rows, self.connection)
+                if self.prefetch_pages:
+                    pages = self._prefetcher = PagePrefetcher(
+                        pages, self.prefetch_pages
+                    )
+                self._query_data = itertools.chain.from_iterable(pages)
+
+        return self._query_data
+
+    def setinputsizes(self, sizes):
+        pass
+
+    def setoutputsize(self, size, column=None):
+        pass
+
+
+def _format_operation(operation, parameters):
+    # Convert DB-API-style parameters to query parameters, as the DB-API
+    # does.
+    operation, parameter_types = dbapi_cursor._format_operation(operation, parameters)
+    return operation, dbapi_helpers.to_query_parameters(parameters, parameter_types)
+
+
+def _description(schema):
+    if not schema:
+        return None
+
+    return tuple(
+        dbapi_cursor.Column(
+            name=field.name,
+            type_code=field.field_type,
+            display_size=None,
+            internal_size=None,
+            precision=None,
+            scale=None,
+            null_ok=field.is_nullable,
+        )
+        for field in schema
+    )
+
+
+def _rowcount(rows):
+    # Like the DB-API, report the number of modified rows for DML and
+    # the number of result rows otherwise.
+    num_dml_affected_rows = rows.num_dml_affected_rows
+    if num_dml_affected_rows is not None and num_dml_affected_rows > 0:
+        return num_dml_affected_rows
+    if rows.total_rows is not None and rows.total_rows > 0:
+        return rows.total_rows
+    return 0
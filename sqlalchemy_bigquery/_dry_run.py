@@ -0,0 +1,91 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Estimating the cost of statements with dry runs
+
+A dry run validates a query and reports how many bytes it would process,
+and which tables it reads, without running it, or being billed. Results
+are cached by the query's text, parameters and configuration, as the
+same statements tend to be estimated repeatedly, e.g. when their budget
+is checked with the ``bigquery_max_bytes`` execution option.
+"""
+
+import collections
+import collections.abc
+import copy
+
+from google.cloud.bigquery import QueryJobConfig
+from google.cloud.bigquery.dbapi import exceptions
+import google.cloud.exceptions
+
+from . import _cache, _cursor
+
+Estimate = collections.namedtuple(
+    "Estimate", ["total_bytes_processed", "referenced_tables"]
+)
+Estimate.__doc__ = """The estimated cost of a statement
+
+``total_bytes_processed`` is the number of bytes the statement would
+process, and ``referenced_tables`` the ids, ``project.dataset.table``, of
+the tables it would read.
+"""
+
+
+class DryRunner:
+    """Estimate the cost of queries with dry-run query jobs
+
+    Estimates are cached for ``cache_ttl`` seconds, keeping at most
+    ``cache_size``, least recently used, estimates. The cache is disabled
+    if either isn't positive.
+    """
+
+    def __init__(self, cache_ttl, cache_size):
+        self.cache = _cache.TTLCache(cache_ttl, cache_size)
+
+    def estimate(self, client, operation, query_parameters=(), job_config=None):
+        """Estimate the cost of a query
+
+        Query parameters are either a sequence of already-built query
+        parameters, or a mapping of values for DB-API-style parameters, as
+        for ``_cursor.Cursor.execute``.
+        """
+        if isinstance(query_parameters, collections.abc.Mapping):
+            operation, query_parameters = _cursor._format_operation(
+                operation, query_parameters
+            )
+
+        key = _cache.query_key(client, operation, query_parameters, job_config)
+        estimate = self.cache.get(key)
+        if estimate is None:
+            # The job configuration is passed as an execution option, so
+            # don't modify it.
+            config = copy.deepcopy(job_config) if job_config else QueryJobConfig()
+            config.query_parameters = list(query_parameters)
+            config.dry_run = True
+            config.use_query_cache = False
+            try:
+                job = client.query(operation, job_config=config)
+            except google.cloud.exceptions.GoogleCloudError as exc:
+                raise exceptions.DatabaseError(exc)
+            estimate = Estimate(
+                job.total_bytes_processed or 0,
+                tuple(str(table) for table in job.referenced_tables or ()),
+            )
+            self.cache.set(key, estimate)
+        return estimate
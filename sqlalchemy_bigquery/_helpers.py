@@ -10,14 +10,24 @@ from typing import Optional
 
 from google.api_core import client_info
 import google.auth
+import google.auth.transport.requests
 from google.cloud import bigquery
 from google.oauth2 import service_account
+import packaging.version
 import sqlalchemy
 import base64
 import json
+import requests.adapters
 
 
 USER_AGENT_TEMPLATE = "sqlalchemy/{}"
+# As google.cloud.client.Client uses for the sessions it creates.
+_CREDENTIALS_REFRESH_TIMEOUT = 300
+
+# The first google-cloud-bigquery whose clients have a
+# default_job_creation_mode.
+_JOB_CREATION_MODE_VERSION = packaging.version.parse("3.34.0")
+
 SCOPES = (
     "https://www.googleapis.com/auth/bigquery",
     "https://www.googleapis.com/auth/cloud-platform",
@@ -46,6 +56,9 @@ def create_bigquery_client(
     location: Optional[str] = None,
     project_id: Optional[str] = None,
     user_agent: Optional[google.api_core.client_info.ClientInfo] = None,
+    default_job_creation_mode: Optional[str] = None,
+    http_pool_connections: Optional[int] = None,
+    http_pool_maxsize: Optional[int] = None,
 ) -> google.cloud.bigquery.Client:
     """Construct a BigQuery client object.
 
@@ -65,6 +78,14 @@ def create_bigquery_client(
             requests. If ``None``, then default info will be used. Generally,
             you only need to set this if you're developing your own library
             or partner tool.
+        default_job_creation_mode (Optional[str]):
+            Whether queries create jobs, e.g. ``JOB_CREATION_OPTIONAL`` to
+            create them only if they're needed.
+        http_pool_connections (Optional[int]):
+            The number of hosts to keep pools of HTTP connections for.
+        http_pool_maxsize (Optional[int]):
+            The number of HTTP connections to keep, per host, e.g. as many
+            as the threads making requests at once.
     """
 
     default_project = None
@@ -92,13 +113,63 @@ def create_bigquery_client(
 
     client_info = google_client_info(user_agent=user_agent)
 
+    kwargs = {}
+    if default_job_creation_mode is not None:
+        if packaging.version.parse(bigquery.__version__) < _JOB_CREATION_MODE_VERSION:
+            raise ValueError(
+                f"job_creation_mode needs google-cloud-bigquery"
+                f" {_JOB_CREATION_MODE_VERSION} or later, not {bigquery.__version__}"
+            )
+        kwargs["default_job_creation_mode"] = default_job_creation_mode
+    if http_pool_connections is not None or http_pool_maxsize is not None:
+        kwargs["_http"] = create_http_session(
+            credentials, http_pool_connections, http_pool_maxsize
+        )
+
     return bigquery.Client(
         client_info=client_info,
         project=project_id,
         credentials=credentials,
         location=location,
         default_query_job_config=default_query_job_config,
+        **kwargs,
+    )
+
+
+def create_http_session(
+    credentials,
+    pool_connections: Optional[int] = None,
+    pool_maxsize: Optional[int] = None,
+    client_cert_source=None,
+) -> google.auth.transport.requests.AuthorizedSession:
+    """Create an authorized HTTP session with sized connection pools
+
+    By default, ``requests`` keeps 10 connections per host. Requests made
+    by more threads at once open connections that are discarded afterwards,
+    logging "Connection pool is full" warnings.
+
+    The session is set up as ``google.cloud.bigquery.Client`` would set up
+    its own, including its mutual TLS channel, if one is configured, and
+    then its adapters' pools are sized.
+    """
+    if pool_connections is None:
+        pool_connections = requests.adapters.DEFAULT_POOLSIZE
+    if pool_maxsize is None:
+        pool_maxsize = requests.adapters.DEFAULT_POOLSIZE
+
+    session = google.auth.transport.requests.AuthorizedSession(
+        credentials, refresh_timeout=_CREDENTIALS_REFRESH_TIMEOUT
     )
+    session.configure_mtls_channel(client_cert_source)
+    for adapter in session.adapters.values():
+        # Resize the adapters' pools, rather than replacing the adapters,
+        # so that mutual TLS adapters keep their SSL contexts.
+        adapter._pool_connections = pool_connections
+        adapter._pool_maxsize = pool_maxsize
+        adapter.init_poolmanager(
+            pool_connections, pool_maxsize, block=adapter._pool_block
+        )
+    return session
 
 
 def substitute_re_method(r, flags=0, repl=None):
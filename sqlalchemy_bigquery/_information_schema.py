@@ -0,0 +1,243 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Reflection from a dataset's INFORMATION_SCHEMA views
+
+Used with ``reflection_source=information_schema``. All of a dataset's
+tables, with their columns, descriptions and view definitions, are read
+with one query, and converted to the table resources the BigQuery API
+would return, so that they're reflected the same way.
+"""
+
+import ast
+import re
+
+from google.cloud.bigquery.schema import SchemaField
+from google.cloud.bigquery.table import Table
+
+QUERY = """\
+SELECT
+  t.table_name,
+  t.table_type,
+  v.view_definition,
+  o.option_value AS table_description,
+  c.column_name,
+  c.field_path,
+  c.data_type,
+  c.description,
+  cols.is_nullable,
+  cols.ordinal_position
+FROM {dataset}.INFORMATION_SCHEMA.TABLES AS t
+LEFT JOIN {dataset}.INFORMATION_SCHEMA.VIEWS AS v
+  ON v.table_name = t.table_name
+LEFT JOIN {dataset}.INFORMATION_SCHEMA.TABLE_OPTIONS AS o
+  ON o.table_name = t.table_name AND o.option_name = 'description'
+LEFT JOIN {dataset}.INFORMATION_SCHEMA.COLUMN_FIELD_PATHS AS c
+  ON c.table_name = t.table_name
+LEFT JOIN {dataset}.INFORMATION_SCHEMA.COLUMNS AS cols
+  ON cols.table_name = c.table_name
+  AND cols.column_name = c.column_name
+  AND c.field_path = c.column_name
+"""
+
+# INFORMATION_SCHEMA table types, as the BigQuery API reports them.
+_table_types = {
+    "BASE TABLE": "TABLE",
+    "CLONE": "TABLE",
+    "MATERIALIZED VIEW": "MATERIALIZED_VIEW",
+}
+
+# SQL type names, as the BigQuery API reports them.
+_field_types = {
+    "BOOL": "BOOLEAN",
+    "FLOAT64": "FLOAT",
+    "INT64": "INTEGER",
+    "STRUCT": "RECORD",
+}
+
+
+class InformationSchema:
+    """Reads a dataset's tables from its INFORMATION_SCHEMA views
+
+    Replaceable, e.g. with a stand-in that serves rows for tests.
+    """
+
+    def query_rows(self, client, project_id, dataset_id):
+        """Get the rows of the INFORMATION_SCHEMA query for a dataset
+
+        Rows have the columns selected by ``QUERY``, one per (possibly
+        nested) column field, or one with null column values for tables
+        without columns.
+        """
+        query = QUERY.format(dataset=f"`{project_id}.{dataset_id}`")
+        if hasattr(client, "query_and_wait"):
+            return client.query_and_wait(query)
+        # google-cloud-bigquery < 3.14
+        return client.query(query).result()
+
+    def tables(self, client, project_id, dataset_id):
+        """Get a dataset's tables, by name"""
+        tables = {}
+        columns = {}
+        descriptions = {}
+        for row in self.query_rows(client, project_id, dataset_id):
+            table_name = row["table_name"]
+            if table_name not in tables:
+                tables[table_name] = row
+                columns[table_name] = []
+            if row["field_path"] is None:
+                continue
+            descriptions[table_name, row["field_path"]] = row["description"]
+            if row["field_path"] == row["column_name"]:
+                columns[table_name].append(row)
+
+        return {
+            table_name: _table(
+                project_id,
+                dataset_id,
+                row,
+                [
+                    _schema_field(column, descriptions)
+                    for column in sorted(
+                        columns[table_name], key=lambda c: c["ordinal_position"]
+                    )
+                ],
+            )
+            for table_name, row in tables.items()
+        }
+
+
+def _table(project_id, dataset_id, row, schema):
+    resource = {
+        "tableReference": {
+            "projectId": project_id,
+            "datasetId": dataset_id,
+            "tableId": row["table_name"],
+        },
+        "type": _table_types.get(row["table_type"], row["table_type"]),
+        "schema": {"fields": [field.to_api_repr() for field in schema]},
+    }
+    if row["table_description"] is not None:
+        resource["description"] = _string_literal_value(row["table_description"])
+    if row["view_definition"] is not None:
+        resource["view"] = {"query": row["view_definition"]}
+    return Table.from_api_repr(resource)
+
+
+def _string_literal_value(literal):
+    # Option values are formatted as string literals, e.g. "some \"text\"".
+    try:
+        value = ast.literal_eval(literal)
+    except (SyntaxError, ValueError):
+        return literal
+    return value if isinstance(value, str) else literal
+
+
+def _schema_field(column, descriptions):
+    field = parse_data_type(column["data_type"])
+    if column["is_nullable"] == "NO" and field["mode"] == "NULLABLE":
+        field["mode"] = "REQUIRED"
+    return SchemaField.from_api_repr(
+        _describe(column["table_name"], column["column_name"], field, descriptions)
+    )
+
+
+def _describe(table_name, field_path, field, descriptions):
+    field["name"] = field_path.rsplit(".", 1)[-1]
+    description = descriptions.get((table_name, field_path))
+    if description is not None:
+        field["description"] = description
+    for subfield in field.get("fields", ()):
+        _describe(
+            table_name, f"{field_path}.{subfield['name']}", subfield, descriptions
+        )
+    return field
+
+
+_tokens = re.compile(r"\s*(`(?:[^`\\]|\\.)*`|\w+|[<>(),])")
+
+
+def parse_data_type(data_type):
+    """Convert a SQL data type to (the API representation of) a schema field
+
+    E.g. ``ARRAY<STRUCT<a INT64, b STRING(10)>>``.
+    """
+    tokens = _tokens.findall(data_type)
+    tokens.reverse()
+    field = _parse_type(tokens)
+    if tokens:
+        raise ValueError(f"Did not understand data type: {data_type}")
+    return field
+
+
+def _parse_type(tokens):
+    if not tokens:
+        raise ValueError("Expected a type in data type")
+    name = tokens.pop().upper()
+    if name == "ARRAY":
+        _expect(tokens, "<")
+        field = _parse_type(tokens)
+        _expect(tokens, ">")
+        field["mode"] = "REPEATED"
+        return field
+
+    field = {"type": _field_types.get(name, name), "mode": "NULLABLE"}
+    if name == "STRUCT":
+        _expect(tokens, "<")
+        field["fields"] = fields = []
+        while True:
+            if not tokens:
+                raise ValueError("Expected a field in data type")
+            subfield_name = tokens.pop().strip("`")
+            subfield = _parse_type(tokens)
+            subfield["name"] = subfield_name
+            fields.append(subfield)
+            if _peek(tokens) != ",":
+                break
+            tokens.pop()
+        _expect(tokens, ">")
+    elif _peek(tokens) == "<":
+        # E.g. RANGE<DATE>
+        tokens.pop()
+        _parse_type(tokens)
+        _expect(tokens, ">")
+    elif _peek(tokens) == "(":
+        tokens.pop()
+        parameters = [int(tokens.pop())]
+        while _peek(tokens) == ",":
+            tokens.pop()
+            parameters.append(int(tokens.pop()))
+        _expect(tokens, ")")
+        if name in ("STRING", "BYTES"):
+            field["maxLength"] = parameters[0]
+        else:
+            field["precision"] = parameters[0]
+            if len(parameters) > 1:
+                field["scale"] = parameters[1]
+
+    return field
+
+
+def _peek(tokens):
+    return tokens[-1] if tokens else None
+
+
+def _expect(tokens, token):
+    if not tokens or tokens.pop() != token:
+        raise ValueError(f"Expected {token!r} in data type")
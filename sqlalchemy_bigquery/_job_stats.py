@@ -0,0 +1,92 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Statistics of the query jobs statements are run with"""
+
+import collections
+
+JobStats = collections.namedtuple(
+    "JobStats",
+    [
+        "job_id",
+        "query_id",
+        "project",
+        "location",
+        "total_bytes_processed",
+        "slot_millis",
+        "cache_hit",
+        "created",
+        "started",
+        "ended",
+        "query_path",
+    ],
+)
+JobStats.__doc__ = """Statistics of the query job a statement was run with
+
+Statistics BigQuery didn't report are None. E.g. ``cache_hit`` is only
+known for queries that return rows.
+
+``query_path`` is how the query was run: ``"jobs.insert"`` if it was
+started as a job, which was waited for, ``"jobs.query"`` if it was run
+with ``jobs.query``, or ``"jobless"`` if it was run with ``jobs.query``
+without creating a job, with the ``optional`` job creation mode.
+"""
+
+# Ways queries are run. See JobStats.
+JOBS_INSERT = "jobs.insert"
+JOBS_QUERY = "jobs.query"
+JOBLESS = "jobless"
+
+
+def from_rows(rows, job_started=False):
+    """Get the statistics of the query whose results are ``rows``
+
+    ``rows`` is the ``RowIterator`` the query's results are fetched with,
+    which has its statistics, so no further requests are made. Returns
+    None if there are no results, e.g. for dry runs. ``job_started`` says
+    whether the query was started as a job, rather than with
+    ``jobs.query``.
+    """
+    if rows is None:
+        return None
+
+    job_id = getattr(rows, "job_id", None)
+    if job_started:
+        query_path = JOBS_INSERT
+    elif job_id is None and getattr(rows, "query_id", None) is not None:
+        query_path = JOBLESS
+    else:
+        query_path = JOBS_QUERY
+
+    # The response with the first page of results says whether they came
+    # from BigQuery's cache.
+    first_page_response = getattr(rows, "_first_page_response", None) or {}
+    return JobStats(
+        job_id=job_id,
+        query_id=getattr(rows, "query_id", None),
+        project=getattr(rows, "project", None),
+        location=getattr(rows, "location", None),
+        total_bytes_processed=getattr(rows, "total_bytes_processed", None),
+        slot_millis=getattr(rows, "slot_millis", None),
+        cache_hit=first_page_response.get("cacheHit"),
+        created=getattr(rows, "created", None),
+        started=getattr(rows, "started", None),
+        ended=getattr(rows, "ended", None),
+        query_path=query_path,
+    )
@@ -0,0 +1,99 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""Cancelling query jobs whose results are no longer wanted
+
+A query job keeps running, and using slots, until it finishes, even if
+whatever was waiting for it has given up.
+"""
+
+import contextlib
+import threading
+
+import google.api_core.exceptions
+
+
+class RunningJobs:
+    """The query jobs that statements are waiting for, by connection
+
+    A job is cancelled, with ``jobs.cancel``, if it's still running when
+    waiting for it fails, e.g. because of ``KeyboardInterrupt`` or a
+    timeout, when its cursor is closed, or when its connection is closed,
+    e.g. because it's invalidated. The number of jobs cancelled is
+    counted, as ``cancelled``.
+    """
+
+    def __init__(self):
+        self.cancelled = 0
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def waiting(self, connection, job):
+        """Track a connection's job while waiting for it
+
+        The job is cancelled if waiting for it fails.
+        """
+        with self._lock:
+            self._jobs[id(job)] = connection, job
+        try:
+            yield job
+        except BaseException:
+            self.cancel(job)
+            raise
+        finally:
+            with self._lock:
+                self._jobs.pop(id(job), None)
+
+    def __contains__(self, job):
+        # Whether a job is being waited for.
+        return id(job) in self._jobs
+
+    def running(self, connection):
+        """Get the jobs that a connection's statements are waiting for"""
+        with self._lock:
+            return [job for conn, job in self._jobs.values() if conn is connection]
+
+    def cancel(self, job):
+        """Cancel a job that's being waited for, if it's still running
+
+        Returns whether it was cancelled.
+        """
+        with self._lock:
+            if self._jobs.pop(id(job), None) is None:
+                # It isn't being waited for, or it's already been cancelled.
+                return False
+
+        if job.done(reload=False):
+            return False
+        try:
+            job.cancel()
+        except google.api_core.exceptions.GoogleAPICallError:
+            # E.g. it finished or failed meanwhile.
+            return False
+
+        with self._lock:
+            self.cancelled += 1
+        return True
+
+    def cancel_connection(self, connection):
+        """Cancel the running jobs of a connection's statements
+
+        Returns the number of jobs cancelled.
+        """
+        return sum(self.cancel(job) for job in self.running(connection))
@@ -0,0 +1,98 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Inserting rows with load jobs
+
+Used for executemany INSERTs with ``insert_strategy="load_job"``. Rather
+than being run as DML, the rows are serialized, in memory, to
+newline-delimited JSON or Parquet, according to the destination table's
+schema, and appended to the table with one load job.
+"""
+
+import io
+import json
+
+from google.cloud.bigquery import _helpers as bigquery_helpers
+from google.cloud.bigquery import LoadJobConfig, SourceFormat, WriteDisposition
+
+SOURCE_FORMATS = {
+    "json": SourceFormat.NEWLINE_DELIMITED_JSON,
+    "parquet": SourceFormat.PARQUET,
+}
+
+
+def load_rows(client, table, rows, source_format="json"):
+    """Append rows, dictionaries of values by column name, to a table
+
+    The table must have its schema, e.g. be fetched with ``get_table()``.
+    Returns the (finished) load job.
+    """
+    job_config = LoadJobConfig(
+        source_format=SOURCE_FORMATS[source_format],
+        write_disposition=WriteDisposition.WRITE_APPEND,
+    )
+    if source_format == "parquet":
+        data = to_parquet(table.schema, rows)
+    else:
+        data = to_json(table.schema, rows)
+        job_config.schema = table.schema
+
+    job = client.load_table_from_file(
+        io.BytesIO(data), table.reference, job_config=job_config
+    )
+    job.result()
+    return job
+
+
+def to_json(schema, rows):
+    """Serialize rows to newline-delimited JSON"""
+    return b"".join(
+        json.dumps(
+            bigquery_helpers._record_field_to_json(schema, row), ensure_ascii=False
+        ).encode("utf-8")
+        + b"\n"
+        for row in rows
+    )
+
+
+def to_parquet(schema, rows):
+    """Serialize rows to Parquet"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:  # pragma: NO COVER
+        raise ImportError(
+            "Loading Parquet requires pyarrow."
+            " Install it with: pip install 'sqlalchemy-bigquery[bqstorage]'"
+        )
+    from google.cloud.bigquery import _pandas_helpers
+
+    arrow_schema = _pandas_helpers.bq_to_arrow_schema(schema)
+    if arrow_schema is None:
+        raise ValueError(
+            "Can't convert the table's schema to Arrow to load Parquet;"
+            " use load_job_format='json' instead."
+        )
+
+    columns = {name: [row.get(name) for row in rows] for name in arrow_schema.names}
+    buffer = io.BytesIO()
+    pyarrow.parquet.write_table(
+        pyarrow.Table.from_pydict(columns, schema=arrow_schema), buffer
+    )
+    return buffer.getvalue()
@@ -0,0 +1,91 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Checking connections without running query jobs
+
+SQLAlchemy's default ``pool_pre_ping`` runs ``SELECT 1``, which, on
+BigQuery, is a query job.
+"""
+
+import threading
+import time
+import weakref
+
+import google.api_core.exceptions
+import google.auth.exceptions
+import google.auth.transport.requests
+import requests.exceptions
+
+# Errors that mean a client can't make requests, rather than that a
+# request failed.
+_CONNECTION_ERRORS = (
+    google.auth.exceptions.GoogleAuthError,
+    google.api_core.exceptions.Unauthorized,
+    requests.exceptions.RequestException,
+)
+
+
+class Pinger:
+    """Checks that BigQuery clients can still make requests
+
+    A client is pinged with a metadata request, getting its default
+    dataset, or, without one, by checking that its credentials are valid,
+    refreshing them if they've expired. Clients pinged successfully in the
+    last ``interval`` seconds aren't pinged again. Pings time out after
+    ``timeout`` seconds, without being retried.
+    """
+
+    def __init__(self, interval, timeout=10, timer=time.monotonic):
+        self.interval = interval
+        self.timeout = timeout
+        self.timer = timer
+        self._pinged = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def ping(self, client, dataset_ref=None):
+        """Check a client, returning whether it can still make requests"""
+        with self._lock:
+            pinged = self._pinged.get(client)
+        now = self.timer()
+        if pinged is not None and now - pinged < self.interval:
+            return True
+
+        try:
+            if dataset_ref is not None:
+                client.get_dataset(dataset_ref, retry=None, timeout=self.timeout)
+            else:
+                _check_credentials(client)
+        except _CONNECTION_ERRORS:
+            with self._lock:
+                self._pinged.pop(client, None)
+            return False
+        except google.api_core.exceptions.GoogleAPICallError:
+            # BigQuery responded, e.g. that the dataset doesn't exist, so
+            # the client can make requests.
+            pass
+
+        with self._lock:
+            self._pinged[client] = now
+        return True
+
+
+def _check_credentials(client):
+    credentials = getattr(client, "_credentials", None)
+    if credentials is not None and not credentials.valid:
+        credentials.refresh(google.auth.transport.requests.Request())
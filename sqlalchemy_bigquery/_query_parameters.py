@@ -0,0 +1,159 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Typed BigQuery query parameters for SQLAlchemy bind parameters
+
+When a dialect uses native query parameters, statements are compiled
+with ``@name`` placeholders and a parameter factory is recorded for each
+bind parameter, so that executing a (possibly cached) statement only has
+to wrap its values.
+"""
+
+from decimal import Decimal
+
+from google.cloud import bigquery
+from google.cloud.bigquery.dbapi import _helpers as dbapi_helpers
+from sqlalchemy.sql.sqltypes import ARRAY, NullType, Numeric
+
+from . import _struct
+
+
+def needs_bignumeric(type_, value):
+    """Check whether a value is too big for a NUMERIC parameter of a type
+
+    NUMERIC has a maximum precision of 38 and a maximum scale of 9.
+    """
+    if not isinstance(value, Decimal):
+        return False
+
+    t = value.as_tuple()
+    return (type_.precision is None and len(t.digits) > 38) or (
+        type_.scale is None and -t.exponent > 9
+    )
+
+
+def parameter_factory(type_, type_name):
+    """Get a factory of query parameters for values of a SQLAlchemy type
+
+    `type_name` is a function that gets the BigQuery name of a scalar
+    SQLAlchemy type.
+
+    The factory is called with a parameter name and a (bind-processed)
+    value and returns a query parameter.
+    """
+    if isinstance(type_, NullType) or (
+        isinstance(type_, ARRAY) and isinstance(type_.item_type, NullType)
+    ):
+        return untyped_parameter
+    if isinstance(type_, ARRAY):
+        return _ArrayParameter(parameter_factory(type_.item_type, type_name))
+    if isinstance(type_, _struct.STRUCT):
+        return _StructParameter(
+            [
+                (name, parameter_factory(field_type, type_name))
+                for name, field_type in type_._STRUCT_fields
+            ]
+        )
+
+    bq_type = type_name(type_).upper()
+    if (
+        bq_type == "NUMERIC"
+        and isinstance(type_, Numeric)
+        and (type_.precision is None or type_.scale is None)
+    ):
+        return _NumericParameter(type_)
+
+    return _ScalarParameter(bq_type)
+
+
+class _ScalarParameter:
+    def __init__(self, bq_type):
+        self.bq_type = bq_type
+
+    def __call__(self, name, value):
+        return bigquery.ScalarQueryParameter(name, self.bq_type, value)
+
+    def parameter_type(self, name=None):
+        return bigquery.ScalarQueryParameterType(self.bq_type, name=name)
+
+
+class _NumericParameter(_ScalarParameter):
+    # Whether a value needs BIGNUMERIC depends on the value.
+
+    def __init__(self, type_):
+        super().__init__("NUMERIC")
+        self.type_ = type_
+
+    def __call__(self, name, value):
+        bq_type = "BIGNUMERIC" if needs_bignumeric(self.type_, value) else "NUMERIC"
+        return bigquery.ScalarQueryParameter(name, bq_type, value)
+
+
+class _ArrayParameter:
+    def __init__(self, item):
+        self.item = item
+
+    def __call__(self, name, value):
+        item = self.item
+        values = list(value or ())
+        if isinstance(item, _StructParameter):
+            values = [item(None, v) for v in values]
+            return bigquery.ArrayQueryParameter(name, item.parameter_type(), values)
+        if isinstance(item, _NumericParameter) and any(
+            needs_bignumeric(item.type_, v) for v in values
+        ):
+            return bigquery.ArrayQueryParameter(name, "BIGNUMERIC", values)
+
+        return bigquery.ArrayQueryParameter(name, item.bq_type, values)
+
+    def parameter_type(self, name=None):
+        return bigquery.ArrayQueryParameterType(self.item.parameter_type(), name=name)
+
+
+class _StructParameter:
+    def __init__(self, fields):
+        self.fields = fields
+
+    def __call__(self, name, value):
+        return bigquery.StructQueryParameter(
+            name,
+            *(
+                field(field_name, value.get(field_name))
+                for field_name, field in self.fields
+            ),
+        )
+
+    def parameter_type(self, name=None):
+        return bigquery.StructQueryParameterType(
+            *(field.parameter_type(field_name) for field_name, field in self.fields),
+            name=name,
+        )
+
+
+class _UntypedParameter:
+    # We don't know the type, so infer it from the value, the way the
+    # DB-API does for parameters without type markers.
+
+    def __call__(self, name, value):
+        if dbapi_helpers.array_like(value):
+            return dbapi_helpers.array_to_query_parameter(value, name)
+        return dbapi_helpers.scalar_to_query_parameter(value, name)
+
+
+untyped_parameter = _UntypedParameter()
@@ -0,0 +1,118 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Caching query results on the client
+
+Used for statements executed with the ``bigquery_result_cache`` execution
+option. Results are cached, in full, by the query, its parameters and its
+job configuration, for a limited time, and are invalidated when tables
+they were read from are changed with the dialect.
+"""
+
+import collections
+import copy
+import sys
+import threading
+
+from . import _cache
+
+CachedResult = collections.namedtuple(
+    "CachedResult", ["description", "rowcount", "rows", "tables", "mutable"]
+)
+
+
+def snapshot(description, rowcount, rows, tables):
+    """Make a ``CachedResult`` of results fetched with a cursor
+
+    ``tables`` are the ids of the tables the query read, or None if they
+    aren't known. Values that could be modified, e.g. arrays, are copied,
+    so that the cursor's rows can be modified without changing them.
+    """
+    rows = tuple(tuple(row) for row in rows)
+    mutable = any(isinstance(value, (list, dict)) for row in rows for value in row)
+    if mutable:
+        rows = copy.deepcopy(rows)
+    return CachedResult(description, rowcount, rows, tables, mutable)
+
+
+def copy_result(result):
+    """Copy a ``CachedResult``, so that its rows can be modified"""
+    if result.mutable:
+        result = result._replace(rows=copy.deepcopy(result.rows))
+    return result
+
+
+class ResultCache:
+    """Cache of query results
+
+    Results are kept for ``ttl`` seconds. At most ``maxsize`` results, of
+    at most ``max_bytes`` (approximately) in all, are kept, evicting the
+    least recently used.
+    """
+
+    def __init__(self, ttl, maxsize, max_bytes):
+        self.cache = _cache.TTLCache(ttl, maxsize, max_bytes=max_bytes, sizeof=_sizeof)
+        # Incremented by invalidations, so that results of queries that
+        # were run before one aren't cached after it.
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.cache.enabled
+
+    def get(self, key):
+        """Get a copy of cached results, or None"""
+        result = self.cache.get(key)
+        return None if result is None else copy_result(result)
+
+    def set(self, key, result, generation):
+        """Cache a query's results, a ``CachedResult``
+
+        Results of queries that read unknown tables are invalidated by
+        changes to any table. ``generation`` is the cache's generation
+        from before the query was run.
+        """
+        with self._lock:
+            if generation == self.generation:
+                self.cache.set(key, result)
+
+    def invalidate(self, tables):
+        """Remove results read from tables, given by id
+
+        Clears the cache if ``tables`` is None.
+        """
+        with self._lock:
+            self.generation += 1
+            if tables is None:
+                self.cache.clear()
+            else:
+                tables = frozenset(tables)
+                self.cache.invalidate_matching(
+                    lambda result: result.tables is None
+                    or not tables.isdisjoint(result.tables)
+                )
+
+
+def _sizeof(result):
+    # Approximately, the memory the results use.
+    return sys.getsizeof(result.rows) + sum(
+        sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+        for row in result.rows
+    )
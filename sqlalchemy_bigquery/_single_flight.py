@@ -0,0 +1,89 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Coalescing identical concurrent calls
+
+Used to run identical queries that are executed at the same time, e.g. by
+many threads after their results expire from a cache, with one query job.
+"""
+
+import concurrent.futures
+import threading
+
+
+class SingleFlight:
+    """Make identical concurrent calls once
+
+    Calls are identified by keys. While a call is in flight, calls with
+    the same key wait for, and share, its result (or error), rather than
+    being made themselves. Their number is counted, as ``coalesced``.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def call(self, key, fn, wait=None):
+        """Call ``fn``, or wait for the in-flight call with the same key
+
+        ``wait(future)`` waits for a ``concurrent.futures.Future``, and
+        returns its result. Returns the result, and whether it was shared
+        from another call.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = concurrent.futures.Future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            try:
+                return (wait or _wait)(future), True
+            except _Interrupted:
+                # The call was interrupted, e.g. by KeyboardInterrupt, rather
+                # than failing, so make it again.
+                return self.call(key, fn, wait)
+
+        try:
+            result = fn()
+        except Exception as exc:
+            self.__finish(key, future.set_exception, exc)
+            raise
+        except BaseException:
+            self.__finish(key, future.set_exception, _Interrupted())
+            raise
+        self.__finish(key, future.set_result, result)
+        return result, False
+
+    def __finish(self, key, set_outcome, outcome):
+        # Calls made from now on aren't coalesced with this one.
+        with self._lock:
+            del self._calls[key]
+        set_outcome(outcome)
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def _wait(future):
+    return future.result()
@@ -0,0 +1,355 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Inserting rows with the BigQuery Storage Write API
+
+Used for executemany INSERTs with ``insert_strategy="storage_write"``.
+Rows are serialized and appended to the table's default stream in
+batches, limited by both their serialized size and their number of rows.
+Several appends are sent before waiting for their responses, and the
+latency of each is reported.
+
+The appends are made by a transport, which can be replaced, e.g. with a
+fake for tests. By default, rows are serialized as protocol buffers and
+appended with the ``google-cloud-bigquery-storage`` client.
+"""
+
+import collections
+import datetime
+import json
+import threading
+import time
+import uuid
+import weakref
+
+from google.cloud.bigquery.dbapi import exceptions
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+WriteBatch = collections.namedtuple("WriteBatch", "rows bytes latency")
+WriteBatch.__doc__ = """An append of rows: their number, serialized size and latency"""
+
+
+class StorageWriter:
+    """Appends rows to tables in batches, pipelining the appends
+
+    A batch is sent when adding another row would make it bigger than
+    ``max_batch_bytes`` or longer than ``max_batch_rows``, and up to
+    ``max_inflight`` batches are sent before waiting for a response.
+    """
+
+    def __init__(
+        self,
+        transport=None,
+        max_batch_bytes=8 * 1024 * 1024,
+        max_batch_rows=10000,
+        max_inflight=4,
+        timer=time.monotonic,
+    ):
+        self.transport = transport or ProtoTransport()
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_rows = max_batch_rows
+        self.max_inflight = max_inflight
+        self.timer = timer
+
+    def write(self, client, table, rows):
+        """Append rows, dictionaries of values by column name, to a table
+
+        The table must have its schema, e.g. be fetched with
+        ``get_table()``. Returns a ``WriteBatch`` for each append.
+        """
+        stream = self.transport.open(client, table)
+        batches = []
+        inflight = collections.deque()
+        try:
+            for serialized_rows, size in self._batches(stream, rows):
+                if len(inflight) >= self.max_inflight:
+                    batches.append(inflight.popleft().wait())
+                inflight.append(_Append(stream, serialized_rows, size, self.timer))
+            while inflight:
+                batches.append(inflight.popleft().wait())
+        finally:
+            for append in inflight:
+                append.cancel()
+            stream.close()
+        return batches
+
+    def _batches(self, stream, rows):
+        batch = []
+        size = 0
+        for row in rows:
+            serialized_row = stream.serialize(row)
+            if batch and (
+                size + len(serialized_row) > self.max_batch_bytes
+                or len(batch) >= self.max_batch_rows
+            ):
+                yield batch, size
+                batch = []
+                size = 0
+            batch.append(serialized_row)
+            size += len(serialized_row)
+        if batch:
+            yield batch, size
+
+
+class _Append:
+    # An append that has been sent, and the time its response arrived.
+
+    def __init__(self, stream, serialized_rows, size, timer):
+        self.rows = len(serialized_rows)
+        self.size = size
+        self.timer = timer
+        self.done_at = None
+        self.sent_at = timer()
+        self.future = stream.append(serialized_rows)
+        self.future.add_done_callback(self._done)
+
+    def _done(self, future):
+        self.done_at = self.timer()
+
+    def wait(self):
+        response = self.future.result()
+        row_errors = getattr(response, "row_errors", None)
+        if row_errors:
+            raise exceptions.DatabaseError(
+                "Rows couldn't be appended: "
+                + "; ".join(f"row {e.index}: {e.message}" for e in row_errors)
+            )
+        done_at = self.done_at if self.done_at is not None else self.timer()
+        return WriteBatch(self.rows, self.size, done_at - self.sent_at)
+
+    def cancel(self):
+        self.future.cancel()
+
+
+class ProtoTransport:
+    """Appends rows, as protocol buffers, to tables' default streams
+
+    Requires the ``google-cloud-bigquery-storage`` package. A BigQuery
+    Storage write client is created for each BigQuery client.
+    """
+
+    def __init__(self):
+        self._write_clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def write_client(self, client):
+        with self._lock:
+            write_client = self._write_clients.get(client)
+            if write_client is None:
+                from google.cloud import bigquery_storage_v1
+
+                write_client = bigquery_storage_v1.BigQueryWriteClient(
+                    credentials=client._credentials
+                )
+                self._write_clients[client] = write_client
+        return write_client
+
+    def open(self, client, table):
+        from google.cloud.bigquery_storage_v1 import types, writer
+
+        serializer = ProtoRowSerializer(table.schema)
+        write_client = self.write_client(client)
+        template = types.AppendRowsRequest(
+            write_stream=write_client.table_path(
+                table.project, table.dataset_id, table.table_id
+            )
+            + "/streams/_default",
+            proto_rows=types.AppendRowsRequest.ProtoData(
+                writer_schema=types.ProtoSchema(proto_descriptor=serializer.descriptor)
+            ),
+        )
+        return _ProtoStream(serializer, writer.AppendRowsStream(write_client, template))
+
+
+class _ProtoStream:
+    def __init__(self, serializer, append_rows_stream):
+        self.serialize = serializer
+        self._append_rows_stream = append_rows_stream
+
+    def append(self, serialized_rows):
+        from google.cloud.bigquery_storage_v1 import types
+
+        return self._append_rows_stream.send(
+            types.AppendRowsRequest(
+                proto_rows=types.AppendRowsRequest.ProtoData(
+                    rows=types.ProtoRows(serialized_rows=serialized_rows)
+                )
+            )
+        )
+
+    def close(self):
+        self._append_rows_stream.close()
+
+
+_FieldDescriptor = descriptor_pb2.FieldDescriptorProto
+
+# Protocol buffer types of BigQuery types. Types not listed are written as
+# strings.
+_proto_types = {
+    "INTEGER": _FieldDescriptor.TYPE_INT64,
+    "INT64": _FieldDescriptor.TYPE_INT64,
+    "FLOAT": _FieldDescriptor.TYPE_DOUBLE,
+    "FLOAT64": _FieldDescriptor.TYPE_DOUBLE,
+    "BOOLEAN": _FieldDescriptor.TYPE_BOOL,
+    "BOOL": _FieldDescriptor.TYPE_BOOL,
+    "BYTES": _FieldDescriptor.TYPE_BYTES,
+    "TIMESTAMP": _FieldDescriptor.TYPE_INT64,
+}
+
+_record_types = ("RECORD", "STRUCT")
+
+
+class ProtoRowSerializer:
+    """Serializes rows, as protocol buffers, according to a table schema
+
+    ``descriptor`` describes the rows' protocol buffer message, for
+    appends' writer schema.
+    """
+
+    def __init__(self, schema):
+        self.descriptor = _descriptor("Row", schema)
+        pool = descriptor_pool.DescriptorPool()
+        pool.Add(
+            descriptor_pb2.FileDescriptorProto(
+                name=f"sqlalchemy_bigquery_{uuid.uuid4().hex}.proto",
+                package="sqlalchemy_bigquery",
+                message_type=[self.descriptor],
+            )
+        )
+        self.message_class = _message_class(
+            pool.FindMessageTypeByName("sqlalchemy_bigquery.Row")
+        )
+        self._convert = _record_converter(self.message_class, schema)
+
+    def __call__(self, row):
+        return self._convert(row).SerializeToString()
+
+
+def _descriptor(name, fields):
+    descriptor = descriptor_pb2.DescriptorProto(name=name)
+    for number, field in enumerate(fields, 1):
+        proto_field = descriptor.field.add(
+            name=field.name,
+            number=number,
+            label=(
+                _FieldDescriptor.LABEL_REPEATED
+                if field.mode == "REPEATED"
+                else _FieldDescriptor.LABEL_OPTIONAL
+            ),
+        )
+        if field.field_type in _record_types:
+            nested = _descriptor(f"Field{number}", field.fields)
+            descriptor.nested_type.append(nested)
+            proto_field.type = _FieldDescriptor.TYPE_MESSAGE
+            proto_field.type_name = nested.name
+        else:
+            proto_field.type = _proto_types.get(
+                field.field_type, _FieldDescriptor.TYPE_STRING
+            )
+    return descriptor
+
+
+def _message_class(descriptor):
+    get_message_class = getattr(message_factory, "GetMessageClass", None)
+    if get_message_class is None:  # pragma: NO COVER
+        # protobuf < 4.21
+        return message_factory.MessageFactory(descriptor.file.pool).GetPrototype(
+            descriptor
+        )
+    return get_message_class(descriptor)
+
+
+def _record_converter(message_class, fields):
+    converters = []
+    for field in fields:
+        if field.field_type in _record_types:
+            convert = _record_converter(
+                _message_class(
+                    message_class.DESCRIPTOR.fields_by_name[field.name].message_type
+                ),
+                field.fields,
+            )
+        else:
+            convert = _scalar_converters.get(field.field_type, _to_string)
+        if field.mode == "REPEATED":
+            convert = _repeated_converter(convert)
+        converters.append((field.name, convert))
+
+    def convert_record(value):
+        converted = {}
+        for name, convert in converters:
+            if value.get(name) is None:
+                continue
+            try:
+                converted[name] = convert(value[name])
+            except (TypeError, ValueError) as exc:
+                raise exceptions.DatabaseError(
+                    f"Value of {name} couldn't be converted: {exc}"
+                ) from exc
+        return message_class(**converted)
+
+    return convert_record
+
+
+def _repeated_converter(convert):
+    def convert_repeated(values):
+        return [convert(value) for value in values]
+
+    return convert_repeated
+
+
+def _to_string(value):
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+_epoch = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _to_timestamp_micros(value):
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            # Like the BigQuery client, treat naive datetimes as UTC.
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return (value - _epoch) // datetime.timedelta(microseconds=1)
+    return int(value)
+
+
+def _to_bool(value):
+    # bool() would make any non-empty string, e.g. "false", true.
+    if not isinstance(value, bool):
+        raise TypeError(f"expected a bool, not {value!r}")
+    return value
+
+
+_scalar_converters = {
+    "INTEGER": int,
+    "INT64": int,
+    "FLOAT": float,
+    "FLOAT64": float,
+    "BOOLEAN": _to_bool,
+    "BOOL": _to_bool,
+    "BYTES": bytes,
+    "TIMESTAMP": _to_timestamp_micros,
+}
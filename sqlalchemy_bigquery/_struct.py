@@ -19,6 +19,7 @@
 
 import sqlalchemy.sql.default_comparator
 import sqlalchemy.sql.sqltypes
+import sqlalchemy.sql.type_api
 import sqlalchemy.types
 
 from . import base
@@ -44,6 +45,8 @@ class STRUCT(sqlalchemy.sql.sqltypes.Indexable, sqlalchemy.types.UserDefinedType
 
     # See https://docs.sqlalchemy.org/en/14/core/custom_types.html#creating-new-types
 
+    cache_ok = True
+
     def __init__(
         self,
         *fields,
@@ -64,6 +67,19 @@ class STRUCT(sqlalchemy.sql.sqltypes.Indexable, sqlalchemy.types.UserDefinedType
             name.lower(): type_ for (name, type_) in self._STRUCT_fields
         }
 
+    @property
+    def _static_cache_key(self):
+        # The default cache key is built from named constructor
+        # arguments, but our fields are passed positionally or as
+        # arbitrary keywords.
+        keys = tuple(
+            (name, type_._static_cache_key) for name, type_ in self._STRUCT_fields
+        )
+        if any(key is sqlalchemy.sql.type_api.NO_CACHE for _, key in keys):
+            # A field's type can't be cached, so neither can we.
+            return sqlalchemy.sql.type_api.NO_CACHE
+        return (self.__class__,) + keys
+
     def __repr__(self):
         fields = ", ".join(
             f"{name}={repr(type_)}" for name, type_ in self._STRUCT_fields
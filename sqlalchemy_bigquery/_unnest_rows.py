@@ -0,0 +1,261 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Executemany UPDATEs and DELETEs applied with one statement
+
+Executing, e.g., ``update(t).where(t.c.id == bindparam("k"))`` with many
+rows of parameters would otherwise run a DML job per row. When a
+statement's rows only pick the rows they change by key equality, the rows
+are instead bound as one ``ARRAY<STRUCT<...>>`` parameter, and the
+statement is rewritten to read them from ``UNNEST``::
+
+    UPDATE `t` SET `x`=`bigquery_rows`.`x`
+    FROM unnest(@bigquery_rows) AS `bigquery_rows`
+    WHERE `t`.`id` = `bigquery_rows`.`k`
+
+    DELETE FROM `t` WHERE EXISTS (SELECT *
+    FROM unnest(@bigquery_rows) AS `bigquery_rows`
+    WHERE `t`.`id` = `bigquery_rows`.`k`)
+"""
+
+import re
+
+import sqlalchemy
+from sqlalchemy.sql import elements, operators, visitors
+from sqlalchemy.sql.dml import Delete, Update
+from sqlalchemy.sql.sqltypes import NullType
+
+from . import _query_parameters, _struct, dml
+
+# The name of the parameter the rows are bound to, and of their alias.
+ROWS = "bigquery_rows"
+
+# STRUCT field names have to be identifiers.
+_field_name = re.compile(r"[A-Za-z_]\w*$").match
+
+
+class UnnestRows:
+    """An executemany UPDATE or DELETE, rewritten to read its rows from UNNEST"""
+
+    def __init__(self, compiled, fields, key_fields, parameters, numeric_fields):
+        # The compiled, rewritten, statement.
+        self.compiled = compiled
+
+        # The fields of the rows' STRUCTs, with the names of the
+        # (executemany) parameters their values come from.
+        self.fields = fields
+
+        # Fields that pick the rows an UPDATE changes. Each row must have
+        # different values for them, so that no table row is changed more
+        # than once. None for DELETEs.
+        self.key_fields = key_fields
+
+        # Other parameters of the rewritten statement, with the names of
+        # the parameters their values come from.
+        self.parameters = parameters
+
+        # NUMERIC fields of unspecified precision or scale, by name, whose
+        # values may need BIGNUMERIC instead.
+        self.numeric_fields = numeric_fields
+
+    @classmethod
+    def from_compiled(cls, compiled):
+        """Rewrite a statement compiled for executemany
+
+        Returns None if the statement can't be rewritten, e.g. because its
+        WHERE clause does more than compare columns to parameters, or it
+        returns rows.
+        """
+        statement = compiled.statement
+        if not isinstance(statement, (Update, Delete)):
+            return None
+
+        table = statement.table
+        row_keys = set(compiled.column_keys or ())
+        if (
+            not isinstance(table, sqlalchemy.Table)
+            or not row_keys
+            or ROWS in row_keys
+            or compiled.returning
+            or compiled.update_prefetch
+            or compiled.compile_state._extra_froms
+            or getattr(statement, "_ordered_values", None)
+            or statement._prefixes
+            or statement._hints
+        ):
+            return None
+
+        # Parameters, by key.
+        binds = {}
+        for bind, name in compiled.bind_names.items():
+            binds.setdefault(
+                bind.key, (bind, compiled.escaped_bind_names.get(name, name))
+            )
+
+        field_keys = [key for key in binds if key in row_keys]
+        if len({key.lower() for key in field_keys}) != len(field_keys) or any(
+            not _field_name(key)
+            or binds[key][0].expanding
+            or binds[key][0].literal_execute
+            or isinstance(binds[key][0].type, NullType)
+            for key in field_keys
+        ):
+            return None
+
+        key_fields = _key_fields(statement, table, row_keys)
+        if not key_fields:
+            return None
+
+        fields = [(key, binds[key][0].type) for key in field_keys]
+        rows = dml.unnest(
+            sqlalchemy.bindparam(ROWS, type_=sqlalchemy.ARRAY(_struct.STRUCT(*fields))),
+            ROWS,
+        )
+
+        def replace(element):
+            if isinstance(element, elements.BindParameter):
+                # Other parameters are kept, rather than copied, so that
+                # they keep their keys.
+                return rows.c[element.key] if element.key in row_keys else element
+            return None
+
+        rewritten = visitors.replacement_traverse(statement, {}, replace)
+        if isinstance(statement, Update):
+            values = dict(rewritten._values or {})
+            value_keys = {getattr(column, "key", column) for column in values}
+            values.update(
+                (table.c[key], rows.c[key])
+                for key in field_keys
+                if key in table.c and key not in value_keys
+            )
+            rewritten = (
+                sqlalchemy.update(table)
+                .where(*rewritten._where_criteria)
+                .values(values)
+            )
+        else:
+            rewritten = sqlalchemy.delete(table).where(
+                sqlalchemy.exists().select_from(rows).where(*rewritten._where_criteria)
+            )
+            key_fields = None
+
+        rewritten_compiled = rewritten.compile(dialect=compiled.dialect)
+        parameters = []
+        for bind, name in rewritten_compiled.bind_names.items():
+            name = rewritten_compiled.escaped_bind_names.get(name, name)
+            if bind.key == ROWS:
+                continue
+            if bind.key not in binds or bind.key in row_keys:
+                return None
+            parameters.append((name, binds[bind.key][1]))
+
+        numeric_fields = {
+            key: type_
+            for key, type_ in fields
+            if isinstance(type_, sqlalchemy.Numeric)
+            and compiled.dialect.type_compiler.process(type_) == "NUMERIC"
+            and (type_.precision is None or type_.scale is None)
+        }
+
+        return cls(
+            rewritten_compiled,
+            [(key, binds[key][1]) for key in field_keys],
+            key_fields,
+            parameters,
+            numeric_fields,
+        )
+
+    def rows(self, parameters):
+        """Get the rows of STRUCT values for executemany parameters
+
+        Returns None if an UPDATE's rows would change a table row more
+        than once.
+        """
+        rows = [
+            {field: row_parameters[name] for field, name in self.fields}
+            for row_parameters in parameters
+        ]
+        if self.key_fields is not None:
+            try:
+                keys = {tuple(row[field] for field in self.key_fields) for row in rows}
+            except TypeError:  # Unhashable values
+                return None
+            if len(keys) != len(rows):
+                return None
+        return rows
+
+    def statement(self, rows):
+        """Get the rewritten statement, for rows of STRUCT values
+
+        With pyformat parameters, whose types are given in the statement,
+        NUMERIC fields are made BIGNUMERIC if their values need it.
+        """
+        statement = self.compiled.string
+        for field, type_ in self.numeric_fields.items():
+            if any(
+                _query_parameters.needs_bignumeric(type_, row[field]) for row in rows
+            ):
+                statement = re.sub(
+                    rf"(?<=[<\s]){field} NUMERIC(?=[,>])",
+                    f"{field} BIGNUMERIC",
+                    statement,
+                )
+        return statement
+
+
+def _key_fields(statement, table, row_keys):
+    # The keys of the parameters the WHERE clause compares table columns
+    # to. None if it uses (row) parameters any other way.
+    key_fields = []
+    for criterion in _conjuncts(statement._where_criteria):
+        if not any(
+            isinstance(element, elements.BindParameter) and element.key in row_keys
+            for element in visitors.iterate(criterion)
+        ):
+            continue
+
+        if not (
+            isinstance(criterion, elements.BinaryExpression)
+            and criterion.operator is operators.eq
+        ):
+            return None
+        column, bind = criterion.left, criterion.right
+        if isinstance(column, elements.BindParameter):
+            column, bind = bind, column
+        if not (
+            isinstance(bind, elements.BindParameter)
+            and bind.key in row_keys
+            and isinstance(column, sqlalchemy.Column)
+            and column.table is table
+        ):
+            return None
+        key_fields.append(bind.key)
+
+    return key_fields
+
+
+def _conjuncts(criteria):
+    for criterion in criteria:
+        if (
+            isinstance(criterion, elements.BooleanClauseList)
+            and criterion.operator is operators.and_
+        ):
+            yield from _conjuncts(criterion.clauses)
+        else:
+            yield criterion
@@ -0,0 +1,374 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""asyncio variant of the BigQuery dialect, for use with sqlalchemy.ext.asyncio
+
+.. code-block:: python
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine("bigquery+asyncio://some-project/some-dataset")
+
+The BigQuery client is synchronous, so its calls, which submit jobs, wait
+for them and fetch results, are run on a bounded thread pool (of
+``max_workers`` threads) and awaited, rather than blocking the event loop.
+The pool's threads are stopped when the engine is disposed.
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import threading
+
+from google.api_core import page_iterator
+from google.cloud.bigquery import dbapi
+from sqlalchemy import event, pool
+from sqlalchemy.engine import AdaptedConnection
+from sqlalchemy.util.concurrency import await_only
+
+from .base import BigQueryDialect, BigQueryExecutionContext
+
+
+class AsyncAdapt_bigquery_cursor:
+    """Cursor that runs a BigQuery cursor's operations on the thread pool
+
+    Results are fetched when statements are executed, except for
+    server-side cursors, which fetch them as they're consumed.
+    """
+
+    def __init__(self, adapt_connection, cursor, server_side=False):
+        self._adapt_connection = adapt_connection
+        self._cursor = cursor
+        self.server_side = server_side
+        self._rows = collections.deque()
+
+    @property
+    def driver_cursor(self):
+        return self._cursor
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def arraysize(self):
+        return self._cursor.arraysize
+
+    @arraysize.setter
+    def arraysize(self, value):
+        self._cursor.arraysize = value
+
+    @property
+    def lastrowid(self):
+        return None
+
+    def close(self):
+        self._rows.clear()
+        if getattr(self._cursor, "job_running", False):
+            # Closing cancels the job, e.g. because the task executing the
+            # statement was cancelled, so close on the thread pool, rather
+            # than waiting on the event loop.
+            self._adapt_connection._executor.submit(self._cursor.close)
+        else:
+            self._cursor.close()
+
+    async def _async_soft_close(self):
+        # Results have already been fetched, or are fetched with the thread
+        # pool, so the cursor can be left open until it's closed.
+        pass
+
+    def execute(self, operation, parameters=None, **kwargs):
+        self._adapt_connection._run(self._execute, operation, parameters, kwargs)
+
+    def _execute(self, operation, parameters, kwargs):
+        if parameters is None:
+            self._cursor.execute(operation, **kwargs)
+        else:
+            self._cursor.execute(operation, parameters, **kwargs)
+        self._rows = collections.deque()
+        if self._cursor.description and not self.server_side:
+            self._rows.extend(self._cursor.fetchall())
+
+    def executemany(self, operation, seq_of_parameters, **kwargs):
+        self._adapt_connection._run(
+            functools.partial(self._cursor.executemany, **kwargs),
+            operation,
+            seq_of_parameters,
+        )
+
+    def buffer(self):
+        # Results have already been fetched.
+        return list(self._rows)
+
+    def load(self, description, rowcount, rows):
+        self._cursor.load(description, rowcount, ())
+        self._rows = collections.deque(rows)
+
+    def setinputsizes(self, *inputsizes):
+        pass
+
+    def setoutputsize(self, size, column=None):
+        pass
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def fetchone(self):
+        if self.server_side:
+            return self._adapt_connection._run(self._cursor.fetchone)
+        return self._rows.popleft() if self._rows else None
+
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize or 1
+        if self.server_side:
+            return self._adapt_connection._run(self._cursor.fetchmany, size)
+        rows = self._rows
+        return [rows.popleft() for _ in range(min(size, len(rows)))]
+
+    def fetchall(self):
+        if self.server_side:
+            return self._adapt_connection._run(self._cursor.fetchall)
+        rows = list(self._rows)
+        self._rows.clear()
+        return rows
+
+
+class AsyncAdapt_bigquery_client:
+    """BigQuery client whose methods run on the thread pool
+
+    Used by reflection. Results of methods that list resources, which are
+    fetched a page at a time as they're iterated over, are fetched in full.
+    """
+
+    def __init__(self, adapt_connection, client):
+        self._adapt_connection = adapt_connection
+        self._client = client
+
+    def __getattr__(self, name):
+        value = getattr(self._client, name)
+        if not callable(value):
+            return value
+
+        @functools.wraps(value)
+        def method(*args, **kwargs):
+            return self._adapt_connection._run(_call, value, args, kwargs)
+
+        return method
+
+
+def _call(method, args, kwargs):
+    result = method(*args, **kwargs)
+    if isinstance(result, page_iterator.Iterator):
+        result = list(result)
+    return result
+
+
+class AsyncAdapt_bigquery_connection(AdaptedConnection):
+    """DB-API connection whose blocking calls run on a thread pool
+
+    Statements are run one at a time per connection.
+    """
+
+    await_ = staticmethod(await_only)
+
+    def __init__(self, dialect, connection):
+        self._connection = connection
+        self._dialect = dialect
+        self._execute_mutex = asyncio.Lock()
+        self._client = AsyncAdapt_bigquery_client(self, connection._client)
+
+    @property
+    def _executor(self):
+        return self._dialect.executor
+
+    def _run(self, fn, *args):
+        return self.await_(self._run_async(fn, *args))
+
+    async def _run_async(self, fn, *args):
+        async with self._execute_mutex:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+    def cursor(self, server_side=False):
+        return self.adapt_cursor(self._connection.cursor(), server_side)
+
+    def adapt_cursor(self, cursor, server_side=False):
+        if isinstance(cursor, AsyncAdapt_bigquery_cursor):
+            return cursor
+        return AsyncAdapt_bigquery_cursor(self, cursor, server_side)
+
+    def commit(self):
+        # BigQuery has no support for transactions.
+        self._connection.commit()
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self._connection.close()
+
+
+class BigQueryAsyncExecutionContext(BigQueryExecutionContext):
+    def create_default_cursor(self):
+        return self.__adapt_cursor(
+            super(BigQueryAsyncExecutionContext, self).create_default_cursor()
+        )
+
+    def create_server_side_cursor(self):
+        return self.__adapt_cursor(
+            super(BigQueryAsyncExecutionContext, self).create_server_side_cursor(),
+            server_side=True,
+        )
+
+    def __adapt_cursor(self, cursor, server_side=False):
+        return self._dbapi_connection.dbapi_connection.adapt_cursor(cursor, server_side)
+
+
+class BigQueryAsyncDialect(BigQueryDialect):
+    driver = "asyncio"
+    is_async = True
+    supports_statement_cache = True
+    execution_ctx_cls = BigQueryAsyncExecutionContext
+
+    def __init__(self, max_workers=None, *args, **kwargs):
+        super(BigQueryAsyncDialect, self).__init__(*args, **kwargs)
+        self.max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def executor(self):
+        """The thread pool BigQuery client calls are run on
+
+        Created when it's first needed, e.g. again after the engine is
+        disposed.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="sqlalchemy-bigquery",
+                )
+            return self._executor
+
+    def _shutdown_executor(self):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            # Calls already submitted, e.g. by connections still checked
+            # out, are finished first.
+            executor.shutdown(wait=False)
+
+    @classmethod
+    def engine_created(cls, engine):
+        super(BigQueryAsyncDialect, cls).engine_created(engine)
+        event.listen(engine, "engine_disposed", _shutdown_executor)
+
+    @classmethod
+    def import_dbapi(cls):
+        return dbapi
+
+    @classmethod
+    def get_pool_class(cls, url):
+        return pool.AsyncAdaptedQueuePool
+
+    def connect(self, *cargs, **cparams):
+        connection = await_only(
+            asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                functools.partial(self.loaded_dbapi.connect, *cargs, **cparams),
+            )
+        )
+        return AsyncAdapt_bigquery_connection(self, connection)
+
+    def get_driver_connection(self, connection):
+        return connection._connection
+
+    def _fetch_tables(self, connection, table_refs, info_cache=None):
+        # Wait for the tables on the thread pool, rather than the event loop.
+        fetch_tables = super(BigQueryAsyncDialect, self)._fetch_tables
+        return connection.connection.dbapi_connection._run(
+            fetch_tables, connection, table_refs, info_cache
+        )
+
+    def _bulk_insert(self, context, rows):
+        # Wait for the rows to be appended on the thread pool, rather than
+        # the event loop.
+        bulk_insert = super(BigQueryAsyncDialect, self)._bulk_insert
+        context._dbapi_connection.dbapi_connection._run(bulk_insert, context, rows)
+
+    def _estimate(self, context, statement, parameters, job_config):
+        # Wait for the dry run on the thread pool, rather than the event loop.
+        estimate = super(BigQueryAsyncDialect, self)._estimate
+        return context._dbapi_connection.dbapi_connection._run(
+            estimate, context, statement, parameters, job_config
+        )
+
+    def _load_result(self, context, cursor, result):
+        # Statements executed by async connections have to be awaited, so
+        # even cached results are loaded with the thread pool.
+        load_result = super(BigQueryAsyncDialect, self)._load_result
+        context._dbapi_connection.dbapi_connection._run(
+            load_result, context, cursor, result
+        )
+
+    def _wait_for_query(self, future):
+        # Await the results, rather than blocking the event loop.
+        return await_only(asyncio.wrap_future(future))
+
+    def _iter_table_or_view_names(self, connection, item_types, *args):
+        # List the tables on the thread pool, rather than the event loop.
+        iter_names = super(BigQueryAsyncDialect, self)._iter_table_or_view_names
+        table_names = connection.connection.dbapi_connection._run(
+            lambda: list(iter_names(connection, item_types, *args))
+        )
+        return iter(table_names)
+
+    def do_ping(self, dbapi_connection):
+        # Ping on the thread pool, rather than the event loop.
+        do_ping = super(BigQueryAsyncDialect, self).do_ping
+        return dbapi_connection._run(do_ping, dbapi_connection)
+
+    def _cancel_jobs(self, connection):
+        # Cancel the jobs on the thread pool, without waiting on the event
+        # loop.
+        if self.running_jobs.running(connection):
+            self.executor.submit(
+                super(BigQueryAsyncDialect, self)._cancel_jobs, connection
+            )
+
+    def _is_client_cursor(self, cursor):
+        return super(BigQueryAsyncDialect, self)._is_client_cursor(cursor.driver_cursor)
+
+
+def _shutdown_executor(engine):
+    engine.dialect._shutdown_executor()
+
+
+dialect = BigQueryAsyncDialect
@@ -19,15 +19,18 @@
 
 """Integration between SQLAlchemy and BigQuery."""
 
+import collections
+import concurrent.futures
 import datetime
-from decimal import Decimal
 import random
 import operator
 import uuid
+import weakref
 
 from google import auth
 import google.api_core.exceptions
 from google.cloud.bigquery import dbapi, ConnectionProperty
+from google.cloud.bigquery.dataset import DatasetReference
 from google.cloud.bigquery.table import (
     RangePartitioning,
     TableReference,
@@ -52,14 +55,42 @@ from sqlalchemy.sql.compiler import (
 from sqlalchemy.sql.sqltypes import Integer, String, NullType, Numeric
 from sqlalchemy.engine.default import DefaultDialect, DefaultExecutionContext
 from sqlalchemy.engine.base import Engine
+from sqlalchemy.engine import reflection
+
+try:
+    from sqlalchemy.engine.reflection import ObjectKind, ObjectScope
+except ImportError:  # pragma: NO COVER
+    # SQLAlchemy < 2.0, which doesn't reflect multiple tables at once.
+    ObjectKind = ObjectScope = None
 from sqlalchemy.sql.schema import Column
 from sqlalchemy.sql.schema import Table
 from sqlalchemy.sql.selectable import CTE
-from sqlalchemy.sql import elements, selectable
+from sqlalchemy.sql import elements, selectable, visitors
+from sqlalchemy.sql.dml import UpdateBase
 import re
 
 from .parse_url import parse_url
-from . import _helpers, _struct, _types
+from . import (
+    _cache,
+    _clients,
+    _cursor,
+    _dry_run,
+    _helpers,
+    _information_schema,
+    _job_stats,
+    _jobs,
+    _load_jobs,
+    _ping,
+    _storage_write,
+    _query_parameters,
+    _result_cache,
+    _single_flight,
+    _struct,
+    _types,
+    _unnest_rows,
+    dml,
+    events,
+)
 import sqlalchemy_bigquery_vendored.sqlalchemy.postgresql.base as vendored_postgresql
 from google.cloud.bigquery import QueryJobConfig
 
@@ -87,6 +118,10 @@ class BigQueryIdentifierPreparer(IdentifierPreparer):
             dialect,
             initial_quote="`",
         )
+        if getattr(dialect, "native_query_parameters", False):
+            # Statements aren't formatted by the DB-API, so literal
+            # percent signs don't need to be escaped.
+            self._double_percents = False
 
     def quote_column(self, value):
         """
@@ -122,14 +157,119 @@ class BigQueryIdentifierPreparer(IdentifierPreparer):
         return result
 
 
+def _iter_values(value):
+    if isinstance(value, (list, tuple)):
+        return value
+    return (value,)
+
+
 class BigQueryExecutionContext(DefaultExecutionContext):
+    # The statement's estimated cost, if it was dry-run. See
+    # BigQueryDialect.estimate.
+    bigquery_estimate = None
+
+    # Statistics of the (last) query job the statement was run with.
+    bigquery_job_stats = None
+
+    # Whether the statement's results came from the dialect's result
+    # cache, with the bigquery_result_cache execution option.
+    bigquery_result_cache_hit = False
+
+    # Whether the statement's results were shared by an identical query,
+    # with the bigquery_coalesce_queries execution option.
+    bigquery_coalesced = False
+
+    # The number of rows affected, when the cursor doesn't have it, e.g.
+    # because they were inserted with a load job.
+    bigquery_rowcount = None
+
+    @property
+    def rowcount(self):
+        if self.bigquery_rowcount is not None:
+            return self.bigquery_rowcount
+        return super(BigQueryExecutionContext, self).rowcount
+
     def create_cursor(self):
-        # Set arraysize
         c = super(BigQueryExecutionContext, self).create_cursor()
+
+        # Set arraysize
         if self.dialect.arraysize:
             c.arraysize = self.dialect.arraysize
+        if self._is_server_side and self.execution_options.get("yield_per"):
+            # Get result pages of the size rows are consumed in.
+            c.arraysize = self.execution_options["yield_per"]
         return c
 
+    def create_default_cursor(self):
+        if (
+            self.execution_options.get("bigquery_use_storage_api")
+            or self.execution_options.get("bigquery_prefetch_pages")
+            or self.execution_options.get("bigquery_result_cache")
+            or self.execution_options.get(
+                "bigquery_coalesce_queries", self.dialect.coalesce_queries
+            )
+            or self.uses_native_query_parameters
+            or self.__running_jobs() is not None
+            or self.__job_creation_mode() is not None
+        ):
+            return self.__bigquery_cursor()
+        return super(BigQueryExecutionContext, self).create_default_cursor()
+
+    def create_server_side_cursor(self):
+        # Used with the stream_results execution option (and yield_per).
+        # Result pages are fetched as rows are consumed, and only the
+        # page being consumed is held in memory.
+        return self.__bigquery_cursor()
+
+    def __bigquery_cursor(self):
+        fetcher = None
+        if self.execution_options.get("bigquery_use_storage_api"):
+            fetcher = self.dialect.storage_api_fetcher
+        return _cursor.Cursor(
+            _driver_connection(self._dbapi_connection),
+            fetcher,
+            prefetch_pages=self.execution_options.get("bigquery_prefetch_pages", 0),
+            jobs=self.__running_jobs(),
+            timeout=self.execution_options.get("bigquery_timeout"),
+            job_creation_mode=self.__job_creation_mode(),
+        )
+
+    def __job_creation_mode(self):
+        # The bigquery_job_creation_mode execution option can require jobs
+        # for statements of engines whose queries needn't create them.
+        # Requests get their job creation mode from the client, so it
+        # can't let statements run without jobs.
+        mode = self.execution_options.get("bigquery_job_creation_mode")
+        if mode is None:
+            return None
+        if mode != "required":
+            raise sqlalchemy.exc.ArgumentError(
+                f"bigquery_job_creation_mode can only be 'required', not {mode!r}."
+                f" To run queries without jobs, create the engine with"
+                f" job_creation_mode='optional'."
+            )
+        return _job_creation_modes[mode]
+
+    def __running_jobs(self):
+        # Queries are run as jobs that can be cancelled with a timeout, or
+        # the bigquery_cancel_jobs execution option.
+        options = self.execution_options
+        if options.get("bigquery_timeout") is not None or options.get(
+            "bigquery_cancel_jobs", self.dialect.cancel_jobs
+        ):
+            return self.dialect.running_jobs
+        return None
+
+    @property
+    def bigquery_job(self):
+        """The query job the statement is running, or last ran
+
+        Only if its jobs can be cancelled, e.g. with the ``bigquery_timeout``
+        execution option.
+        """
+        cursor = getattr(self.cursor, "driver_cursor", self.cursor)
+        return getattr(cursor, "job", None)
+
     def get_insert_default(self, column):  # pragma: NO COVER
         # Only used by compliance tests
         if isinstance(column.type, Integer):
@@ -137,58 +277,235 @@ class BigQueryExecutionContext(DefaultExecutionContext):
         elif isinstance(column.type, String):
             return str(uuid.uuid4())
 
-    __remove_type_from_empty_in = _helpers.substitute_string_re_method(
-        r"""
-        \sIN\sUNNEST\(\[\s               # ' IN UNNEST([ '
-        (
-        (?:NULL|\(NULL(?:,\sNULL)+\))\)  # '(NULL)' or '((NULL, NULL, ...))'
-        \s(?:AND|OR)\s\(1\s!?=\s1        # ' and 1 != 1' or ' or 1 = 1'
+    @property
+    def uses_native_query_parameters(self):
+        return self.compiled is not None and self.dialect.native_query_parameters
+
+    def record_batches(self):
+        """Iterate over the results as Arrow record batches
+
+        Results have to be fetched with the BigQuery client, e.g. with the
+        ``bigquery_use_storage_api`` execution option, and rows can't have
+        been fetched already.
+        """
+        if not isinstance(self.cursor, _cursor.Cursor):
+            raise NotImplementedError(
+                "Record batches are only available when results are fetched"
+                " with the BigQuery client, e.g. with the"
+                " bigquery_use_storage_api execution option."
+            )
+
+        return self.cursor.record_batches()
+
+    @property
+    def insert_strategy(self):
+        return self.execution_options.get(
+            "bigquery_insert_strategy", self.dialect.insert_strategy
         )
-        (?:[:][A-Z0-9]+)?                # Maybe ':TYPE' (e.g. ':INT64')
-        \s\]\)                           # Close: ' ])'
-        """,
-        flags=re.IGNORECASE | re.VERBOSE,
-        repl=r" IN(\1)",
-    )
 
-    @_helpers.substitute_re_method(
-        r"""
-        \sIN\sUNNEST\(\[\s       # ' IN UNNEST([ '
-        (                        # Placeholders. See below.
-        %\([^)]+_\d+\)s          # Placeholder '%(foo_1)s'
-        (?:,\s                   # 0 or more placeholders
-        %\([^)]+_\d+\)s
-        )*
-        )?
-        :([A-Z0-9]+)             # Type ':TYPE' (e.g. ':INT64')
-        \s\]\)                   # Close: ' ])'
-        """,
-        flags=re.IGNORECASE | re.VERBOSE,
-    )
-    def __distribute_types_to_expanded_placeholders(self, m):  # pragma: NO COVER
-        # If we have an in parameter, it sometimes gets expaned to 0 or more
-        # parameters and we need to move the type marker to each
-        # parameter.
-        # (The way SQLAlchemy handles this is a bit awkward for our
-        # purposes.)
-
-        # In the placeholder part of the regex above, the `_\d+
-        # suffixes refect that when an array parameter is expanded,
-        # numeric suffixes are added.  For example, a placeholder like
-        # `%(foo)s` gets expaneded to `%(foo_0)s, `%(foo_1)s, ...`.
-
-        # Coverage: despite our best efforts, never recognized this segment of code as being tested.
-        placeholders, type_ = m.groups()
-        if placeholders:
-            placeholders = placeholders.replace(")", f":{type_})")
-        else:
-            placeholders = ""
-        return f" IN UNNEST([ {placeholders} ])"
+    def bulk_insert_rows(self):
+        """Get the rows inserted by an executemany INSERT
+
+        For inserting them other than with DML, e.g. with a load job.
+        Rows are dictionaries of bind-processed values, by column name.
+        Returns None if the statement can only be run as DML, e.g.
+        because it inserts SQL expressions or returns rows.
+        """
+        if not (self.isinsert and self.executemany and self.compiled is not None):
+            return None
+
+        statement = self.compiled.statement
+        if (
+            not isinstance(statement.table, Table)
+            or statement.select is not None
+            or statement._values
+            or statement._multi_values
+            or self.compiled.returning
+            or any(
+                column.default is not None
+                and (column.default.is_clause_element or column.default.is_sequence)
+                for column in statement.table.columns
+            )
+        ):
+            return None
+
+        escaped_bind_names = self.compiled.escaped_bind_names
+        columns = [
+            (column.name, escaped_bind_names.get(column.key, column.key))
+            for column in statement.table.columns
+            if column.key in self.compiled_parameters[0]
+        ]
+        return [
+            {name: parameters[bind_name] for name, bind_name in columns}
+            for parameters in self.parameters
+        ]
+
+    def bigquery_query_parameters(self, parameters, compiled=None):
+        """Get the query parameters for a dictionary of parameter values
+
+        Used when executing with native query parameters. The parameters
+        are for the context's compiled statement, unless another is given.
+        """
+        compiled = self.compiled if compiled is None else compiled
+        factories = getattr(compiled, "bigquery_parameter_factories", None) or {}
+        return [
+            self.__parameter_factory(factories, name)(name, value)
+            for name, value in parameters.items()
+        ]
+
+    @staticmethod
+    def __parameter_factory(factories, name):
+        factory = factories.get(name)
+        if factory is None:
+            # Parameters of insertmanyvalues batches are renamed from
+            # 'name' to 'name__<row>'.
+            m = _insertmanyvalues_parameter_name(name)
+            factory = factories.get(m.group(1)) if m else None
+        return factory or _query_parameters.untyped_parameter
+
+    def unnest_rows_executions(self):
+        """Get the statements that apply an executemany UPDATE's or DELETE's rows
+
+        Rather than running the statement once per row, the rows are bound
+        as an array of STRUCTs, and read from UNNEST, by one statement per
+        ``unnest_executemany_page_size`` rows. Returns a list of statements
+        and their parameters, or None if the statement has to be run once
+        per row, e.g. because its WHERE clause doesn't just pick rows by
+        key, or an UPDATE's rows would change the same table row.
+        """
+        if not (
+            self.executemany
+            and (self.isupdate or self.isdelete)
+            and self.compiled is not None
+            and self.execution_options.get(
+                "bigquery_unnest_executemany", self.dialect.unnest_executemany
+            )
+        ):
+            return None
+
+        unnest = self.compiled.bigquery_unnest_rows
+        if unnest is None:
+            return None
+
+        rows = unnest.rows(self.parameters)
+        if rows is None:
+            return None
+
+        parameters = {
+            name: self.parameters[0][row_name] for name, row_name in unnest.parameters
+        }
+        page_size = self.dialect.unnest_executemany_page_size
+        executions = []
+        for i in range(0, len(rows), page_size):
+            page = rows[i : i + page_size]
+            page_parameters = dict(parameters)
+            page_parameters[_unnest_rows.ROWS] = page
+            if self.uses_native_query_parameters:
+                page_statement = unnest.compiled.string
+                page_parameters = self.bigquery_query_parameters(
+                    page_parameters, unnest.compiled
+                )
+            else:
+                page_statement = unnest.statement(page)
+            executions.append((page_statement, page_parameters))
+
+        return executions
 
     def pre_exec(self):
-        self.statement = self.__distribute_types_to_expanded_placeholders(
-            self.__remove_type_from_empty_in(self.statement)
-        )
+        if self.__is_insertmanyvalues:
+            if self.insert_strategy != "dml" and self.bulk_insert_rows() is not None:
+                # Run as an executemany, so do_executemany() inserts the
+                # rows other than with DML.
+                self.execute_style = type(self.execute_style).EXECUTEMANY
+            elif "insertmanyvalues_page_size" not in self.execution_options:
+                self.execution_options = self.execution_options.union(
+                    {
+                        "insertmanyvalues_page_size": (
+                            self.dialect._insertmanyvalues_page_size(
+                                self.compiled, self.statement
+                            )
+                        )
+                    }
+                )
+
+        numeric_binds = getattr(self.compiled, "bigquery_numeric_binds", None)
+        if numeric_binds and not self.__is_insertmanyvalues:
+            self.__widen_numeric_binds(numeric_binds)
+
+    @property
+    def bigquery_is_query(self):
+        """Whether the statement is a query, which changes no tables"""
+        if self.isddl:
+            return False
+        if self.compiled is None:
+            return _is_query(self.statement)
+        return getattr(self.compiled, "bigquery_modified_tables", None) == ()
+
+    def post_exec(self):
+        if self.execution_options.get("bigquery_dry_run"):
+            return
+
+        if self.isddl:
+            tables = getattr(self.compiled, "bigquery_ddl_tables", None)
+            self.dialect._invalidate_table_metadata(tables)
+        elif self.compiled is not None:
+            tables = getattr(self.compiled, "bigquery_modified_tables", None)
+        else:
+            tables = () if _is_query(self.statement) else None
+        if tables is None or tables:
+            self.dialect._invalidate_results(tables)
+
+    @property
+    def __is_insertmanyvalues(self):
+        # Parameters of insertmanyvalues batches are widened when the
+        # batches are made. See BigQueryCompiler.visit_insert.
+        execute_style = getattr(self, "execute_style", None)
+        return getattr(execute_style, "name", None) == "INSERTMANYVALUES"
+
+    def __widen_numeric_binds(self, numeric_binds):
+        # NUMERIC parameters whose values don't fit NUMERIC's precision or
+        # scale have to be passed as BIGNUMERIC instead.  We decide this
+        # here, rather than when compiling, because compiled statements
+        # are cached and reused with different values.
+        for name, type_ in numeric_binds.items():
+            if any(
+                _query_parameters.needs_bignumeric(type_, value)
+                for parameters in self.parameters
+                for value in _iter_values(parameters.get(name))
+            ):
+                self.statement = self.statement.replace(
+                    f"%({name}:NUMERIC)s", f"%({name}:BIGNUMERIC)s"
+                )
+
+
+_native_bind_translate_re = re.compile(r"\W")
+
+# Whether textual SQL is a query, which doesn't change any tables, rather
+# than, e.g., DML, DDL or a script.
+_query_re = re.compile(
+    r"\s*(?:(?:--|#)[^\n]*\n\s*|/\*.*?\*/\s*)*\(*\s*(?:SELECT|WITH)\b[^;]*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def _driver_connection(dbapi_connection):
+    # The BigQuery DB-API connection of a pooled connection, which may be
+    # adapted, e.g. by the asyncio dialect.
+    driver_connection = getattr(dbapi_connection, "driver_connection", None)
+    if driver_connection is not None:
+        return driver_connection
+    if isinstance(dbapi_connection, sqlalchemy.pool._ConnectionFairy):
+        # Before SQLAlchemy 1.4.24, pooled connections have no
+        # driver_connection, but have the DB-API connection.
+        return dbapi_connection.connection
+    return dbapi_connection
+
+
+def _is_query(statement):
+    return _query_re.match(statement) is not None
+
+
+_insertmanyvalues_parameter_name = re.compile(r"(.+)__\d+$").match
 
 
 class BigQueryCompiler(_struct.SQLCompiler, vendored_postgresql.PGCompiler):
@@ -201,8 +518,31 @@ class BigQueryCompiler(_struct.SQLCompiler, vendored_postgresql.PGCompiler):
     def __init__(self, dialect, statement, *args, **kwargs):
         if isinstance(statement, Column):
             kwargs["compile_kwargs"] = util.immutabledict({"include_table": False})
+
+        # Parameters with a NUMERIC type of unspecified precision or scale,
+        # by name.  See visit_bindparam.
+        self.bigquery_numeric_binds = {}
+
+        # Types of parameters renamed by insertmanyvalues, by name. See
+        # visit_insert.
+        self.__insertmanyvalues_types = {}
+
+        # Names of expanding IN parameters that get rendered as
+        # 'UNNEST([ ... ])'. See __in_expanding_bind.
+        self.__unnest_expanding_binds = set()
+
+        # Query parameter factories, by parameter name, when using native
+        # query parameters. See visit_bindparam.
+        self.bigquery_parameter_factories = None
+        if dialect.native_query_parameters:
+            self.bigquery_parameter_factories = {}
+
         super(BigQueryCompiler, self).__init__(dialect, statement, *args, **kwargs)
 
+        if self.bigquery_parameter_factories is not None:
+            # Used to render expanded parameters when executing.
+            self.bindtemplate = "@%(name)s"
+
     def visit_insert(self, insert_stmt, asfrom=False, **kw):
         # The (internal) documentation for `inline` is confusing, but
         # having `inline` be true prevents us from generating default
@@ -213,10 +553,111 @@ class BigQueryCompiler(_struct.SQLCompiler, vendored_postgresql.PGCompiler):
 
         self.inline = False
 
-        return super(BigQueryCompiler, self).visit_insert(
+        text = super(BigQueryCompiler, self).visit_insert(
             insert_stmt, asfrom=False, **kw
         )
 
+        imv = getattr(self, "_insertmanyvalues", None)
+        if imv is not None and self.bigquery_parameter_factories is None:
+            # insertmanyvalues renames each row's parameters by replacing
+            # their '%(name)s' placeholders, so take the type markers out
+            # of the placeholders it renames. They're put back in the
+            # renamed placeholders in _deliver_insertmanyvalues_batches.
+            self._insertmanyvalues = imv._replace(
+                insert_crud_params=[
+                    (column, key, self.__untype_placeholders(formatted), bind_keys)
+                    for column, key, formatted, bind_keys in imv.insert_crud_params
+                ]
+            )
+
+        return text
+
+    def __untype_placeholders(self, formatted):
+        def untype(m):
+            name, bq_type = m.groups()
+            self.__insertmanyvalues_types[name] = bq_type
+            return f"%({name})s"
+
+        return self.__typed_placeholder.sub(untype, formatted)
+
+    def _deliver_insertmanyvalues_batches(self, *args, **kwargs):
+        batches = super(BigQueryCompiler, self)._deliver_insertmanyvalues_batches(
+            *args, **kwargs
+        )
+        for batch in batches:
+            if self.__insertmanyvalues_types:
+                # Batches start with their statement and parameters. They're
+                # plain tuples before SQLAlchemy 2.0.10 and named tuples after.
+                statement, parameters, *rest = batch
+                statement = self.__retype_placeholders(statement, parameters)
+                retyped = (statement, parameters, *rest)
+                batch = batch._make(retyped) if hasattr(batch, "_make") else retyped
+            yield batch
+
+    def __retype_placeholders(self, statement, parameters):
+        def retype(m):
+            name, row = m.groups()
+            bq_type = self.__insertmanyvalues_types.get(name)
+            if bq_type is None:
+                return m.group(0)
+
+            numeric_type = self.bigquery_numeric_binds.get(name)
+            if numeric_type is not None and _query_parameters.needs_bignumeric(
+                numeric_type, parameters.get(f"{name}__{row}")
+            ):
+                bq_type = "BIGNUMERIC"
+            return f"%({name}__{row}:{bq_type})s"
+
+        return self.__renamed_placeholder.sub(retype, statement)
+
+    # Typed placeholders, e.g. '%(name:INT64)s'.
+    __typed_placeholder = re.compile(r"(?<!%)%\(([^():]+):([^()]+)\)s")
+
+    # Placeholders renamed by insertmanyvalues, e.g. '%(name__3)s'.
+    __renamed_placeholder = re.compile(r"(?<!%)%\(([^():]+)__(\d+)\)s")
+
+    @util.memoized_property
+    def bigquery_unnest_rows(self):
+        """The statement, rewritten to apply all of an executemany's rows at once
+
+        An ``_unnest_rows.UnnestRows``, or None if the statement can't be
+        rewritten. Computed when first needed, and kept with the (cached)
+        compiled statement.
+        """
+        return _unnest_rows.UnnestRows.from_compiled(self)
+
+    @util.memoized_property
+    def bigquery_referenced_tables(self):
+        """The tables the statement reads, as (schema, name)s
+
+        None if they aren't known, e.g. because the statement has textual
+        SQL.
+        """
+        tables = set()
+        for element in visitors.iterate(self.statement):
+            if isinstance(element, elements.TextClause):
+                return None
+            if isinstance(element, selectable.TableClause):
+                tables.add((element.schema, element.name))
+        return frozenset(tables)
+
+    @util.memoized_property
+    def bigquery_modified_tables(self):
+        """The tables the statement changes, as (schema, name)s
+
+        Empty for queries. None if they aren't known, e.g. for textual SQL
+        that isn't a query.
+        """
+        statement = self.statement
+        if isinstance(statement, (UpdateBase, dml.Merge)):
+            table = statement.table
+            if isinstance(table, selectable.TableClause):
+                return [(table.schema, table.name)]
+            return None
+        if isinstance(statement, elements.TextClause):
+            return () if _is_query(statement.text) else None
+        return ()
+
     def visit_table_valued_alias(self, element, **kw):
         # When using table-valued functions, like UNNEST, BigQuery requires a
         # FROM for any table referenced in the function, including expressions
@@ -374,21 +815,51 @@ class BigQueryCompiler(_struct.SQLCompiler, vendored_postgresql.PGCompiler):
         "" if __sqlalchemy_version_info < packaging.version.parse("1.4.27") else "__"
     )
 
-    __in_expanding_bind = _helpers.substitute_string_re_method(
+    @_helpers.substitute_re_method(
         rf"""
         \sIN\s\(                     # ' IN ('
         (
         {__expanding_conflict}\[     # Expanding placeholder
-        {__expanding_text}           #   e.g. [EXPANDING_foo_1]
-        _[^\]]+                      #
+        {__expanding_text}_          #   e.g. [POSTCOMPILE_foo_1]
+        ([^\]~]+)                    #   (without a bind expression)
         \]
-        (:[A-Z0-9]+)?                # type marker (e.g. ':INT64'
         )
         \)$                          # close w ending )
         """,
         flags=re.IGNORECASE | re.VERBOSE,
-        repl=r" IN UNNEST([ \1 ])",
     )
+    def __in_expanding_bind(self, m):
+        # When the statement is executed, SQLAlchemy replaces the
+        # placeholder with the expanded parameters, which we render in
+        # their final form. See _literal_execute_expanding_parameter below.
+        placeholder, name = m.groups()
+        self.__unnest_expanding_binds.add(name)
+        return f" IN UNNEST([ {placeholder} ])"
+
+    def _literal_execute_expanding_parameter(self, name, parameter, values):
+        to_update, replacement = super(
+            BigQueryCompiler, self
+        )._literal_execute_expanding_parameter(name, parameter, values)
+
+        if name not in self.__unnest_expanding_binds:
+            return to_update, replacement
+
+        if not values:
+            # SQLAlchemy's empty-set expression (e.g. 'NULL) AND (1 != 1')
+            # is meant to be wrapped in the parentheses of 'IN (...)'.
+            # Nothing is in an empty array.
+            return to_update, ""
+
+        type_ = parameter.type
+        if not (
+            parameter.literal_execute
+            or isinstance(type_, NullType)
+            or type_._is_tuple_type
+        ):
+            bq_type = self.__bigquery_type(type_)
+            replacement = ", ".join(f"%({key}:{bq_type})s" for key, _ in to_update)
+
+        return to_update, replacement
 
     def visit_in_op_binary(self, binary, operator_, **kw):
         return self.__in_expanding_bind(
@@ -412,12 +883,20 @@ class BigQueryCompiler(_struct.SQLCompiler, vendored_postgresql.PGCompiler):
 
     @staticmethod
     def _maybe_reescape(binary):
+        # Don't modify the original expression, or its bind parameter:
+        # the compiled statement may be cached and reused with the
+        # values of a different, but equivalent, expression.  Instead,
+        # re-escape values as they're bound, via the parameter's type.
         binary = binary._clone()
+        binary.modifiers = dict(binary.modifiers)
         escape = binary.modifiers.pop("escape", None)
-        if escape and escape != "\\":
-            binary.right.value = escape.join(
-                v.replace(escape, "\\")
-                for v in binary.right.value.split(escape + escape)
+        if (
+            escape
+            and escape != "\\"
+            and isinstance(binary.right, elements.BindParameter)
+        ):
+            binary.right = binary.right._with_binary_element_type(
+                _ReescapedString(escape)
             )
         return binary
 
@@ -471,6 +950,9 @@ class BigQueryCompiler(_struct.SQLCompiler, vendored_postgresql.PGCompiler):
         flags=re.VERBOSE | re.IGNORECASE,
     )
 
+    def __bigquery_type(self, type_):
+        return self.__remove_type_parameter(self.dialect.type_compiler.process(type_))
+
     def visit_bindparam(
         self,
         bindparam,
@@ -527,44 +1009,130 @@ class BigQueryCompiler(_struct.SQLCompiler, vendored_postgresql.PGCompiler):
             **kwargs,
         )
 
-        if literal_binds or isinstance(type_, NullType):
+        if literal_binds:
             return param
 
-        if (
-            isinstance(type_, Numeric)
-            and (type_.precision is None or type_.scale is None)
-            and isinstance(bindparam.value, Decimal)
-        ):
-            t = bindparam.value.as_tuple()
-
-            if type_.precision is None:
-                type_.precision = len(t.digits)
+        if self.bigquery_parameter_factories is not None:
+            return self.__native_bindparam(param, type_, unnest)
 
-            if type_.scale is None and t.exponent < 0:
-                type_.scale = -t.exponent
+        if isinstance(type_, NullType):
+            return param
 
-        bq_type = self.dialect.type_compiler.process(type_)
-        bq_type = self.__remove_type_parameter(bq_type)
+        bq_type = self.__bigquery_type(type_)
 
         assert_(param != "%s", f"Unexpected param: {param}")
 
         if bindparam.expanding:  # pragma: NO COVER
+            # Type markers are added to the individual parameters when
+            # they're expanded. See _literal_execute_expanding_parameter.
             assert_(self.__expanded_param(param), f"Unexpected param: {param}")
-            if self.__sqlalchemy_version_info < packaging.version.parse("1.4.27"):
-                param = param.replace(")", f":{bq_type})")
 
         else:
             m = self.__placeholder(param)
             if m:
-                name, type_ = m.groups()
-                assert_(type_ is None)
+                name, marker = m.groups()
+                assert_(marker is None)
                 param = f"%({name}:{bq_type})s"
 
+                if (
+                    bq_type == "NUMERIC"
+                    and isinstance(type_, Numeric)
+                    and (type_.precision is None or type_.scale is None)
+                ):
+                    # Whether we need NUMERIC or BIGNUMERIC depends on
+                    # the value, which may differ each time a cached
+                    # statement is executed, so leave it to the
+                    # execution context.
+                    self.bigquery_numeric_binds[name] = type_
+
         if unnest:
             param = f"UNNEST({param})"
 
         return param
 
+    def bindparam_string(self, name, **kw):
+        if self.bigquery_parameter_factories is not None:
+            # Native parameters are rendered as '@name', so their names
+            # have to be identifiers.
+            escaped = _native_bind_translate_re.sub("_", name)
+            if escaped != name:
+                kw["escaped_from"] = kw.get("escaped_from") or name
+                name = escaped
+        return super(BigQueryCompiler, self).bindparam_string(name, **kw)
+
+    def __native_bindparam(self, param, type_, unnest):
+        m = self.__placeholder(param)
+        if not m:
+            # Expanding parameters are rendered when they're expanded.
+            return param
+
+        name, marker = m.groups()
+        assert_(marker is None)
+        if unnest:
+            type_ = sqlalchemy.ARRAY(type_)
+        self.bigquery_parameter_factories[name] = _query_parameters.parameter_factory(
+            type_, self.__bigquery_type
+        )
+        param = f"@{name}"
+        if unnest:
+            param = f"UNNEST({param})"
+
+        return param
+
+    def visit_merge(self, merge, **kw):
+        if merge.source is None or merge.condition is None:
+            raise sqlalchemy.exc.CompileError(
+                "MERGE statements need a source, from using(), and a condition,"
+                " from on()."
+            )
+        if not merge.whens:
+            raise sqlalchemy.exc.CompileError(
+                "MERGE statements need at least one WHEN clause, e.g. from"
+                " when_matched_then_update()."
+            )
+
+        # Like UPDATEs, the target table can be referred to in subqueries.
+        self.stack.append(
+            {
+                "correlate_froms": {merge.table},
+                "asfrom_froms": {merge.table},
+                "selectable": merge,
+            }
+        )
+        text = (
+            f"MERGE {merge.table._compiler_dispatch(self, asfrom=True, **kw)}"
+            f" USING {merge.source._compiler_dispatch(self, asfrom=True, **kw)}"
+            f" ON {self.process(merge.condition, **kw)}"
+        )
+        for when in merge.whens:
+            text += " " + self.process(when, **kw)
+        self.stack.pop(-1)
+        return text
+
+    def visit_merge_when(self, when, **kw):
+        text = f"WHEN {when.match}"
+        if when.condition is not None:
+            text += f" AND {self.process(when.condition, **kw)}"
+        text += " THEN "
+
+        quote = self.preparer.quote
+        if when.action == "DELETE":
+            return text + "DELETE"
+        if when.action == "UPDATE":
+            return (
+                text
+                + "UPDATE SET "
+                + ", ".join(
+                    f"{quote(column.name)}={self.process(value, **kw)}"
+                    for column, value in zip(when.columns, when.values)
+                )
+            )
+        if when.columns is None:
+            return text + "INSERT ROW"
+        columns = ", ".join(quote(column.name) for column in when.columns)
+        values = ", ".join(self.process(value, **kw) for value in when.values)
+        return text + f"INSERT ({columns}) VALUES ({values})"
+
     def visit_getitem_binary(self, binary, operator_, **kw):
         left = self.process(binary.left, **kw)
         right = self.process(binary.right, **kw)
@@ -641,6 +1209,22 @@ class BigQueryTypeCompiler(GenericTypeCompiler):
     visit_DECIMAL = visit_NUMERIC
 
 
+def _ddl_tables(statement):
+    element = getattr(statement, "element", None)
+    if isinstance(element, Column):
+        element = element.table
+    if isinstance(element, Table):
+        return [(element.schema, element.name)]
+
+    # E.g. Alembic's ALTER TABLE statements
+    table_name = getattr(statement, "table_name", None)
+    if table_name is not None:
+        table_names = table_name, getattr(statement, "new_table_name", None)
+        return [(statement.schema, name) for name in table_names if name]
+
+    return None
+
+
 class BigQueryDDLCompiler(DDLCompiler):
     option_datatype_mapping = {
         "friendly_name": str,
@@ -649,6 +1233,13 @@ class BigQueryDDLCompiler(DDLCompiler):
         "default_rounding_mode": str,
     }
 
+    def __init__(self, dialect, statement, *args, **kwargs):
+        super(BigQueryDDLCompiler, self).__init__(dialect, statement, *args, **kwargs)
+        # The (schema, name)s of the tables the statement changes, so their
+        # cached metadata can be invalidated when it's run, or None if
+        # they aren't known.
+        self.bigquery_ddl_tables = _ddl_tables(statement)
+
     # BigQuery has no support for foreign keys.
     def visit_foreign_key_constraint(self, constraint, **kw):
         return None
@@ -667,7 +1258,8 @@ class BigQueryDDLCompiler(DDLCompiler):
         )
         if column.comment is not None:
             colspec = "{} OPTIONS(description={})".format(
-                colspec, process_string_literal(column.comment)
+                colspec,
+                self.sql_compiler.render_literal_value(column.comment, String()),
             )
         return colspec
 
@@ -973,7 +1565,7 @@ class BigQueryDDLCompiler(DDLCompiler):
         """
         option_casting = {
             # Mapping from option type to its casting method
-            str: lambda x: process_string_literal(x),
+            str: lambda x: self.sql_compiler.render_literal_value(x, String()),
             int: lambda x: x,
             float: lambda x: x,
             bool: lambda x: "true" if x else "false",
@@ -990,9 +1582,37 @@ def process_string_literal(value):
     return repr(value.replace("%", "%%"))
 
 
+class _ReescapedString(sqlalchemy.types.TypeDecorator):
+    """String whose LIKE escapes are converted to BigQuery's (\\)
+
+    SQLAlchemy escapes ``%`` and ``_`` in LIKE patterns with a
+    configurable escape character, but BigQuery only supports ``\\``.
+    """
+
+    impl = String
+    cache_ok = True
+
+    def __init__(self, escape):
+        super().__init__()
+        self.escape = escape
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+
+        escape = self.escape
+        return escape.join(
+            v.replace(escape, "\\") for v in value.split(escape + escape)
+        )
+
+    process_literal_param = process_bind_param
+
+
 class BQString(String):
     def literal_processor(self, dialect):
-        return process_string_literal
+        if dialect.identifier_preparer._double_percents:
+            return process_string_literal
+        return repr
 
 
 class BQBinary(sqlalchemy.sql.sqltypes._Binary):
@@ -1001,7 +1621,9 @@ class BQBinary(sqlalchemy.sql.sqltypes._Binary):
         return repr(value.replace(b"%", b"%%"))
 
     def literal_processor(self, dialect):
-        return self.__process_bytes_literal
+        if dialect.identifier_preparer._double_percents:
+            return self.__process_bytes_literal
+        return repr
 
 
 class BQClassTaggedStr(sqlalchemy.sql.type_api.TypeEngine):
@@ -1040,6 +1662,16 @@ class BQArray(sqlalchemy.sql.sqltypes.ARRAY):
         return process_array_literal
 
 
+# How executemany INSERTs are run: as DML, or as load jobs.
+_insert_strategies = ("dml", "load_job", "storage_write")
+
+# Job creation modes, for the job_creation_mode option, by name.
+_job_creation_modes = {
+    "required": "JOB_CREATION_REQUIRED",
+    "optional": "JOB_CREATION_OPTIONAL",
+}
+
+
 class BigQueryDialect(DefaultDialect):
     name = "bigquery"
     driver = "bigquery"
@@ -1056,7 +1688,20 @@ class BigQueryDialect(DefaultDialect):
     supports_default_values = False
     supports_empty_insert = False
     supports_multivalues_insert = True
-    supports_statement_cache = False
+    use_insertmanyvalues = True
+    use_insertmanyvalues_wo_returning = True
+    # The most rows per insertmanyvalues batch. Batches are made smaller
+    # to fit BigQuery's limits. See _insertmanyvalues_page_size.
+    insertmanyvalues_page_size = 10000
+    # BigQuery's limits on the number of parameters of a query, and on
+    # the length (in bytes) of a query.
+    insertmanyvalues_max_parameters = 10000
+    max_query_bytes = 1024 * 1024
+    # The most rows per statement when executemany UPDATEs and DELETEs are
+    # run as one statement.
+    unnest_executemany_page_size = 10000
+    supports_statement_cache = True
+    supports_server_side_cursors = True
     supports_unicode_statements = True
     supports_unicode_binds = True
     supports_native_decimal = True
@@ -1086,10 +1731,37 @@ class BigQueryDialect(DefaultDialect):
         credentials_info=None,
         credentials_base64=None,
         list_tables_page_size=1000,
+        native_query_parameters=False,
+        reflection_max_workers=8,
+        reflection_source="api",
+        metadata_cache_ttl=0,
+        metadata_cache_size=1000,
+        insert_strategy="dml",
+        load_job_format="json",
+        storage_write_max_batch_bytes=8 * 1024 * 1024,
+        storage_write_max_batch_rows=10000,
+        storage_write_max_inflight=4,
+        unnest_executemany=True,
+        dry_run_cache_ttl=60,
+        dry_run_cache_size=1000,
+        result_cache_ttl=60,
+        result_cache_size=1000,
+        result_cache_max_bytes=64 * 1024 * 1024,
+        coalesce_queries=False,
+        cancel_jobs=False,
+        job_creation_mode=None,
+        ping_interval=60,
+        shared_client=False,
+        http_pool_connections=None,
+        http_pool_maxsize=None,
         *args,
         **kwargs,
     ):
+        self.native_query_parameters = native_query_parameters
         super(BigQueryDialect, self).__init__(*args, **kwargs)
+        # Fetches results with the bigquery_use_storage_api execution
+        # option. Replaceable, e.g. for testing.
+        self.storage_api_fetcher = _cursor.StorageApiFetcher()
         self.arraysize = arraysize
         self.credentials_path = credentials_path
         self.credentials_info = credentials_info
@@ -1100,6 +1772,91 @@ class BigQueryDialect(DefaultDialect):
         self.identifier_preparer = self.preparer(self)
         self.dataset_id = None
         self.list_tables_page_size = list_tables_page_size
+        self.reflection_max_workers = reflection_max_workers
+        self.reflection_source = reflection_source
+        # Reads tables with reflection_source="information_schema".
+        # Replaceable, e.g. for testing.
+        self.information_schema = _information_schema.InformationSchema()
+        # Tables fetched for reflection, by table id. Disabled by default.
+        self.metadata_cache = _cache.TTLCache(metadata_cache_ttl, metadata_cache_size)
+        if insert_strategy not in _insert_strategies:
+            raise ValueError(
+                f"insert_strategy must be one of {', '.join(_insert_strategies)},"
+                f" not {insert_strategy!r}"
+            )
+        self.insert_strategy = insert_strategy
+        if load_job_format not in _load_jobs.SOURCE_FORMATS:
+            raise ValueError(
+                f"load_job_format must be one of"
+                f" {', '.join(_load_jobs.SOURCE_FORMATS)}, not {load_job_format!r}"
+            )
+        self.load_job_format = load_job_format
+        # Appends rows with insert_strategy="storage_write". Its transport
+        # is replaceable, e.g. for testing.
+        self.storage_writer = _storage_write.StorageWriter(
+            max_batch_bytes=storage_write_max_batch_bytes,
+            max_batch_rows=storage_write_max_batch_rows,
+            max_inflight=storage_write_max_inflight,
+        )
+        # Whether executemany UPDATEs and DELETEs that pick rows by key are
+        # run as one statement. See BigQueryExecutionContext.unnest_rows_executions.
+        self.unnest_executemany = unnest_executemany
+        # Estimates statements' costs, for estimate() and the
+        # bigquery_max_bytes execution option, caching the estimates.
+        self.dry_runner = _dry_run.DryRunner(dry_run_cache_ttl, dry_run_cache_size)
+        # Results of statements executed with the bigquery_result_cache
+        # execution option.
+        self.result_cache = _result_cache.ResultCache(
+            result_cache_ttl, result_cache_size, result_cache_max_bytes
+        )
+        # Whether identical queries executed at the same time share one
+        # query job, unless the bigquery_coalesce_queries execution option
+        # says otherwise.
+        self.coalesce_queries = coalesce_queries
+        self.single_flight = _single_flight.SingleFlight()
+        # Whether queries are run as jobs that are cancelled if they're no
+        # longer wanted, unless the bigquery_cancel_jobs execution option
+        # says otherwise.
+        self.cancel_jobs = cancel_jobs
+        self.running_jobs = _jobs.RunningJobs()
+        # Whether queries create jobs, with jobs.query. "optional" runs
+        # short queries without them, returning their results with the
+        # first response.
+        if (
+            job_creation_mode is not None
+            and job_creation_mode not in _job_creation_modes
+        ):
+            raise ValueError(
+                f"job_creation_mode must be one of"
+                f" {', '.join(_job_creation_modes)}, not {job_creation_mode!r}"
+            )
+        self.job_creation_mode = job_creation_mode
+        # Connections are checked, for pool_pre_ping, with a metadata
+        # request at most once per ping_interval seconds.
+        if ping_interval < 0:
+            raise ValueError(
+                f"ping_interval must not be negative, not {ping_interval!r}"
+            )
+        self.ping_interval = ping_interval
+        self.pinger = _ping.Pinger(ping_interval)
+        # Whether engines with the same settings share a client, from the
+        # process-wide registry.
+        self.shared_client = shared_client
+        self.client_registry = _clients.registry
+        # Stops using the shared client, when the dialect is collected.
+        self._release_client = None
+        # Sizes of the client's HTTP connection pools, e.g. to keep a
+        # connection for each of many threads. requests' defaults if None.
+        for name, value in (
+            ("http_pool_connections", http_pool_connections),
+            ("http_pool_maxsize", http_pool_maxsize),
+        ):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be positive, not {value!r}")
+        self.http_pool_connections = http_pool_connections
+        self.http_pool_maxsize = http_pool_maxsize
+        # Dispatches events.BigQueryEvents.
+        self.bigquery_job_events = events.JobEventTarget()
 
     @classmethod
     def dbapi(cls):
@@ -1133,11 +1890,291 @@ class BigQueryDialect(DefaultDialect):
             job_config.default_dataset = "{}.{}".format(project_id, self.dataset_id)
         return job_config
 
+    def estimate(self, connection, statement, parameters=None):
+        """Estimate the cost of a statement, with a dry run
+
+        The statement, e.g. a ``select()`` or ``text()``, isn't run.
+        Returns an ``Estimate`` of the bytes it would process and the
+        tables it would read. Estimates are cached, for
+        ``dry_run_cache_ttl`` seconds.
+        """
+        if isinstance(statement, str):
+            statement = sqlalchemy.text(statement)
+        result = connection.execute(
+            statement.execution_options(bigquery_dry_run=True), parameters or {}
+        )
+        result.close()
+        return result.context.bigquery_estimate
+
     def do_execute(self, cursor, statement, parameters, context=None):
         kwargs = {}
         if context is not None and context.execution_options.get("job_config"):
             kwargs["job_config"] = context.execution_options.get("job_config")
+        if context is not None and context.uses_native_query_parameters:
+            parameters = context.bigquery_query_parameters(parameters)
+        if context is None:
+            cursor.execute(statement, parameters, **kwargs)
+            return
+
+        query_key = self._query_key(context, cursor, statement, parameters, kwargs)
+        if query_key is None:
+            self._execute(context, cursor, statement, parameters, kwargs)
+            return
+
+        cache_results = (
+            context.execution_options.get("bigquery_result_cache")
+            and self.result_cache.enabled
+        )
+        if cache_results:
+            result = self.result_cache.get(query_key)
+            if result is not None:
+                self._load_result(context, cursor, result)
+                context.bigquery_result_cache_hit = True
+                return
+            generation = self.result_cache.generation
+
+        def execute():
+            self._execute(context, cursor, statement, parameters, kwargs)
+            result = _result_cache.snapshot(
+                cursor.description,
+                cursor.rowcount,
+                cursor.buffer() if cursor.description else (),
+                self._table_ids(
+                    getattr(context.compiled, "bigquery_referenced_tables", None)
+                ),
+            )
+            return result, context.bigquery_job_stats
+
+        if context.execution_options.get(
+            "bigquery_coalesce_queries", self.coalesce_queries
+        ):
+            (result, job_stats), shared = self.single_flight.call(
+                query_key, execute, self._wait_for_query
+            )
+            if shared:
+                # The query was run by another execution, which caches
+                # its results.
+                self._load_result(context, cursor, _result_cache.copy_result(result))
+                context.bigquery_job_stats = job_stats
+                context.bigquery_coalesced = True
+                return
+        else:
+            result, _ = execute()
+
+        if cache_results and result.description:
+            self.result_cache.set(query_key, result, generation)
+
+    def _execute(self, context, cursor, statement, parameters, kwargs):
+        if self._check_cost(context, statement, parameters, kwargs.get("job_config")):
+            return
         cursor.execute(statement, parameters, **kwargs)
+        self._record_job(context, cursor)
+
+    def _load_result(self, context, cursor, result):
+        # Have a cursor return results that have already been fetched.
+        cursor.load(result.description, result.rowcount, result.rows)
+
+    def _wait_for_query(self, future):
+        # Wait for the results of an identical query run by another
+        # execution.
+        return future.result()
+
+    def _query_key(self, context, cursor, statement, parameters, kwargs):
+        """Get the key of a query's results, to cache or share them
+
+        Or None if they aren't to be cached or shared, e.g. because the
+        statement isn't a query, or neither the ``bigquery_result_cache``
+        nor the ``bigquery_coalesce_queries`` execution option is set.
+        """
+        if not (
+            (
+                context.execution_options.get("bigquery_result_cache")
+                and self.result_cache.enabled
+                or context.execution_options.get(
+                    "bigquery_coalesce_queries", self.coalesce_queries
+                )
+            )
+            and not context.execution_options.get("bigquery_dry_run")
+            and not context._is_server_side
+            and self._is_client_cursor(cursor)
+            and context.bigquery_is_query
+        ):
+            return None
+
+        client = _driver_connection(context._dbapi_connection)._client
+        return _cache.query_key(
+            client, statement, parameters, kwargs.get("job_config")
+        ) + (context.execution_options.get("bigquery_max_bytes"),)
+
+    def _record_job(self, context, cursor):
+        """Get the statistics of a cursor's last query job, for its context
+
+        And tell after_bigquery_job listeners about them.
+        """
+        cursor = getattr(cursor, "driver_cursor", cursor)
+        job_stats = _job_stats.from_rows(
+            getattr(cursor, "_query_rows", None),
+            job_started=getattr(cursor, "job", None) is not None,
+        )
+        context.bigquery_job_stats = job_stats
+        dispatch = self.bigquery_job_events.dispatch
+        if job_stats is not None and dispatch.after_bigquery_job:
+            dispatch.after_bigquery_job(context.root_connection, context, job_stats)
+
+    def _check_cost(self, context, statement, parameters, job_config):
+        """Dry-run a statement, if its execution options ask for it
+
+        With the ``bigquery_max_bytes`` execution option, raises an error
+        if the statement would process more bytes than that. Returns true
+        if the statement is only to be dry-run, with the
+        ``bigquery_dry_run`` execution option, which ``estimate()`` uses.
+        """
+        dry_run = context.execution_options.get("bigquery_dry_run", False)
+        max_bytes = context.execution_options.get("bigquery_max_bytes")
+        if not dry_run and max_bytes is None:
+            return False
+
+        estimate = self._estimate(context, statement, parameters, job_config)
+        context.bigquery_estimate = estimate
+        if max_bytes is not None and estimate.total_bytes_processed > max_bytes:
+            raise dbapi.DatabaseError(
+                f"The statement would process {estimate.total_bytes_processed}"
+                f" bytes, more than bigquery_max_bytes ({max_bytes})"
+            )
+        return dry_run
+
+    def _estimate(self, context, statement, parameters, job_config):
+        client = _driver_connection(context._dbapi_connection)._client
+        return self.dry_runner.estimate(client, statement, parameters, job_config)
+
+    def do_executemany(self, cursor, statement, parameters, context=None):
+        if context is not None and context.execution_options.get("bigquery_dry_run"):
+            raise dbapi.NotSupportedError("executemany statements can't be dry-run.")
+
+        if context is not None and context.insert_strategy != "dml":
+            rows = context.bulk_insert_rows()
+            if rows is not None:
+                self._bulk_insert(context, rows)
+                return
+
+        executions = context.unnest_rows_executions() if context is not None else None
+        if executions is not None:
+            kwargs = {}
+            if context.execution_options.get("job_config"):
+                kwargs["job_config"] = context.execution_options.get("job_config")
+            for statement, parameters in executions:
+                self._check_cost(
+                    context, statement, parameters, kwargs.get("job_config")
+                )
+            rowcount = 0
+            for statement, parameters in executions:
+                cursor.execute(statement, parameters, **kwargs)
+                self._record_job(context, cursor)
+                rowcount += max(cursor.rowcount, 0)
+            context.bigquery_rowcount = rowcount
+            return
+
+        if context is not None and "bigquery_max_bytes" in context.execution_options:
+            # Check every row's statement before running any of them.
+            job_config = context.execution_options.get("job_config")
+            for row_parameters in parameters:
+                if context.uses_native_query_parameters:
+                    row_parameters = context.bigquery_query_parameters(row_parameters)
+                self._check_cost(context, statement, row_parameters, job_config)
+
+        if self._is_client_cursor(cursor):
+            if context.uses_native_query_parameters:
+                parameters = [context.bigquery_query_parameters(p) for p in parameters]
+            cursor.executemany(
+                statement,
+                parameters,
+                job_config=context.execution_options.get("job_config"),
+            )
+        else:
+            super(BigQueryDialect, self).do_executemany(
+                cursor, statement, parameters, context
+            )
+        if context is not None:
+            self._record_job(context, cursor)
+
+    def _insertmanyvalues_page_size(self, compiled, statement):
+        """Get the most rows an insertmanyvalues batch can have
+
+        So that the batch's statement is no longer than BigQuery allows.
+        (The number of parameters is limited by SQLAlchemy, with
+        ``insertmanyvalues_max_parameters``.)
+        """
+        imv = compiled._insertmanyvalues
+        values_bytes = len(f"({imv.single_values_expr})".encode("utf-8"))
+        fixed_bytes = len(statement.encode("utf-8")) - values_bytes
+        # Each row's parameters are renamed to 'name__<row>', and rows are
+        # separated by ', '. Allow for the widest row numbers that fit.
+        parameters_per_row = sum(
+            len(bind_keys) for *_, bind_keys in imv.insert_crud_params
+        )
+        available_bytes = self.max_query_bytes - fixed_bytes
+        page_size = self.insertmanyvalues_page_size
+        for digits in range(1, len(str(page_size - 1)) + 1):
+            row_bytes = values_bytes + parameters_per_row * (2 + digits) + 2
+            rows = min(page_size, available_bytes // row_bytes)
+            if rows <= 10**digits:
+                break
+        return max(1, rows)
+
+    def _bulk_insert(self, context, rows):
+        """Append an executemany INSERT's rows to its table
+
+        With a load job or the Storage Write API, depending on the insert
+        strategy.
+        """
+        table = context.compiled.statement.table
+        table_ref = self._table_reference(table.schema, table.name, self.project_id)
+        client = _driver_connection(context._dbapi_connection)._client
+        try:
+            table = self._get_cached_table(client, table_ref)
+            if context.insert_strategy == "storage_write":
+                batches = self.storage_writer.write(client, table, rows)
+                context.bigquery_write_batches = batches
+                context.bigquery_rowcount = sum(batch.rows for batch in batches)
+            else:
+                job = _load_jobs.load_rows(client, table, rows, self.load_job_format)
+                context.bigquery_rowcount = (
+                    job.output_rows if job.output_rows is not None else len(rows)
+                )
+        except google.api_core.exceptions.GoogleAPICallError as exc:
+            raise dbapi.DatabaseError(exc)
+
+    def do_ping(self, dbapi_connection):
+        """Check a connection, for ``pool_pre_ping``, without running a query
+
+        Connections share a client, which is checked with a metadata
+        request at most once per ``ping_interval`` seconds.
+        """
+        connection = _driver_connection(dbapi_connection)
+        if getattr(connection, "_closed", False):
+            return False
+
+        client = connection._client
+        dataset_ref = None
+        if self.dataset_id:
+            dataset_ref = DatasetReference(
+                self.project_id or client.project, self.dataset_id
+            )
+        return self.pinger.ping(client, dataset_ref)
+
+    def do_close(self, dbapi_connection):
+        # Cancel the jobs the connection's statements are waiting for, e.g.
+        # because it's being invalidated.
+        self._cancel_jobs(_driver_connection(dbapi_connection))
+        super(BigQueryDialect, self).do_close(dbapi_connection)
+
+    def _cancel_jobs(self, connection):
+        self.running_jobs.cancel_connection(connection)
+
+    def _is_client_cursor(self, cursor):
+        # Whether statements are run with the BigQuery client, rather than
+        # the DB-API.
+        return isinstance(cursor, _cursor.Cursor)
 
     def create_connect_args(self, url):
         (
@@ -1149,11 +2186,21 @@ class BigQueryDialect(DefaultDialect):
             credentials_base64,
             provided_job_config,
             list_tables_page_size,
+            reflection_source,
+            job_creation_mode,
+            http_pool_connections,
+            http_pool_maxsize,
             user_supplied_client,
         ) = parse_url(url)
 
         self.arraysize = arraysize or self.arraysize
         self.list_tables_page_size = list_tables_page_size or self.list_tables_page_size
+        self.reflection_source = reflection_source or self.reflection_source
+        self.job_creation_mode = job_creation_mode or self.job_creation_mode
+        if http_pool_connections is not None:
+            self.http_pool_connections = http_pool_connections
+        if http_pool_maxsize is not None:
+            self.http_pool_maxsize = http_pool_maxsize
         self.location = location or self.location
         self.credentials_path = credentials_path or self.credentials_path
         self.credentials_base64 = credentials_base64 or self.credentials_base64
@@ -1167,21 +2214,54 @@ class BigQueryDialect(DefaultDialect):
             # create_engine('...', connect_args={'client': bq_client})
             return ([], {})
         else:
-            client = _helpers.create_bigquery_client(
+            client_kwargs = dict(
                 credentials_path=self.credentials_path,
                 credentials_info=self.credentials_info,
                 credentials_base64=self.credentials_base64,
                 project_id=self.billing_project_id,
                 location=self.location,
                 default_query_job_config=default_query_job_config,
+                default_job_creation_mode=_job_creation_modes.get(
+                    self.job_creation_mode
+                ),
+                http_pool_connections=self.http_pool_connections,
+                http_pool_maxsize=self.http_pool_maxsize,
             )
+            if self.shared_client:
+                client = self._acquire_client(client_kwargs)
+            else:
+                client = _helpers.create_bigquery_client(**client_kwargs)
             # If the user specified `bigquery://` we need to set the project_id
             # from the client
             self.project_id = self.project_id or client.project
             self.billing_project_id = self.billing_project_id or client.project
             return ([], {"client": client})
 
-    def _get_table_or_view_names(self, connection, item_types, schema=None):
+    def _acquire_client(self, client_kwargs):
+        key = _clients.client_key(**client_kwargs)
+        client = self.client_registry.acquire(
+            key, lambda: _helpers.create_bigquery_client(**client_kwargs)
+        )
+        if self._release_client is not None:
+            self._release_client()
+        self._release_client = weakref.finalize(self, self.client_registry.release, key)
+        return client
+
+    def _get_table_or_view_names(
+        self, connection, item_types, schema=None, info_cache=None
+    ):
+        return list(
+            self._iter_table_or_view_names(connection, item_types, schema, info_cache)
+        )
+
+    def _iter_table_or_view_names(
+        self, connection, item_types, schema=None, info_cache=None
+    ):
+        """Generate the names of the tables of the given types
+
+        Without a schema, given or in the URL, the tables of all of the
+        project's datasets are listed, several datasets at a time.
+        """
         current_schema = schema or self.dataset_id
         get_table_name = (
             self._build_formatted_table_id
@@ -1189,28 +2269,70 @@ class BigQueryDialect(DefaultDialect):
             else operator.attrgetter("table_id")
         )
 
-        client = connection.connection._client
-        datasets = client.list_datasets(self.project_id)
-
-        result = []
-        for dataset in datasets:
-            if current_schema is not None and current_schema != dataset.dataset_id:
-                continue
+        client = _driver_connection(connection.connection)._client
+        if current_schema is None:
+            dataset_refs = [
+                dataset.reference for dataset in client.list_datasets(self.project_id)
+            ]
+        else:
+            project_id, _, dataset_id = current_schema.rpartition(".")
+            dataset_refs = [
+                DatasetReference(
+                    project_id or self.project_id or client.project, dataset_id
+                )
+            ]
 
+        def list_table_names(dataset_ref):
             try:
-                tables = client.list_tables(
-                    dataset.reference, page_size=self.list_tables_page_size
-                )
-                for table in tables:
-                    if table.table_type in item_types:
-                        result.append(get_table_name(table))
+                if self._reflects_information_schema:
+                    tables = self._information_schema_tables(
+                        client, dataset_ref.project, dataset_ref.dataset_id, info_cache
+                    ).values()
+                else:
+                    tables = client.list_tables(
+                        dataset_ref, page_size=self.list_tables_page_size
+                    )
+                return [
+                    get_table_name(table)
+                    for table in tables
+                    if table.table_type in item_types
+                ]
             except google.api_core.exceptions.NotFound:
                 # It's possible that the dataset was deleted between when we
                 # fetched the list of datasets and when we try to list the
                 # tables from it. See:
                 # https://github.com/googleapis/python-bigquery-sqlalchemy/issues/105
-                pass
-        return result
+                return []
+
+        for table_names in self._map_concurrently(list_table_names, dataset_refs):
+            yield from table_names
+
+    def _map_concurrently(self, function, items):
+        """Generate function(item) for each item, in order
+
+        The function is called for up to ``reflection_max_workers`` items
+        at a time.
+        """
+        max_workers = min(self.reflection_max_workers, len(items))
+        if max_workers <= 1:
+            yield from map(function, items)
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="sqlalchemy-bigquery-reflection",
+        ) as executor:
+            pending = collections.deque()
+            try:
+                for item in items:
+                    if len(pending) == max_workers:
+                        yield pending.popleft().result()
+                    pending.append(executor.submit(function, item))
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
 
     @staticmethod
     def _split_table_name(full_table_name):
@@ -1285,7 +2407,7 @@ class BigQueryDialect(DefaultDialect):
         )
         return table_ref
 
-    def _get_table(self, connection, table_name, schema=None):
+    def _get_table(self, connection, table_name, schema=None, info_cache=None):
         if isinstance(connection, Engine):
             connection = connection.connect()
 
@@ -1293,12 +2415,75 @@ class BigQueryDialect(DefaultDialect):
 
         # table_ref = self._table_reference(schema, table_name, client.project)
         table_ref = self._table_reference(schema, table_name, self.project_id)
-        try:
-            table = client.get_table(table_ref)
-        except NotFound:
+        if self._reflects_information_schema:
+            tables = self._information_schema_tables(
+                client, table_ref.project, table_ref.dataset_id, info_cache
+            )
+            if table_ref.table_id not in tables:
+                raise NoSuchTableError(table_name)
+            return tables[table_ref.table_id]
+
+        # Share the tables fetched by _get_multi_tables(), so that each
+        # table is fetched once per reflection run with SQLAlchemy 1.4 too.
+        tables = (
+            {}
+            if info_cache is None
+            else info_cache.setdefault(("bigquery_tables", schema), {})
+        )
+        if table_name not in tables:
+            try:
+                tables[table_name] = self._get_cached_table(client, table_ref)
+            except NotFound:
+                tables[table_name] = None
+        if tables[table_name] is None:
             raise NoSuchTableError(table_name)
+        return tables[table_name]
+
+    def _get_cached_table(self, client, table_ref):
+        """Get a table from the metadata cache, or with the client"""
+        table = self.metadata_cache.get(str(table_ref))
+        if table is None:
+            table = client.get_table(table_ref)
+            self.metadata_cache.set(str(table_ref), table)
         return table
 
+    def _invalidate_table_metadata(self, tables):
+        """Remove tables, given as (schema, name)s, from the metadata cache
+
+        Clears the cache if ``tables`` is None.
+        """
+        if tables is None:
+            self.metadata_cache.clear()
+            return
+
+        for schema, table_name in tables:
+            try:
+                table_ref = self._table_reference(schema, table_name, self.project_id)
+            except ValueError:
+                self.metadata_cache.clear()
+                return
+            self.metadata_cache.invalidate(str(table_ref))
+
+    def _invalidate_results(self, tables):
+        """Remove results read from tables, given as (schema, name)s
+
+        Clears the result cache if ``tables`` is None.
+        """
+        self.result_cache.invalidate(self._table_ids(tables))
+
+    def _table_ids(self, tables):
+        # The ids of tables given as (schema, name)s, or None if they
+        # aren't known.
+        if tables is None:
+            return None
+        try:
+            return frozenset(
+                str(self._table_reference(schema, table_name, self.project_id))
+                for schema, table_name in tables
+            )
+        except ValueError:
+            return None
+
     def has_table(self, connection, table_name, schema=None, **kw):
         """Checks whether a table exists in BigQuery.
 
@@ -1315,17 +2500,17 @@ class BigQueryDialect(DefaultDialect):
 
         """
         try:
-            self._get_table(connection, table_name, schema)
+            self._get_table(connection, table_name, schema, kw.get("info_cache"))
             return True
         except NoSuchTableError:
             return False
 
     def get_columns(self, connection, table_name, schema=None, **kw):
-        table = self._get_table(connection, table_name, schema)
+        table = self._get_table(connection, table_name, schema, kw.get("info_cache"))
         return _types.get_columns(table.schema)
 
     def get_table_comment(self, connection, table_name, schema=None, **kw):
-        table = self._get_table(connection, table_name, schema)
+        table = self._get_table(connection, table_name, schema, kw.get("info_cache"))
         return {
             "text": table.description,
         }
@@ -1342,6 +2527,115 @@ class BigQueryDialect(DefaultDialect):
         # BigQuery has no support for indexes.
         return []
 
+    def get_multi_columns(self, connection, schema=None, **kw):
+        tables = self._get_multi_tables(connection, schema, **kw)
+        return (
+            ((schema, table_name), _types.get_columns(table.schema))
+            for table_name, table in tables
+        )
+
+    def get_multi_table_comment(self, connection, schema=None, **kw):
+        tables = self._get_multi_tables(connection, schema, **kw)
+        return (
+            ((schema, table_name), {"text": table.description})
+            for table_name, table in tables
+        )
+
+    def get_multi_foreign_keys(self, connection, schema=None, **kw):
+        # BigQuery has no support for foreign keys.
+        names = self._get_multi_table_names(connection, schema, **kw)
+        return (((schema, table_name), []) for table_name in names)
+
+    def get_multi_pk_constraint(self, connection, schema=None, **kw):
+        # BigQuery has no support for primary keys.
+        names = self._get_multi_table_names(connection, schema, **kw)
+        return (
+            ((schema, table_name), {"constrained_columns": []}) for table_name in names
+        )
+
+    def get_multi_indexes(self, connection, schema=None, **kw):
+        # BigQuery has no support for indexes.
+        names = self._get_multi_table_names(connection, schema, **kw)
+        return (((schema, table_name), []) for table_name in names)
+
+    def _get_multi_table_names(
+        self,
+        connection,
+        schema,
+        filter_names=None,
+        scope=None,
+        kind=None,
+        info_cache=None,
+        **kw,
+    ):
+        """Get the names of the tables to reflect, without fetching them"""
+        scope = ObjectScope.DEFAULT if scope is None else scope
+        kind = ObjectKind.TABLE if kind is None else kind
+
+        if filter_names and scope is ObjectScope.ANY and kind is ObjectKind.ANY:
+            # E.g. Table(..., autoload_with=...); take the names as given.
+            return list(filter_names)
+
+        names = []
+        if ObjectScope.DEFAULT in scope:
+            if ObjectKind.TABLE in kind:
+                names.extend(
+                    self.get_table_names(connection, schema, info_cache=info_cache)
+                )
+            if ObjectKind.VIEW in kind or ObjectKind.MATERIALIZED_VIEW in kind:
+                names.extend(
+                    self.get_view_names(connection, schema, info_cache=info_cache)
+                )
+        if filter_names:
+            filter_names = set(filter_names)
+            names = [name for name in names if name in filter_names]
+        return names
+
+    def _get_multi_tables(self, connection, schema, info_cache=None, **kw):
+        """Get the (name, table) pairs of the tables to reflect
+
+        Tables are fetched concurrently, and each table is fetched at most
+        once per reflection run (per ``info_cache``). Tables that don't
+        exist are skipped.
+        """
+        names = self._get_multi_table_names(
+            connection, schema, info_cache=info_cache, **kw
+        )
+
+        if info_cache is None:
+            info_cache = {}
+        tables = info_cache.setdefault(("bigquery_tables", schema), {})
+        missing = list(dict.fromkeys(name for name in names if name not in tables))
+        if missing:
+            table_refs = [
+                self._table_reference(schema, name, self.project_id) for name in missing
+            ]
+            tables.update(
+                zip(missing, self._fetch_tables(connection, table_refs, info_cache))
+            )
+
+        return [(name, tables[name]) for name in names if tables[name] is not None]
+
+    def _fetch_tables(self, connection, table_refs, info_cache=None):
+        """Fetch tables concurrently, with None for tables that don't exist"""
+        client = _driver_connection(connection.connection)._client
+
+        if self._reflects_information_schema:
+            return [
+                self._information_schema_tables(
+                    client, table_ref.project, table_ref.dataset_id, info_cache
+                ).get(table_ref.table_id)
+                for table_ref in table_refs
+            ]
+
+        def get_table(table_ref):
+            try:
+                return self._get_cached_table(client, table_ref)
+            except NotFound:
+                return None
+
+        return list(self._map_concurrently(get_table, table_refs))
+
     def get_schema_names(self, connection, **kw):
         if isinstance(connection, Engine):
             connection = connection.connect()
@@ -1349,19 +2643,49 @@ class BigQueryDialect(DefaultDialect):
         datasets = connection.connection._client.list_datasets(self.project_id)
         return [d.dataset_id for d in datasets]
 
+    @reflection.cache
     def get_table_names(self, connection, schema=None, **kw):
         if isinstance(connection, Engine):
             connection = connection.connect()
 
         item_types = ["TABLE", "EXTERNAL"]
-        return self._get_table_or_view_names(connection, item_types, schema)
+        return self._get_table_or_view_names(
+            connection, item_types, schema, kw.get("info_cache")
+        )
 
+    @reflection.cache
     def get_view_names(self, connection, schema=None, **kw):
         if isinstance(connection, Engine):
             connection = connection.connect()
 
         item_types = ["VIEW", "MATERIALIZED_VIEW"]
-        return self._get_table_or_view_names(connection, item_types, schema)
+        return self._get_table_or_view_names(
+            connection, item_types, schema, kw.get("info_cache")
+        )
+
+    def iter_table_names(self, connection, schema=None, **kw):
+        """Generate table names, like ``get_table_names()``
+
+        Names are generated as each dataset's tables are listed, rather
+        than after all of them have been.
+        """
+        if isinstance(connection, Engine):
+            connection = connection.connect()
+
+        item_types = ["TABLE", "EXTERNAL"]
+        return self._iter_table_or_view_names(
+            connection, item_types, schema, kw.get("info_cache")
+        )
+
+    def iter_view_names(self, connection, schema=None, **kw):
+        """Generate view names, like ``get_view_names()``"""
+        if isinstance(connection, Engine):
+            connection = connection.connect()
+
+        item_types = ["VIEW", "MATERIALIZED_VIEW"]
+        return self._iter_table_or_view_names(
+            connection, item_types, schema, kw.get("info_cache")
+        )
 
     def do_rollback(self, dbapi_connection):
         # BigQuery has no support for transactions.
@@ -1370,12 +2694,39 @@ class BigQueryDialect(DefaultDialect):
     def get_view_definition(self, connection, view_name, schema=None, **kw):
         if isinstance(connection, Engine):
             connection = connection.connect()
+        if self._reflects_information_schema:
+            view = self._get_table(connection, view_name, schema, kw.get("info_cache"))
+            return view.view_query
+
         client = connection.connection._client
         if self.dataset_id:
             view_name = f"{self.dataset_id}.{view_name}"
         view = client.get_table(view_name)
         return view.view_query
 
+    @property
+    def _reflects_information_schema(self):
+        return self.reflection_source == "information_schema"
+
+    def _information_schema_tables(
+        self, client, project_id, dataset_id, info_cache=None
+    ):
+        """Get a dataset's tables, by name, from its INFORMATION_SCHEMA
+
+        The dataset is queried once per reflection run (per ``info_cache``).
+        """
+        if info_cache is None:
+            info_cache = {}
+        key = ("bigquery_information_schema", project_id, dataset_id)
+        if key not in info_cache:
+            try:
+                info_cache[key] = self.information_schema.tables(
+                    client, project_id, dataset_id
+                )
+            except NotFound:
+                info_cache[key] = {}
+        return info_cache[key]
+
 
 class unnest(sqlalchemy.sql.functions.GenericFunction):
     def __init__(self, *args, **kwargs):
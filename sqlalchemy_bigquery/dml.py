@@ -0,0 +1,204 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""BigQuery-specific DML constructs
+
+``merge()`` builds MERGE statements, which upsert rows with one statement:
+
+.. code-block:: python
+
+    from sqlalchemy_bigquery import merge
+
+    stmt = (
+        merge(table)
+        .using(updates)
+        .on(table.c.id == updates.c.id)
+        .when_matched_then_update({"name": updates.c.name})
+        .when_not_matched_then_insert(
+            {"id": updates.c.id, "name": updates.c.name}
+        )
+    )
+"""
+
+import sqlalchemy
+from sqlalchemy.sql import coercions, roles, selectable
+from sqlalchemy.sql.base import Executable, Generative
+from sqlalchemy.sql.elements import BindParameter, ClauseElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from . import _struct
+
+
+def merge(table):
+    """Build a MERGE statement for a target table
+
+    Give the rows to merge with ``using()`` and the condition that matches
+    them to rows of the table with ``on()``, then what to do with matched
+    and unmatched rows, with the ``when_...`` methods, in the order
+    they're to be tried.
+    """
+    return Merge(table)
+
+
+def unnest(parameter, name):
+    """Get the rows of an ``ARRAY<STRUCT<...>>`` parameter, with UNNEST
+
+    The rows have a column for each of the STRUCT's fields.
+    """
+    struct = parameter.type.item_type
+    return sqlalchemy.func.unnest(parameter).table_valued(
+        *(
+            sqlalchemy.column(field_name, field_type)
+            for field_name, field_type in struct._STRUCT_fields
+        ),
+        name=name,
+    )
+
+
+class Merge(Executable, ClauseElement, Generative):
+    """A MERGE statement. See ``merge()``"""
+
+    __visit_name__ = "merge"
+
+    _traverse_internals = [
+        ("table", InternalTraversal.dp_clauseelement),
+        ("source", InternalTraversal.dp_clauseelement),
+        ("condition", InternalTraversal.dp_clauseelement),
+        ("whens", InternalTraversal.dp_clauseelement_tuple),
+    ]
+
+    def __init__(self, table):
+        self.table = table
+        self.source = None
+        self.condition = None
+        self.whens = ()
+
+    def using(self, source, name="source"):
+        """Merge rows from a table, a subquery or an array parameter
+
+        A SELECT is used as a subquery. A ``bindparam()`` of type
+        ``ARRAY(STRUCT(...))`` is unnested into rows named ``name``, with
+        a column for each of the STRUCT's fields. The rows are available,
+        e.g. for ``on()``, as the statement's ``source``.
+        """
+        if isinstance(source, BindParameter):
+            if not (
+                isinstance(source.type, sqlalchemy.ARRAY)
+                and isinstance(source.type.item_type, _struct.STRUCT)
+            ):
+                raise TypeError(
+                    f"MERGE parameter sources must have an ARRAY(STRUCT(...)) type,"
+                    f" not {source.type!r}"
+                )
+            source = unnest(source, name)
+        elif isinstance(source, selectable.Select):
+            source = source.subquery(name)
+        elif not isinstance(source, roles.FromClauseRole):
+            raise TypeError(
+                f"MERGE sources must be tables, subqueries or parameters,"
+                f" not {source!r}"
+            )
+        merge = self._generate()
+        merge.source = source
+        return merge
+
+    def on(self, condition):
+        """Match source rows to target rows"""
+        merge = self._generate()
+        merge.condition = coercions.expect(roles.OnClauseRole, condition)
+        return merge
+
+    def when_matched_then_update(self, set_, where=None):
+        """Update target rows matched by source rows
+
+        ``set_`` is a dictionary of new values, e.g. source columns, by
+        target column or column name.
+        """
+        return self.__when("MATCHED", "UPDATE", where, self.__values(set_))
+
+    def when_matched_then_delete(self, where=None):
+        """Delete target rows matched by source rows"""
+        return self.__when("MATCHED", "DELETE", where)
+
+    def when_not_matched_then_insert(self, values=None, where=None):
+        """Insert source rows that match no target rows
+
+        ``values`` is a dictionary of values, by target column or column
+        name. If it's omitted, each source row is inserted as is (with
+        ``INSERT ROW``), so it must have the target table's columns.
+        """
+        values = None if values is None else self.__values(values)
+        return self.__when("NOT MATCHED", "INSERT", where, values)
+
+    def when_not_matched_by_source_then_update(self, set_, where=None):
+        """Update target rows that no source rows match"""
+        return self.__when(
+            "NOT MATCHED BY SOURCE", "UPDATE", where, self.__values(set_)
+        )
+
+    def when_not_matched_by_source_then_delete(self, where=None):
+        """Delete target rows that no source rows match"""
+        return self.__when("NOT MATCHED BY SOURCE", "DELETE", where)
+
+    def __when(self, match, action, where, values=None):
+        # Not with SQLAlchemy's @_generative, whose methods return None in
+        # 1.4 and self in 2.0.
+        merge = self._generate()
+        merge.whens += (MergeWhen(match, action, where, values),)
+        return merge
+
+    def __values(self, values):
+        columns = self.table.c
+        result = []
+        for key, value in values.items():
+            column = columns[key] if isinstance(key, str) else key
+            if not isinstance(value, ClauseElement):
+                value = sqlalchemy.bindparam(
+                    column.key, value, type_=column.type, unique=True
+                )
+            result.append((column, value))
+        return result
+
+
+class MergeWhen(ClauseElement):
+    """A ``WHEN ... THEN ...`` clause of a MERGE statement"""
+
+    __visit_name__ = "merge_when"
+
+    _traverse_internals = [
+        ("match", InternalTraversal.dp_string),
+        ("action", InternalTraversal.dp_string),
+        ("condition", InternalTraversal.dp_clauseelement),
+        ("columns", InternalTraversal.dp_clauseelement_tuple),
+        ("values", InternalTraversal.dp_clauseelement_tuple),
+    ]
+
+    def __init__(self, match, action, condition=None, values=None):
+        self.match = match
+        self.action = action
+        self.condition = (
+            None
+            if condition is None
+            else coercions.expect(roles.WhereHavingRole, condition)
+        )
+        if values is None:
+            self.columns = self.values = None
+        else:
+            self.columns = tuple(column for column, _ in values)
+            self.values = tuple(value for _, value in values)
@@ -0,0 +1,64 @@
+# Copyright (c) 2017 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Events of the BigQuery dialect
+
+Listen for them on an engine, a connection or a dialect, e.g. to record
+the cost of every query job:
+
+.. code-block:: python
+
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "after_bigquery_job")
+    def record_job(conn, context, job_stats):
+        metrics.record(job_stats.job_id, job_stats.total_bytes_processed)
+"""
+
+from sqlalchemy import event
+
+
+class JobEventTarget:
+    """What a dialect's BigQuery events are dispatched by"""
+
+
+class BigQueryEvents(event.Events):
+    """Events of the query jobs the BigQuery dialect runs statements with
+
+    Listeners are added to the dialect of the engine or connection
+    they're given, so they apply to all of the engine's connections.
+    """
+
+    _dispatch_target = JobEventTarget
+
+    @classmethod
+    def _accept_with(cls, target, identifier=None):
+        # Engines and connections have their dialect's events.
+        dialect = getattr(target, "dialect", target)
+        return getattr(dialect, "bigquery_job_events", None)
+
+    def after_bigquery_job(self, conn, context, job_stats):
+        """Called after a statement's query job has finished
+
+        ``job_stats`` is its ``JobStats``: its job id, bytes processed,
+        slot milliseconds, whether the results were cached, etc., which
+        is also available as ``context.bigquery_job_stats``. This is
+        called for each batch of statements run in batches, e.g. inserts
+        of many rows.
+        """
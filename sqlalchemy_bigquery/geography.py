@@ -22,7 +22,8 @@ from geoalchemy2.shape import to_shape
 import geoalchemy2.functions
 from shapely import wkb, wkt
 import sqlalchemy.ext.compiler
-from sqlalchemy.sql.elements import BindParameter
+from sqlalchemy.sql.elements import BindParameter, ClauseList, Grouping
+from sqlalchemy.sql.operators import comma_op
 
 SRID = 4326  # WGS84, https://spatialreference.org/ref/epsg/wgs-84/
 
@@ -98,6 +99,9 @@ class GEOGRAPHY(geoalchemy2.Geography):
     See https://googleapis.dev/python/sqlalchemy-bigquery/latest/geography.html
     """
 
+    # Our state is fixed by the constructor, so it's safe to cache.
+    cache_ok = True
+
     def __init__(self):
         super().__init__(
             geometry_type=None,
@@ -182,12 +186,23 @@ def _fixup_st_arguments(element, compiler, **kw):
     """
     argument_types = _argument_types.get(element.name.lower())
     if argument_types:
-        for argument_type, argument in zip(argument_types, element.clauses.clauses):
-            if isinstance(argument, BindParameter) and (
-                argument.type is not argument_type
-                or not isinstance(argument.type, argument_type)
+        # Don't modify the arguments in place. The element may be part
+        # of a statement that's compiled more than once, or whose
+        # compiled form is cached, so we compile a copy instead.
+        arguments = list(element.clauses.clauses)
+        retyped = False
+        for i, (argument_type, argument) in enumerate(zip(argument_types, arguments)):
+            if isinstance(argument, BindParameter) and not isinstance(
+                argument.type, argument_type
             ):
-                argument.type = argument_type()
+                arguments[i] = argument._with_binary_element_type(argument_type())
+                retyped = True
+
+        if retyped:
+            element = element._clone()
+            element.clause_expr = Grouping(
+                ClauseList(*arguments, operator=comma_op, group_contents=True)
+            )
 
     return compiler.visit_function(element, **kw)
 
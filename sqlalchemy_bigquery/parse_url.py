@@ -70,6 +70,10 @@ def parse_url(url):  # noqa: C901
     credentials_path = None
     credentials_base64 = None
     list_tables_page_size = None
+    reflection_source = None
+    job_creation_mode = None
+    http_pool_connections = None
+    http_pool_maxsize = None
     user_supplied_client = False
 
     # location
@@ -102,6 +106,49 @@ def parse_url(url):  # noqa: C901
                 + str_list_tables_page_size
             )
 
+    if "reflection_source" in query:
+        reflection_source = query.pop("reflection_source")
+        if reflection_source not in ("api", "information_schema"):
+            raise ValueError(
+                "invalid reflection_source in url query: " + reflection_source
+            )
+
+    if "job_creation_mode" in query:
+        job_creation_mode = query.pop("job_creation_mode")
+        if job_creation_mode not in ("required", "optional"):
+            raise ValueError(
+                "invalid job_creation_mode in url query: " + job_creation_mode
+            )
+
+    if "http_pool_connections" in query:
+        str_http_pool_connections = query.pop("http_pool_connections")
+        try:
+            http_pool_connections = int(str_http_pool_connections)
+        except ValueError:
+            raise ValueError(
+                "invalid int in url query http_pool_connections: "
+                + str_http_pool_connections
+            )
+        if http_pool_connections < 1:
+            raise ValueError(
+                "http_pool_connections in url query must be positive: "
+                + str_http_pool_connections
+            )
+
+    if "http_pool_maxsize" in query:
+        str_http_pool_maxsize = query.pop("http_pool_maxsize")
+        try:
+            http_pool_maxsize = int(str_http_pool_maxsize)
+        except ValueError:
+            raise ValueError(
+                "invalid int in url query http_pool_maxsize: " + str_http_pool_maxsize
+            )
+        if http_pool_maxsize < 1:
+            raise ValueError(
+                "http_pool_maxsize in url query must be positive: "
+                + str_http_pool_maxsize
+            )
+
     # user_supplied_client
     if "user_supplied_client" in query:
         user_supplied_client = query.pop("user_supplied_client").lower() == "true"
@@ -120,6 +167,10 @@ def parse_url(url):  # noqa: C901
                 credentials_base64,
                 QueryJobConfig(),
                 list_tables_page_size,
+                reflection_source,
+                job_creation_mode,
+                http_pool_connections,
+                http_pool_maxsize,
                 user_supplied_client,
             )
         else:
@@ -132,6 +183,10 @@ def parse_url(url):  # noqa: C901
                 credentials_base64,
                 None,
                 list_tables_page_size,
+                reflection_source,
+                job_creation_mode,
+                http_pool_connections,
+                http_pool_maxsize,
                 user_supplied_client,
             )
 
@@ -282,5 +337,9 @@ def parse_url(url):  # noqa: C901
         credentials_base64,
         job_config,
         list_tables_page_size,
+        reflection_source,
+        job_creation_mode,
+        http_pool_connections,
+        http_pool_maxsize,
         user_supplied_client,
     )
@@ -0,0 +1,162 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Benchmark requests made by many threads with HTTP pools of different sizes
+
+Runs a local server that stands in for the BigQuery API, answering
+``datasets.get`` requests after a delay. New connections are delayed too,
+standing in for TCP and TLS handshakes. Threads share a client, as an
+engine's connections do, and get a dataset in bursts, all of them at once,
+as when a burst of statements is executed::
+
+    python tests/benchmark/http_pool.py --threads 64 --pool-sizes 10,32,64
+
+With a pool smaller than the number of threads, connections beyond the
+pool's size are discarded at the end of each burst, with "Connection pool
+is full" warnings, and opened again, with a handshake, in the next.
+"""
+
+import argparse
+import concurrent.futures
+import http.server
+import json
+import logging
+import threading
+import time
+
+import google.auth.credentials
+from google.cloud import bigquery
+
+from sqlalchemy_bigquery import _helpers
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+        time.sleep(self.server.connect_latency)
+
+    def do_GET(self):
+        time.sleep(self.server.request_latency)
+        project, dataset = self.path.split("?")[0].split("/")[-3::2]
+        body = json.dumps(
+            {"datasetReference": {"projectId": project, "datasetId": dataset}}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, connect_latency, request_latency):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.connect_latency = connect_latency
+        self.request_latency = request_latency
+        self.connections = 0
+        self.lock = threading.Lock()
+
+
+class CountWarnings(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+def run(server, threads, bursts, pool_maxsize):
+    session = _helpers.create_http_session(
+        google.auth.credentials.AnonymousCredentials(), pool_maxsize=pool_maxsize
+    )
+    client = bigquery.Client(
+        project="myproject",
+        credentials=google.auth.credentials.AnonymousCredentials(),
+        client_options={"api_endpoint": f"http://127.0.0.1:{server.server_port}"},
+        _http=session,
+    )
+
+    burst = threading.Barrier(threads)
+
+    def get_datasets():
+        for _ in range(bursts):
+            burst.wait()
+            client.get_dataset("myproject.mydataset")
+
+    warnings = CountWarnings()
+    logger = logging.getLogger("urllib3.connectionpool")
+    logger.addHandler(warnings)
+    connections = server.connections
+    start = time.perf_counter()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+            for future in [executor.submit(get_datasets) for _ in range(threads)]:
+                future.result()
+    finally:
+        elapsed = time.perf_counter() - start
+        logger.removeHandler(warnings)
+        client.close()
+
+    return (
+        threads * bursts / elapsed,
+        server.connections - connections,
+        warnings.count,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--bursts", type=int, default=10)
+    parser.add_argument("--pool-sizes", default="10,32,64")
+    parser.add_argument("--connect-latency", type=float, default=0.2, help="seconds")
+    parser.add_argument("--request-latency", type=float, default=0.2, help="seconds")
+    args = parser.parse_args()
+
+    server = Server(args.connect_latency, args.request_latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        print(
+            f"{'pool size':>9} {'requests/s':>10} {'connections':>11} {'warnings':>8}"
+        )
+        for pool_maxsize in map(int, args.pool_sizes.split(",")):
+            throughput, connections, warnings = run(
+                server, args.threads, args.bursts, pool_maxsize
+            )
+            print(
+                f"{pool_maxsize:>9} {throughput:>10.0f}"
+                f" {connections:>11} {warnings:>8}"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
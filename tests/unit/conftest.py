@@ -20,6 +20,7 @@
 import contextlib
 import mock
 import sqlite3
+import time
 
 import packaging.version
 import pytest
@@ -40,10 +41,14 @@ sqlalchemy_2_0_or_higher = pytest.mark.skipif(
 )
 
 
-@pytest.fixture()
-def faux_conn():
-    test_data = dict(execute=[])
-    connection = sqlite3.connect(":memory:")
+@contextlib.contextmanager
+def faux_dbapi(test_data):
+    """Patch the DB-API to run statements with sqlite
+
+    Yields the sqlite connection.
+    """
+    # Results may be fetched on other threads, e.g. with the asyncio dialect.
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
 
     def factory(*args, **kw):
         conn = fauxdbi.Connection(connection, test_data, *args, **kw)
@@ -55,28 +60,46 @@ def faux_conn():
             "sqlalchemy_bigquery._helpers.create_bigquery_client", fauxdbi.FauxClient
         ):
             with mock.patch("google.auth.default", return_value=("authdb", "authproj")):
-                engine = sqlalchemy.create_engine("bigquery://myproject/mydataset")
-                conn = engine.connect()
-                conn.test_data = test_data
+                yield connection
+
 
-                def ex(sql, *args, **kw):
-                    with contextlib.closing(
-                        conn.connection.connection.connection.cursor()
-                    ) as cursor:
-                        cursor.execute(sql, *args, **kw)
+@contextlib.contextmanager
+def _faux_conn(url="bigquery://myproject/mydataset", **engine_kwargs):
+    test_data = dict(execute=[])
+    with faux_dbapi(test_data):
+        engine = sqlalchemy.create_engine(url, **engine_kwargs)
+        conn = engine.connect()
+        conn.test_data = test_data
 
-                conn.ex = ex
+        def ex(sql, *args, **kw):
+            with contextlib.closing(
+                conn.connection.connection.connection.cursor()
+            ) as cursor:
+                cursor.execute(sql, *args, **kw)
 
-                ex("create table comments" " (key string primary key, comment string)")
+        conn.ex = ex
 
-                yield conn
-                conn.close()
+        ex("create table comments" " (key string primary key, comment string)")
+
+        yield conn
+        conn.close()
 
 
 @pytest.fixture()
-def last_query(faux_conn):
+def faux_conn():
+    with _faux_conn() as conn:
+        yield conn
+
+
+@pytest.fixture()
+def native_faux_conn():
+    with _faux_conn(native_query_parameters=True) as conn:
+        yield conn
+
+
+def _last_query(conn):
     def last_query(sql, params=None, offset=1):
-        actual_sql, actual_params = faux_conn.test_data["execute"][-offset]
+        actual_sql, actual_params = conn.test_data["execute"][-offset]
         assert actual_sql == sql
         if params is not None:
             assert actual_params == params
@@ -84,6 +107,16 @@ def last_query(faux_conn):
     return last_query
 
 
+@pytest.fixture()
+def last_query(faux_conn):
+    return _last_query(faux_conn)
+
+
+@pytest.fixture()
+def native_last_query(native_faux_conn):
+    return _last_query(native_faux_conn)
+
+
 @pytest.fixture()
 def metadata():
     return sqlalchemy.MetaData()
@@ -101,3 +134,71 @@ def setup_table(connection, name, *columns, initial_data=(), **kw):
     if initial_data:
         connection.execute(table.insert(), initial_data)
     return table
+
+
+def setup_some_table(connection, *columns, name="some_table", **kw):
+    """Create a table with id and name columns, and any columns given"""
+    return setup_table(
+        connection,
+        name,
+        sqlalchemy.Column("id", sqlalchemy.Integer),
+        sqlalchemy.Column("name", sqlalchemy.String),
+        *columns,
+        **kw,
+    )
+
+
+def executed_statements(conn, prefix):
+    """The (sql, parameters) run, for statements starting with a prefix"""
+    return [
+        (sql, parameters)
+        for sql, parameters in conn.test_data["execute"]
+        if sql.startswith(prefix)
+    ]
+
+
+def executed_selects(conn):
+    """The SQL of the SELECT statements run"""
+    return [sql for sql, _ in executed_statements(conn, "SELECT")]
+
+
+@contextlib.contextmanager
+def _some_table_conn(**engine_kwargs):
+    with _faux_conn(**engine_kwargs) as conn:
+        setup_table(
+            conn,
+            "some_table",
+            sqlalchemy.Column("id", sqlalchemy.Integer),
+            sqlalchemy.Column("tags", sqlalchemy.ARRAY(sqlalchemy.String)),
+            initial_data=[dict(id=1, tags=["a"]), dict(id=2, tags=["b"])],
+        )
+        yield conn
+
+
+@pytest.fixture()
+def some_table_conn():
+    """A connection with some_table, which has two rows, to query"""
+    with _some_table_conn() as conn:
+        yield conn
+
+
+class Timer:
+    """A clock that only moves when it's told to"""
+
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def timer():
+    return Timer()
+
+
+def wait_until(condition, timeout=10):
+    """Wait for another thread to make a condition true"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
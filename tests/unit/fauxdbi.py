@@ -21,11 +21,15 @@ import base64
 import contextlib
 import datetime
 import decimal
+import io
+import json
 import pickle
 import re
 import sqlite3
 
 import google.api_core.exceptions
+import google.cloud.bigquery
+import google.cloud.bigquery.query
 import google.cloud.bigquery.schema
 import google.cloud.bigquery.table
 import google.cloud.bigquery.dbapi.cursor
@@ -49,11 +53,19 @@ class Connection:
     def commit(self):
         pass
 
+    def close(self):
+        pass
+
 
 class Cursor:
     def __init__(self, connection):
         self.connection = connection
         self.cursor = connection.connection.cursor()
+        self.description = None
+        self.rowcount = -1
+        # Like the DB-API's, queries are run with the client's default job
+        # creation mode.
+        self.job_creation_mode = connection._client.default_job_creation_mode
         assert self.arraysize == 1
 
     __arraysize = 1
@@ -278,6 +290,20 @@ class Cursor:
     def __handle_unnest(self, m):
         return "(" + (m.group("exp") or "?") + ")"
 
+    @substitute_re_method(r"unnest\(%\((\w+)\)s\)", flags=re.IGNORECASE)
+    def __handle_unnest_structs(self, m, parameters):
+        # Arrays of STRUCTs are read from JSON, with json_each.
+        name = m.group(1)
+        value = parameters[name]
+        if not (value and isinstance(value, list) and isinstance(value[0], dict)):
+            return m.group(0)
+
+        parameters[name] = json.dumps(value, default=str)
+        fields = ", ".join(
+            f"json_extract(value, '$.{field}') AS `{field}`" for field in value[0]
+        )
+        return f"(SELECT {fields} FROM json_each(%({name})s))"
+
     def __handle_true_false(self, operation):
         # Older sqlite versions, like those used on the CI servers
         # don't support true and false (as aliases for 1 and 0).
@@ -287,6 +313,8 @@ class Cursor:
         self.connection.test_data["execute"].append((operation, parameters))
         operation, types_ = google.cloud.bigquery.dbapi.cursor._extract_types(operation)
         if parameters:
+            parameters = dict(parameters)
+            operation = self.__handle_unnest_structs(operation, parameters)
             operation, parameters = self.__convert_params(operation, parameters)
         else:
             operation = operation.replace("%%", "%")
@@ -310,6 +338,9 @@ class Cursor:
 
         self.description = self.cursor.description
         self.rowcount = self.cursor.rowcount
+        self._query_rows = QueryStatistics(
+            self.connection.test_data, self.job_creation_mode
+        )
 
     def executemany(self, operation, parameters_list):
         for parameters in parameters_list:
@@ -344,6 +375,128 @@ class Cursor:
         return list(map(self._fix_pickled, self.cursor))
 
 
+class LoadJob:
+    def __init__(self, output_rows):
+        self.output_rows = output_rows
+
+    def result(self):
+        return self
+
+
+class DryRunJob:
+    def __init__(self, total_bytes_processed, referenced_tables):
+        self.dry_run = True
+        self.total_bytes_processed = total_bytes_processed
+        self.referenced_tables = referenced_tables
+
+
+class QueryJob:
+    """A query job, for queries run with FauxClient.query
+
+    The query is run when its results are waited for.
+    """
+
+    def __init__(self, client, query, job_config):
+        test_data = client.connection.test_data
+        test_data["query_jobs"] = test_data.get("query_jobs", 0) + 1
+        self.job_id = f"query_job{test_data['query_jobs']}"
+        self.location = "US"
+        self.state = "RUNNING"
+        self.dry_run = False
+        self._client = client
+        self._query = query
+        self._job_config = job_config
+
+    def result(self, page_size=None, timeout=None):
+        test_data = self._client.connection.test_data
+        test_data.setdefault("job_timeouts", []).append(timeout)
+        rows = self._client.query_and_wait(
+            self._query, job_config=self._job_config, page_size=page_size
+        )
+        rows.job_id = self.job_id
+        self.state = "DONE"
+        return rows
+
+    def done(self, reload=True):
+        return self.state == "DONE"
+
+    def cancel(self):
+        test_data = self._client.connection.test_data
+        test_data.setdefault("cancelled_jobs", []).append(self.job_id)
+        self.state = "DONE"
+        return True
+
+
+class QueryStatistics:
+    """Statistics of a query job, as RowIterators have them"""
+
+    def __init__(self, test_data, job_creation_mode=None):
+        test_data["jobs"] = test_data.get("jobs", 0) + 1
+        if job_creation_mode == "JOB_CREATION_OPTIONAL":
+            # Short queries are run without jobs.
+            self.job_id = None
+            self.query_id = f"query{test_data['jobs']}"
+        else:
+            self.job_id = f"job{test_data['jobs']}"
+            self.query_id = None
+        self.project = "myproject"
+        self.location = "US"
+        self.total_bytes_processed = test_data.get("total_bytes_processed", 0)
+        self.slot_millis = test_data.get("slot_millis", 0)
+        self.created = self.started = self.ended = None
+        self._first_page_response = {"cacheHit": test_data.get("cache_hit", False)}
+
+
+class RowIterator(QueryStatistics):
+    """Query results, for queries run with FauxClient.query_and_wait"""
+
+    def __init__(self, cursor, page_size=None):
+        # The job is the one the cursor ran the query with.
+        vars(self).update(vars(cursor._query_rows))
+        self.page_size = page_size
+        if cursor.description:
+            self.schema = [
+                google.cloud.bigquery.schema.SchemaField(d[0], "STRING")
+                for d in cursor.description
+            ]
+            self._rows = cursor.fetchall()
+            self.total_rows = len(self._rows)
+            self.num_dml_affected_rows = None
+        else:
+            self.schema = []
+            self._rows = []
+            self.total_rows = 0
+            self.num_dml_affected_rows = cursor.rowcount
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    @property
+    def pages(self):
+        rows = self._rows
+        page_size = self.page_size or len(rows) or 1
+        return (rows[i : i + page_size] for i in range(0, len(rows), page_size))
+
+    def to_arrow_iterable(self, bqstorage_client=None):
+        import pyarrow
+
+        names = [field.name for field in self.schema]
+        for page in self.pages:
+            yield pyarrow.RecordBatch.from_pylist(
+                [dict(zip(names, row)) for row in page]
+            )
+
+
+def _query_parameter_value(parameter):
+    if isinstance(parameter, google.cloud.bigquery.query.ArrayQueryParameter):
+        return [_query_parameter_value(v) for v in parameter.values]
+    if isinstance(parameter, google.cloud.bigquery.query.StructQueryParameter):
+        return dict(parameter.struct_values)
+    if isinstance(parameter, google.cloud.bigquery.query.ScalarQueryParameter):
+        return parameter.value
+    return parameter
+
+
 class attrdict(dict):
     def __setattr__(self, name, val):
         self[name] = val
@@ -355,7 +508,16 @@ class attrdict(dict):
 
 
 class FauxClient:
-    def __init__(self, project_id=None, default_query_job_config=None, *args, **kw):
+    def __init__(
+        self,
+        project_id=None,
+        default_query_job_config=None,
+        *args,
+        default_job_creation_mode=None,
+        http_pool_connections=None,
+        http_pool_maxsize=None,
+        **kw,
+    ):
         if project_id is None:
             if (
                 default_query_job_config is not None
@@ -366,7 +528,14 @@ class FauxClient:
                 project_id = "authproj"  # we would still have gotten it from auth.
 
         self.project = project_id
+        self.default_job_creation_mode = default_job_creation_mode
+        self.http_pool_connections = http_pool_connections
+        self.http_pool_maxsize = http_pool_maxsize
         self.tables = attrdict()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
 
     @staticmethod
     def _row_dict(row, cursor):
@@ -474,12 +643,86 @@ class FauxClient:
             else:
                 raise google.api_core.exceptions.NotFound(table_ref)
 
+    # Convert '@name' (or '@`name`') parameters to '%(name)s'.
+    __named_to_pyformat = substitute_string_re_method(r"@`?(\w+)`?", repl=r"%(\1)s")
+
+    def query_and_wait(self, query, job_config=None, page_size=None):
+        query_parameters = list(job_config.query_parameters) if job_config else []
+        parameters = {p.name: _query_parameter_value(p) for p in query_parameters}
+
+        cursor = self.connection.cursor()
+        cursor.job_creation_mode = self.default_job_creation_mode
+        cursor.execute(self.__named_to_pyformat(query), parameters)
+        # Record what we were actually asked to run.
+        self.connection.test_data["execute"][-1] = (query, query_parameters)
+        self.connection.test_data["page_size"] = page_size
+        self.connection.test_data.setdefault("job_creation_modes", []).append(
+            self.default_job_creation_mode
+        )
+        with contextlib.closing(cursor):
+            return RowIterator(cursor, page_size)
+
+    def query(self, query, job_config=None):
+        if not job_config.dry_run:
+            return QueryJob(self, query, job_config)
+
+        # Dry runs report the tables named in the query, and the test's
+        # total_bytes_processed.
+        test_data = self.connection.test_data
+        test_data.setdefault("dry_runs", []).append(
+            (query, list(job_config.query_parameters))
+        )
+        with contextlib.closing(self.connection.connection.cursor()) as cursor:
+            cursor.execute("select name from sqlite_master where type = 'table'")
+            table_names = [row[0] for row in cursor]
+        return DryRunJob(
+            test_data.get("total_bytes_processed", 0),
+            [
+                google.cloud.bigquery.TableReference.from_string(
+                    f"{self.project}.mydataset.{name}"
+                )
+                for name in table_names
+                if f"`{name}`" in query
+            ],
+        )
+
+    def load_table_from_file(self, file_obj, destination, job_config=None):
+        data = file_obj.read()
+        self.connection.test_data.setdefault("load_jobs", []).append(
+            (destination, job_config, data)
+        )
+        if job_config.source_format == google.cloud.bigquery.SourceFormat.PARQUET:
+            import pyarrow.parquet
+
+            rows = pyarrow.parquet.read_table(io.BytesIO(data)).to_pylist()
+        else:
+            rows = [json.loads(line) for line in data.splitlines()]
+
+        with contextlib.closing(self.connection.cursor()) as cursor:
+            for row in rows:
+                cursor.execute(
+                    f"insert into `{destination.table_id}` ({', '.join(row)})"
+                    f" values ({', '.join(f'%({name})s' for name in row)})",
+                    row,
+                )
+
+        return LoadJob(len(rows))
+
     def list_datasets(self, project="myproject"):
         return [
             google.cloud.bigquery.Dataset(f"{project}.mydataset"),
             google.cloud.bigquery.Dataset(f"{project}.yourdataset"),
         ]
 
+    def get_dataset(self, dataset_ref, retry=None, timeout=None):
+        test_data = self.connection.test_data
+        test_data.setdefault("get_dataset", []).append(
+            (str(dataset_ref), retry, timeout)
+        )
+        if test_data.get("ping_error") is not None:
+            raise test_data["ping_error"]
+        return google.cloud.bigquery.Dataset(dataset_ref)
+
     def list_tables(self, dataset, page_size):
         with contextlib.closing(self.connection.connection.cursor()) as cursor:
             cursor.execute("select * from sqlite_master")
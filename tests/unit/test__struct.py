@@ -46,6 +46,32 @@ def test_struct_repr():
     )
 
 
+def test_struct_cache_key():
+    from sqlalchemy_bigquery import STRUCT
+
+    assert _test_struct()._static_cache_key == _test_struct()._static_cache_key
+    assert (
+        STRUCT(name=sqlalchemy.String)._static_cache_key
+        != STRUCT(name=sqlalchemy.Integer)._static_cache_key
+    )
+    assert (
+        STRUCT(name=sqlalchemy.String)._static_cache_key
+        != STRUCT(title=sqlalchemy.String)._static_cache_key
+    )
+
+
+def test_struct_cache_key_with_uncacheable_field():
+    from sqlalchemy_bigquery import STRUCT
+
+    class Uncacheable(sqlalchemy.types.TypeDecorator):
+        impl = sqlalchemy.String
+        cache_ok = False
+
+    no_cache = sqlalchemy.sql.type_api.NO_CACHE
+    assert STRUCT(name=Uncacheable())._static_cache_key is no_cache
+    assert STRUCT(child=STRUCT(name=Uncacheable()))._static_cache_key is no_cache
+
+
 def test_bind_processor():
     assert _test_struct().bind_processor(None) is dict
 
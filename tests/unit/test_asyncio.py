@@ -0,0 +1,355 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import asyncio
+import threading
+import time
+from unittest import mock
+
+import google.api_core.exceptions
+import pytest
+import sqlalchemy
+
+from . import fauxdbi
+from .conftest import faux_dbapi, wait_until
+
+pytest.importorskip("greenlet")
+# The asyncio dialect, and the ORM declarations below, need SQLAlchemy 2.0.
+pytest.importorskip("sqlalchemy", minversion="2.0")
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column  # noqa: E402
+
+from sqlalchemy_bigquery.asyncio import BigQueryAsyncDialect  # noqa: E402
+
+sqlalchemy.dialects.registry.register(
+    "bigquery.asyncio", "sqlalchemy_bigquery.asyncio", "BigQueryAsyncDialect"
+)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Thing(Base):
+    __tablename__ = "some_table"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str]
+
+
+@pytest.fixture()
+def test_data():
+    test_data = dict(execute=[])
+    with faux_dbapi(test_data) as connection:
+        connection.execute(
+            "create table comments (key string primary key, comment string)"
+        )
+        yield test_data
+
+
+def _run(test, **engine_kwargs):
+    async def main():
+        engine = create_async_engine(
+            "bigquery+asyncio://myproject/mydataset", **engine_kwargs
+        )
+        try:
+            async with engine.connect() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                await conn.execute(
+                    Thing.__table__.insert(),
+                    [dict(id=i, name=f"name{i}") for i in range(5)],
+                )
+            return await test(engine)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_dialect(test_data):
+    async def test(engine):
+        assert isinstance(engine.dialect, BigQueryAsyncDialect)
+        assert engine.dialect.is_async
+
+    _run(test)
+
+
+def test_execute(test_data):
+    async def test(engine):
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                sqlalchemy.select(Thing.name).where(Thing.id == 2)
+            )
+            return result.all()
+
+    assert [tuple(row) for row in _run(test)] == [("name2",)]
+
+
+def test_session(test_data):
+    async def test(engine):
+        async with AsyncSession(engine) as session:
+            things = await session.scalars(
+                sqlalchemy.select(Thing).where(Thing.id > 2).order_by(Thing.id)
+            )
+            return [(thing.id, thing.name) for thing in things]
+
+    assert _run(test) == [(3, "name3"), (4, "name4")]
+
+
+def test_stream(test_data):
+    async def test(engine):
+        async with engine.connect() as conn:
+            result = await conn.stream(sqlalchemy.select(Thing.id).order_by(Thing.id))
+            return [row.id async for row in result]
+
+    assert _run(test) == list(range(5))
+
+
+def test_stream_partitions(test_data):
+    async def test(engine):
+        async with engine.connect() as conn:
+            result = await conn.stream(
+                sqlalchemy.select(Thing.id).order_by(Thing.id),
+                execution_options=dict(yield_per=2),
+            )
+            return [[row.id for row in p] async for p in result.partitions()]
+
+    assert _run(test) == [[0, 1], [2, 3], [4]]
+    assert test_data["page_size"] == 2
+
+
+def test_native_query_parameters(test_data):
+    async def test(engine):
+        async with engine.connect() as conn:
+            await conn.execute(
+                Thing.__table__.insert(), [dict(id=5, name="a"), dict(id=6, name="b")]
+            )
+            result = await conn.execute(
+                sqlalchemy.select(Thing.name).where(Thing.id > 4).order_by(Thing.id)
+            )
+            return result.scalars().all()
+
+    assert _run(test, native_query_parameters=True) == ["a", "b"]
+
+
+def test_reflection(test_data):
+    async def test(engine):
+        async with engine.connect() as conn:
+            return await conn.run_sync(
+                lambda conn: sqlalchemy.inspect(conn).get_columns("some_table")
+            )
+
+    assert [column["name"] for column in _run(test)] == ["id", "name"]
+
+
+def test_client_calls_run_in_thread_pool(test_data):
+    threads = set()
+
+    async def test(engine):
+        loop_thread = threading.current_thread()
+        async with engine.connect() as conn:
+            client = (await conn.get_raw_connection()).driver_connection._client
+            query_and_wait = client.query_and_wait
+
+            def record_thread(*args, **kwargs):
+                threads.add(threading.current_thread())
+                return query_and_wait(*args, **kwargs)
+
+            client.query_and_wait = record_thread
+            await conn.execute(sqlalchemy.select(Thing.id).where(Thing.id == 1))
+            result = await conn.stream(sqlalchemy.select(Thing.id))
+            await result.all()
+        return loop_thread
+
+    loop_thread = _run(test, native_query_parameters=True, max_workers=2)
+    assert threads
+    assert loop_thread not in threads
+    assert all(thread.name.startswith("sqlalchemy-bigquery") for thread in threads)
+
+
+def test_dispose_stops_thread_pool(test_data):
+    async def test(engine):
+        async with engine.connect() as conn:
+            await conn.execute(sqlalchemy.select(Thing.id))
+        threads = [
+            thread
+            for thread in threading.enumerate()
+            if thread.name.startswith("sqlalchemy-bigquery")
+        ]
+        return engine, threads
+
+    engine, threads = _run(test)
+    assert threads
+    wait_until(lambda: not any(thread.is_alive() for thread in threads))
+    assert engine.dialect._executor is None
+
+
+def test_concurrent_connections(test_data):
+    async def test(engine):
+        async def count():
+            async with engine.connect() as conn:
+                result = await conn.execute(
+                    sqlalchemy.select(sqlalchemy.func.count()).select_from(Thing)
+                )
+                return result.scalar()
+
+        return await asyncio.gather(*(count() for _ in range(4)))
+
+    assert _run(test) == [5, 5, 5, 5]
+
+
+def test_reflect_metadata(test_data):
+    async def test(engine):
+        metadata = sqlalchemy.MetaData()
+        async with engine.connect() as conn:
+            await conn.run_sync(metadata.reflect)
+        return metadata
+
+    metadata = _run(test)
+    assert [c.name for c in metadata.tables["some_table"].columns] == ["id", "name"]
+
+
+def test_insert_with_load_job(test_data):
+    async def test(engine):
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                sqlalchemy.select(sqlalchemy.func.count(Thing.id))
+            )
+            return result.scalar()
+
+    assert _run(test, insert_strategy="load_job") == 5
+    assert len(test_data["load_jobs"]) == 1
+
+
+def test_estimate(test_data):
+    test_data["total_bytes_processed"] = 42
+
+    async def test(engine):
+        async with engine.connect() as conn:
+            return await conn.run_sync(
+                lambda conn: conn.dialect.estimate(conn, sqlalchemy.select(Thing.id))
+            )
+
+    estimate = _run(test)
+    assert estimate.total_bytes_processed == 42
+    assert estimate.referenced_tables == ("myproject.mydataset.some_table",)
+
+
+def test_after_bigquery_job_event(test_data):
+    job_stats = []
+
+    async def test(engine):
+        sqlalchemy.event.listen(
+            engine.sync_engine,
+            "after_bigquery_job",
+            lambda conn, context, stats: job_stats.append(stats),
+        )
+        async with engine.connect() as conn:
+            result = await conn.execute(sqlalchemy.select(Thing.id))
+            return result.context.bigquery_job_stats
+
+    assert _run(test) == job_stats[-1]
+
+
+def test_result_cache(test_data):
+    async def test(engine):
+        query = (
+            sqlalchemy.select(Thing.name)
+            .where(Thing.id < 2)
+            .order_by(Thing.id)
+            .execution_options(bigquery_result_cache=True)
+        )
+        results = []
+        async with engine.connect() as conn:
+            for _ in range(2):
+                result = await conn.execute(query)
+                results.append(
+                    (result.scalars().all(), result.context.bigquery_result_cache_hit)
+                )
+        return results
+
+    assert _run(test) == [(["name0", "name1"], False), (["name0", "name1"], True)]
+
+
+def test_coalesce_queries(test_data):
+    async def test(engine):
+        single_flight = engine.dialect.single_flight
+        query_and_wait = fauxdbi.FauxClient.query_and_wait
+
+        def blocked_query_and_wait(*args, **kwargs):
+            # Hold the query until the other executions are waiting for it.
+            deadline = time.monotonic() + 10
+            while single_flight.coalesced < 3 and time.monotonic() < deadline:
+                time.sleep(0.001)
+            return query_and_wait(*args, **kwargs)
+
+        async def count():
+            async with engine.connect() as conn:
+                result = await conn.execute(
+                    sqlalchemy.select(sqlalchemy.func.count()).select_from(Thing)
+                )
+                return result.scalar(), result.context.bigquery_coalesced
+
+        with mock.patch.object(
+            fauxdbi.FauxClient, "query_and_wait", blocked_query_and_wait
+        ):
+            return await asyncio.gather(*(count() for _ in range(4)))
+
+    results = _run(test, coalesce_queries=True, max_workers=4)
+    assert sorted(results) == [(5, False), (5, True), (5, True), (5, True)]
+
+
+def test_cancelled_task_cancels_job(test_data):
+    waiting = threading.Event()
+
+    def blocked_until_cancelled(self, page_size=None, timeout=None):
+        waiting.set()
+        deadline = time.monotonic() + 10
+        while self.state != "DONE" and time.monotonic() < deadline:
+            time.sleep(0.001)
+        raise google.api_core.exceptions.BadRequest("Job execution was cancelled")
+
+    async def test(engine):
+        async def execute():
+            async with engine.connect() as conn:
+                await conn.execute(sqlalchemy.select(Thing.id))
+
+        with mock.patch.object(fauxdbi.QueryJob, "result", blocked_until_cancelled):
+            task = asyncio.create_task(execute())
+            while not waiting.is_set():
+                await asyncio.sleep(0.001)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            while engine.dialect.running_jobs.cancelled == 0:
+                await asyncio.sleep(0.001)
+
+    _run(test, cancel_jobs=True)
+    assert test_data["cancelled_jobs"] == [f"query_job{test_data['query_jobs']}"]
+
+
+def test_pre_ping(test_data):
+    async def test(engine):
+        for _ in range(2):
+            async with engine.connect() as conn:
+                await conn.execute(sqlalchemy.select(Thing.id))
+
+    _run(test, pool_pre_ping=True)
+    assert test_data["get_dataset"] == [("myproject.mydataset", None, 10)]
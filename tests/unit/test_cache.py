@@ -0,0 +1,107 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+import pytest
+
+from sqlalchemy_bigquery._cache import TTLCache
+
+
+def test_get_and_set(timer):
+    cache = TTLCache(10, 5, timer=timer)
+    assert cache.get("a") is None
+    assert cache.get("a", 42) == 42
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_entries_expire(timer):
+    cache = TTLCache(10, 5, timer=timer)
+    cache.set("a", 1)
+    timer.now = 9.9
+    assert cache.get("a") == 1
+    timer.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_evicted(timer):
+    cache = TTLCache(10, 2, timer=timer)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_invalidate_and_clear(timer):
+    cache = TTLCache(10, 5, timer=timer)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate("a")
+    cache.invalidate("nope")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("ttl,maxsize", [(0, 5), (10, 0), (None, 5), (-1, 5)])
+def test_disabled(timer, ttl, maxsize):
+    cache = TTLCache(ttl, maxsize, timer=timer)
+    assert not cache.enabled
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_max_bytes(timer):
+    cache = TTLCache(10, 5, timer=timer, max_bytes=10, sizeof=len)
+    cache.set("a", "xxxx")
+    cache.set("b", "xxxx")
+    assert cache.bytes == 8
+    cache.set("c", "xxxx")
+    assert cache.get("a") is None
+    assert cache.get("b") == "xxxx"
+    assert cache.bytes == 8
+
+    # Values bigger than the limit aren't cached.
+    cache.set("b", "x" * 11)
+    assert cache.get("b") is None
+    assert cache.bytes == 4
+
+    cache.clear()
+    assert cache.bytes == 0
+
+
+def test_invalidate_matching(timer):
+    cache = TTLCache(10, 5, timer=timer, max_bytes=100, sizeof=len)
+    cache.set("a", "xx")
+    cache.set("b", "yyy")
+    cache.set("c", "xxxx")
+    cache.invalidate_matching(lambda value: value.startswith("x"))
+    assert len(cache) == 1
+    assert cache.get("b") == "yyy"
+    assert cache.bytes == 3
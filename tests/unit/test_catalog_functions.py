@@ -17,9 +17,15 @@
 # IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import threading
+import time
+
 import pytest
+import sqlalchemy
 import sqlalchemy.types
 
+from .conftest import sqlalchemy_2_0_or_higher
+
 
 @pytest.mark.parametrize(
     "table,schema,expect",
@@ -294,3 +300,196 @@ def test_bad_table_argument(faux_conn):
     # with goofy table name, to exercise some error handling
     with pytest.raises(ValueError, match=r"Did not understand table_name: a\.b\.c\.d"):
         faux_conn.dialect.has_table(faux_conn.engine, "a.b.c.d")
+
+
+class GetTableCalls(list):
+    """Names of tables fetched, and the most fetched at once"""
+
+    max_at_once = 0
+
+
+@pytest.fixture()
+def get_table_calls(faux_conn):
+    client = faux_conn.connection._client
+    get_table = client.get_table
+    calls = GetTableCalls()
+    running = []
+    lock = threading.Lock()
+
+    def counting_get_table(table_ref):
+        with lock:
+            calls.append(table_ref.table_id)
+            running.append(table_ref)
+            calls.max_at_once = max(calls.max_at_once, len(running))
+        time.sleep(0.01)
+        try:
+            return get_table(table_ref)
+        finally:
+            with lock:
+                running.remove(table_ref)
+
+    client.get_table = counting_get_table
+    return calls
+
+
+def _create_tables(faux_conn, *names):
+    cursor = faux_conn.connection.cursor()
+    for name in names:
+        cursor.execute(f"create table {name} (x INT64, y STRING)")
+
+
+def test_reflect_fetches_each_table_once(faux_conn, get_table_calls):
+    _create_tables(faux_conn, "t1", "t2", "t3")
+    faux_conn.connection._client.tables.t2.description = "table 2"
+
+    metadata = sqlalchemy.MetaData()
+    metadata.reflect(faux_conn)
+
+    assert sorted(metadata.tables) == ["t1", "t2", "t3"]
+    assert [c.name for c in metadata.tables["t1"].columns] == ["x", "y"]
+    assert metadata.tables["t2"].comment == "table 2"
+    assert sorted(get_table_calls) == ["t1", "t2", "t3"]
+
+
+def test_autoload_fetches_table_once(faux_conn, get_table_calls):
+    _create_tables(faux_conn, "t1")
+    table = sqlalchemy.Table("t1", sqlalchemy.MetaData(), autoload_with=faux_conn)
+    assert [c.name for c in table.columns] == ["x", "y"]
+    assert get_table_calls == ["t1"]
+
+
+@sqlalchemy_2_0_or_higher
+def test_reflect_fetches_tables_concurrently(faux_conn, get_table_calls):
+    _create_tables(faux_conn, *(f"t{i}" for i in range(6)))
+    faux_conn.dialect.reflection_max_workers = 3
+    sqlalchemy.MetaData().reflect(faux_conn)
+    assert len(get_table_calls) == 6
+    assert get_table_calls.max_at_once == 3
+
+
+@sqlalchemy_2_0_or_higher
+def test_get_multi_columns(faux_conn, get_table_calls):
+    _create_tables(faux_conn, "t1", "t2", "t3")
+    inspector = sqlalchemy.inspect(faux_conn)
+    columns = inspector.get_multi_columns(filter_names=["t1", "t3", "nope"])
+    assert sorted(columns) == [(None, "t1"), (None, "t3")]
+    assert [c["name"] for c in columns[(None, "t1")]] == ["x", "y"]
+
+    comments = inspector.get_multi_table_comment(filter_names=["t1", "t3"])
+    assert comments == {(None, "t1"): dict(text=None), (None, "t3"): dict(text=None)}
+    assert inspector.get_multi_pk_constraint(filter_names=["t1"]) == {
+        (None, "t1"): dict(constrained_columns=[])
+    }
+    assert inspector.get_multi_foreign_keys(filter_names=["t1"]) == {(None, "t1"): []}
+    assert inspector.get_multi_indexes(filter_names=["t1"]) == {(None, "t1"): []}
+    assert sorted(get_table_calls) == ["t1", "t3"]
+
+
+@sqlalchemy_2_0_or_higher
+def test_get_multi_constraints_dont_fetch_tables(faux_conn, get_table_calls):
+    _create_tables(faux_conn, "t1", "t2")
+    inspector = sqlalchemy.inspect(faux_conn)
+    assert inspector.get_multi_pk_constraint() == {
+        (None, "t1"): dict(constrained_columns=[]),
+        (None, "t2"): dict(constrained_columns=[]),
+    }
+    assert inspector.get_multi_foreign_keys() == {(None, "t1"): [], (None, "t2"): []}
+    assert inspector.get_multi_indexes() == {(None, "t1"): [], (None, "t2"): []}
+    assert get_table_calls == []
+
+
+def test_reflect_lists_tables_once(faux_conn, get_table_calls):
+    _create_tables(faux_conn, "t1", "t2")
+    client = faux_conn.connection._client
+    list_tables = client.list_tables
+    listed = []
+
+    def counting_list_tables(dataset, page_size):
+        listed.append(dataset.dataset_id)
+        return list_tables(dataset, page_size)
+
+    client.list_tables = counting_list_tables
+    metadata = sqlalchemy.MetaData()
+    metadata.reflect(faux_conn)
+    assert sorted(metadata.tables) == ["t1", "t2"]
+    assert len(listed) == 1
+
+
+@pytest.fixture()
+def metadata_cache(faux_conn):
+    from sqlalchemy_bigquery._cache import TTLCache
+
+    faux_conn.dialect.metadata_cache = TTLCache(60, 10)
+    return faux_conn.dialect.metadata_cache
+
+
+def test_metadata_cache(faux_conn, get_table_calls, metadata_cache):
+    _create_tables(faux_conn, "t1", "t2")
+    dialect = faux_conn.dialect
+    assert dialect.has_table(faux_conn, "t1")
+    assert [c["name"] for c in dialect.get_columns(faux_conn, "t1")] == ["x", "y"]
+    assert not dialect.has_table(faux_conn, "nope")
+    assert not dialect.has_table(faux_conn, "nope")
+    sqlalchemy.MetaData().reflect(faux_conn)
+    assert sorted(get_table_calls) == ["nope", "nope", "t1", "t2"]
+    assert (metadata_cache.hits, metadata_cache.misses) == (2, 4)
+
+
+def test_metadata_cache_invalidated_by_ddl(faux_conn, get_table_calls, metadata_cache):
+    _create_tables(faux_conn, "t1", "t2")
+    dialect = faux_conn.dialect
+    dialect.get_columns(faux_conn, "t1")
+    dialect.get_columns(faux_conn, "t2")
+
+    table = sqlalchemy.Table("t1", sqlalchemy.MetaData(), autoload_with=faux_conn)
+    table.drop(faux_conn)
+    table = sqlalchemy.Table(
+        "t1", sqlalchemy.MetaData(), sqlalchemy.Column("z", sqlalchemy.Integer)
+    )
+    table.create(faux_conn)
+
+    assert [c["name"] for c in dialect.get_columns(faux_conn, "t1")] == ["z"]
+    assert [c["name"] for c in dialect.get_columns(faux_conn, "t2")] == ["x", "y"]
+    assert get_table_calls == ["t1", "t2", "t1"]
+
+
+@pytest.mark.parametrize(
+    "ddl,tables",
+    [
+        (
+            lambda table: sqlalchemy.schema.CreateTable(table),
+            [("mydataset", "t1")],
+        ),
+        (
+            lambda table: sqlalchemy.schema.DropTableComment(table),
+            [("mydataset", "t1")],
+        ),
+        (
+            lambda table: sqlalchemy.schema.SetColumnComment(table.c.x),
+            [("mydataset", "t1")],
+        ),
+        (lambda table: sqlalchemy.DDL("drop table whatever"), None),
+    ],
+)
+def test_ddl_tables(faux_conn, ddl, tables):
+    table = sqlalchemy.Table(
+        "t1",
+        sqlalchemy.MetaData(),
+        sqlalchemy.Column("x", sqlalchemy.Integer, comment="the x"),
+        schema="mydataset",
+    )
+    compiled = ddl(table).compile(dialect=faux_conn.dialect)
+    assert compiled.bigquery_ddl_tables == tables
+
+
+def test_ddl_in_other_project_clears_metadata_cache(faux_conn, metadata_cache):
+    metadata_cache.set("myproject.mydataset.t1", "table")
+    faux_conn.dialect._invalidate_table_metadata([("yourdataset", "t2")])
+    assert len(metadata_cache) == 1
+    faux_conn.dialect._invalidate_table_metadata([("yourproject.mydataset", "t1")])
+    assert len(metadata_cache) == 1
+    faux_conn.dialect._invalidate_table_metadata([("mydataset", "t1")])
+    assert len(metadata_cache) == 0
+    metadata_cache.set("myproject.mydataset.t1", "table")
+    faux_conn.dialect._invalidate_table_metadata(None)
+    assert len(metadata_cache) == 0
@@ -0,0 +1,222 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import base64
+import gc
+import json
+import os
+import threading
+from unittest import mock
+
+import google.cloud.bigquery
+import pytest
+import sqlalchemy
+
+from sqlalchemy_bigquery import _clients
+from sqlalchemy_bigquery._clients import ClientRegistry, client_key
+from .conftest import faux_dbapi
+
+
+class Client:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_acquire_shares_clients():
+    registry = ClientRegistry()
+    client = registry.acquire("k", Client)
+    assert registry.acquire("k", Client) is client
+    assert registry.acquire("other", Client) is not client
+    assert (registry.hits, registry.misses) == (1, 2)
+
+
+def test_released_clients_kept_until_idle_ttl(timer):
+    registry = ClientRegistry(idle_ttl=60, timer=timer)
+    client = registry.acquire("k", Client)
+    registry.acquire("k", Client)
+    registry.release("k")
+    registry.release("k")
+    timer.now = 59
+    registry.evict()
+    assert registry.acquire("k", Client) is client
+
+    registry.release("k")
+    timer.now = 119
+    registry.evict()
+    assert "k" not in registry
+    assert client.closed
+
+
+def test_clients_in_use_arent_evicted(timer):
+    registry = ClientRegistry(max_idle=0, idle_ttl=60, timer=timer)
+    client = registry.acquire("k", Client)
+    timer.now = 1000
+    registry.evict()
+    assert "k" in registry
+    assert not client.closed
+
+    registry.release("k")
+    assert "k" not in registry
+    assert client.closed
+
+
+def test_least_recently_released_idle_clients_evicted():
+    registry = ClientRegistry(max_idle=2)
+    clients = {key: registry.acquire(key, Client) for key in "abc"}
+    for key in "bac":
+        registry.release(key)
+    assert list(registry._entries) == ["a", "c"]
+    assert [key for key, client in clients.items() if client.closed] == ["b"]
+
+
+def test_release_unknown_key():
+    registry = ClientRegistry()
+    registry.release("k")
+    assert len(registry) == 0
+
+
+def test_dispose():
+    registry = ClientRegistry()
+    clients = [registry.acquire(key, Client) for key in "ab"]
+    registry.release("a")
+    registry.dispose()
+    assert len(registry) == 0
+    assert all(client.closed for client in clients)
+    assert registry.acquire("a", Client) is not clients[0]
+
+
+def test_concurrent_creation_keeps_one_client():
+    registry = ClientRegistry()
+    created = []
+    creating = threading.Barrier(2)
+
+    def create():
+        creating.wait(10)
+        created.append(Client())
+        return created[-1]
+
+    acquired = []
+    threads = [
+        threading.Thread(target=lambda: acquired.append(registry.acquire("k", create)))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 2
+    assert acquired[0] is acquired[1]
+    assert [client.closed for client in created].count(True) == 1
+    assert registry._entries["k"][1] == 2
+
+
+def test_client_key_credentials_sources(tmp_path):
+    info = {"type": "service_account", "private_key": "secret"}
+    blob = base64.b64encode(json.dumps(info).encode()).decode()
+    path = tmp_path / "key.json"
+    path.write_text(json.dumps(info))
+
+    keys = {
+        client_key(),
+        client_key(credentials_info=info),
+        client_key(credentials_base64=blob),
+        client_key(credentials_path=str(path)),
+    }
+    assert len(keys) == 4
+    assert "secret" not in repr(keys)
+    assert blob not in repr(keys)
+    assert client_key(credentials_info=dict(info)) == client_key(credentials_info=info)
+
+
+def test_client_key_changes_with_key_file(tmp_path):
+    path = tmp_path / "key.json"
+    path.write_text("{}")
+    key = client_key(credentials_path=str(path))
+    assert client_key(credentials_path=str(path)) == key
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert client_key(credentials_path=str(path)) != key
+
+
+def test_client_key_settings():
+    job_config = google.cloud.bigquery.QueryJobConfig(
+        default_dataset="myproject.mydataset"
+    )
+    keys = {
+        client_key(project_id="a"),
+        client_key(project_id="b"),
+        client_key(project_id="a", location="EU"),
+        client_key(project_id="a", default_query_job_config=job_config),
+        client_key(project_id="a", default_job_creation_mode="JOB_CREATION_OPTIONAL"),
+    }
+    assert len(keys) == 5
+
+
+@pytest.fixture()
+def registry():
+    registry = ClientRegistry()
+    with faux_dbapi(dict(execute=[])):
+        with mock.patch.object(_clients, "registry", registry):
+            yield registry
+
+
+def _client(engine):
+    with engine.connect() as conn:
+        return conn.connection._client
+
+
+def test_engines_share_client(registry):
+    engines = [
+        sqlalchemy.create_engine(
+            "bigquery://myproject/mydataset?location=EU", shared_client=True
+        )
+        for _ in range(2)
+    ]
+    assert _client(engines[0]) is _client(engines[1])
+    assert (registry.hits, registry.misses) == (1, 1)
+
+    other = sqlalchemy.create_engine(
+        "bigquery://myproject/yourdataset?location=EU", shared_client=True
+    )
+    assert _client(other) is not _client(engines[0])
+
+
+def test_engines_dont_share_clients_by_default(registry):
+    engines = [
+        sqlalchemy.create_engine("bigquery://myproject/mydataset") for _ in range(2)
+    ]
+    assert _client(engines[0]) is not _client(engines[1])
+    assert len(registry) == 0
+
+
+def test_collected_engine_releases_client(registry):
+    registry.max_idle = 0
+    engine = sqlalchemy.create_engine(
+        "bigquery://myproject/mydataset", shared_client=True
+    )
+    client = _client(engine)
+    engine.dispose()
+    del engine
+    gc.collect()
+    assert len(registry) == 0
+    assert client.closed
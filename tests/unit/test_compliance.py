@@ -27,7 +27,7 @@ import sqlalchemy
 from sqlalchemy import Column, Integer, literal_column, select, String, Table, union
 from sqlalchemy.testing.assertions import eq_, in_
 
-from .conftest import setup_table
+from .conftest import setup_table, sqlalchemy_before_2_0, sqlalchemy_2_0_or_higher
 
 
 def assert_result(connection, sel, expected, params=()):
@@ -192,7 +192,8 @@ def test_group_by_composed(faux_conn):
     assert_result(faux_conn, stmt, [(1, 3), (1, 5), (1, 7)])
 
 
-def test_cast_type_decorator(faux_conn, last_query):
+@sqlalchemy_before_2_0
+def test_cast_type_decorator_before_2_0(faux_conn, last_query):
     # [artial dup of:
     #   sqlalchemy.testing.suite.test_types.CastTypeDecoratorTest.test_special_type
     # That test failes without code that's otherwise not covered by the unit tests.
@@ -206,3 +207,24 @@ def test_cast_type_decorator(faux_conn, last_query):
     t = setup_table(faux_conn, "t", Column("x", StringAsInt()))
     faux_conn.execute(t.insert(), [{"x": x} for x in [1, 2, 3]])
     last_query("INSERT INTO `t` (`x`) VALUES (CAST(%(x:STRING)s AS STRING))", {"x": 3})
+
+
+@sqlalchemy_2_0_or_higher
+def test_cast_type_decorator(faux_conn, last_query):
+    # [artial dup of:
+    #   sqlalchemy.testing.suite.test_types.CastTypeDecoratorTest.test_special_type
+    # That test failes without code that's otherwise not covered by the unit tests.
+
+    class StringAsInt(sqlalchemy.TypeDecorator):
+        impl = sqlalchemy.String(50)
+
+        def bind_expression(self, col):
+            return sqlalchemy.cast(col, String(50))
+
+    t = setup_table(faux_conn, "t", Column("x", StringAsInt()))
+    faux_conn.execute(t.insert(), [{"x": x} for x in [1, 2, 3]])
+    last_query(
+        "INSERT INTO `t` (`x`) VALUES (CAST(%(x__0:STRING)s AS STRING)),"
+        " (CAST(%(x__1:STRING)s AS STRING)), (CAST(%(x__2:STRING)s AS STRING))",
+        {"x__0": 1, "x__1": 2, "x__2": 3},
+    )
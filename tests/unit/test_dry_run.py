@@ -0,0 +1,148 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import pytest
+import sqlalchemy
+
+from .conftest import (
+    executed_selects,
+    executed_statements,
+    setup_some_table,
+    setup_table,
+)
+
+
+@pytest.fixture()
+def table(faux_conn):
+    table = setup_some_table(
+        faux_conn, initial_data=[dict(id=1, name="a"), dict(id=2, name="b")]
+    )
+    faux_conn.test_data["total_bytes_processed"] = 1000
+    return table
+
+
+def test_estimate(faux_conn, table):
+    estimate = faux_conn.dialect.estimate(
+        faux_conn, sqlalchemy.select(table.c.name).where(table.c.id == 1)
+    )
+    assert "bigquery_dry_run" not in faux_conn.get_execution_options()
+    assert estimate.total_bytes_processed == 1000
+    assert estimate.referenced_tables == ("myproject.mydataset.some_table",)
+
+    # The statement was only dry-run.
+    assert executed_selects(faux_conn) == []
+    (dry_run,) = faux_conn.test_data["dry_runs"]
+    sql, query_parameters = dry_run
+    assert sql == (
+        "SELECT `some_table`.`name` \nFROM `some_table` \n"
+        "WHERE `some_table`.`id` = @`id_1`"
+    )
+    assert [(p.name, p.type_, p.value) for p in query_parameters] == [
+        ("id_1", "INT64", 1)
+    ]
+
+
+def test_estimate_text(faux_conn, table):
+    estimate = faux_conn.dialect.estimate(
+        faux_conn, "select * from `some_table` where id = :id", dict(id=1)
+    )
+    assert estimate.total_bytes_processed == 1000
+    assert estimate.referenced_tables == ("myproject.mydataset.some_table",)
+
+
+def test_estimate_native_query_parameters(native_faux_conn):
+    table = setup_table(
+        native_faux_conn, "some_table", sqlalchemy.Column("id", sqlalchemy.Integer)
+    )
+    native_faux_conn.dialect.estimate(
+        native_faux_conn, sqlalchemy.select(table.c.id).where(table.c.id == 1)
+    )
+    ((sql, query_parameters),) = native_faux_conn.test_data["dry_runs"]
+    assert sql.endswith("WHERE `some_table`.`id` = @id_1")
+    assert [(p.name, p.type_, p.value) for p in query_parameters] == [
+        ("id_1", "INT64", 1)
+    ]
+
+
+def test_estimates_cached(faux_conn, table):
+    estimate = faux_conn.dialect.estimate
+    cache = faux_conn.dialect.dry_runner.cache
+    estimate(faux_conn, sqlalchemy.select(table.c.name).where(table.c.id == 1))
+    estimate(faux_conn, sqlalchemy.select(table.c.name).where(table.c.id == 1))
+    assert len(faux_conn.test_data["dry_runs"]) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Estimates are for specific parameter values.
+    estimate(faux_conn, sqlalchemy.select(table.c.name).where(table.c.id == 2))
+    assert len(faux_conn.test_data["dry_runs"]) == 2
+
+
+def test_estimates_not_cached():
+    from .conftest import _faux_conn
+
+    with _faux_conn(dry_run_cache_ttl=0) as conn:
+        for _ in range(2):
+            conn.dialect.estimate(conn, sqlalchemy.text("select 1"))
+        assert len(conn.test_data["dry_runs"]) == 2
+
+
+def test_max_bytes_within_budget(faux_conn, table):
+    result = faux_conn.execute(
+        sqlalchemy.select(table.c.name)
+        .where(table.c.id == 2)
+        .execution_options(bigquery_max_bytes=1000)
+    )
+    assert result.scalars().all() == ["b"]
+    assert len(faux_conn.test_data["dry_runs"]) == 1
+    assert result.context.bigquery_estimate.total_bytes_processed == 1000
+
+
+def test_max_bytes_exceeded(faux_conn, table):
+    with pytest.raises(
+        sqlalchemy.exc.DatabaseError,
+        match=r"would process 1000 bytes, more than bigquery_max_bytes \(999\)",
+    ):
+        faux_conn.execute(
+            sqlalchemy.select(table.c.name).execution_options(bigquery_max_bytes=999)
+        )
+    assert executed_selects(faux_conn) == []
+
+
+def test_max_bytes_exceeded_executemany(faux_conn, table):
+    stmt = (
+        table.update()
+        .where(table.c.id == sqlalchemy.bindparam("key", type_=sqlalchemy.Integer))
+        .values(name=sqlalchemy.bindparam("new_name"))
+    )
+    rows = [dict(key=1, new_name="x"), dict(key=2, new_name="y")]
+    with pytest.raises(sqlalchemy.exc.DatabaseError, match="bigquery_max_bytes"):
+        faux_conn.execute(
+            stmt.execution_options(
+                bigquery_max_bytes=999, bigquery_unnest_executemany=False
+            ),
+            rows,
+        )
+    with pytest.raises(sqlalchemy.exc.DatabaseError, match="bigquery_max_bytes"):
+        faux_conn.execute(stmt.execution_options(bigquery_max_bytes=999), rows)
+
+    assert executed_statements(faux_conn, "UPDATE") == []
+    assert faux_conn.execute(sqlalchemy.select(table.c.name)).scalars().all() == [
+        "a",
+        "b",
+    ]
@@ -70,3 +70,33 @@ def test_arraysize_querystring_takes_precedence_over_default(faux_conn, metadata
     metadata.create_all(engine)
 
     assert conn.connection.test_data["arraysize"] == arraysize
+
+
+def test_http_pool_sizes(faux_conn):
+    engine = sqlalchemy.create_engine(
+        "bigquery://myproject/mydataset", http_pool_connections=2, http_pool_maxsize=64
+    )
+    client = engine.connect().connection._client
+    assert (client.http_pool_connections, client.http_pool_maxsize) == (2, 64)
+
+
+def test_http_pool_sizes_querystring_takes_precedence(faux_conn):
+    engine = sqlalchemy.create_engine(
+        "bigquery://myproject/mydataset?http_pool_maxsize=32", http_pool_maxsize=64
+    )
+    client = engine.connect().connection._client
+    assert (client.http_pool_connections, client.http_pool_maxsize) == (None, 32)
+
+
+@pytest.mark.parametrize("value", [0, -1])
+@pytest.mark.parametrize("param", ["http_pool_connections", "http_pool_maxsize"])
+def test_http_pool_sizes_must_be_positive(param, value):
+    with pytest.raises(ValueError, match=param):
+        sqlalchemy.create_engine("bigquery://myproject", **{param: value})
+
+
+@pytest.mark.parametrize("value", [0, -1])
+@pytest.mark.parametrize("param", ["http_pool_connections", "http_pool_maxsize"])
+def test_http_pool_sizes_in_url_must_be_positive(faux_conn, param, value):
+    with pytest.raises(ValueError, match=param):
+        sqlalchemy.create_engine(f"bigquery://myproject?{param}={value}")
@@ -17,9 +17,10 @@
 # IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import packaging.version
 import pytest
 
-from .conftest import setup_table
+from .conftest import setup_table, sqlalchemy_version
 
 geoalchemy2 = pytest.importorskip("geoalchemy2")
 
@@ -59,17 +60,31 @@ def test_geoalchemy2_core(faux_conn, last_query):
             {"name": "Orta", "geog": "POLYGON((3 0,6 0,6 3,3 3,3 0))"},
         ],
     )
-    last_query(
-        "INSERT INTO `lake` (`name`, `geog`)"
-        " VALUES (%(name:STRING)s, %(geog:geography)s)",
-        {"name": "Garde", "geog": "POLYGON((1 0,3 0,3 2,1 2,1 0))"},
-        offset=2,
-    )
-    last_query(
-        "INSERT INTO `lake` (`name`, `geog`)"
-        " VALUES (%(name:STRING)s, %(geog:geography)s)",
-        {"name": "Orta", "geog": "POLYGON((3 0,6 0,6 3,3 3,3 0))"},
-    )
+    if sqlalchemy_version >= packaging.version.parse("2.0"):
+        # The rows are inserted together, with insertmanyvalues.
+        last_query(
+            "INSERT INTO `lake` (`name`, `geog`)"
+            " VALUES (%(name__0:STRING)s, %(geog__0:geography)s),"
+            " (%(name__1:STRING)s, %(geog__1:geography)s)",
+            {
+                "name__0": "Garde",
+                "geog__0": "POLYGON((1 0,3 0,3 2,1 2,1 0))",
+                "name__1": "Orta",
+                "geog__1": "POLYGON((3 0,6 0,6 3,3 3,3 0))",
+            },
+        )
+    else:
+        last_query(
+            "INSERT INTO `lake` (`name`, `geog`)"
+            " VALUES (%(name:STRING)s, %(geog:geography)s)",
+            {"name": "Garde", "geog": "POLYGON((1 0,3 0,3 2,1 2,1 0))"},
+            offset=2,
+        )
+        last_query(
+            "INSERT INTO `lake` (`name`, `geog`)"
+            " VALUES (%(name:STRING)s, %(geog:geography)s)",
+            {"name": "Orta", "geog": "POLYGON((3 0,6 0,6 3,3 3,3 0))"},
+        )
 
     # Selections
 
@@ -180,3 +195,37 @@ def test_calling_st_functions_that_dont_take_geographies(faux_conn, last_query):
         " AS `ST_GeogFromText_1`",
         dict(ST_GeogFromText_2="point(0 0)"),
     )
+
+
+def test_st_function_arguments_arent_modified_when_compiled(faux_conn):
+    from sqlalchemy import func, select
+    from sqlalchemy_bigquery import GEOGRAPHY
+
+    expr = func.ST_Area("POLYGON((0 0, 1 1, 1 0, 0 0))")
+    argument_type = expr.clauses.clauses[0].type
+
+    for _ in range(2):
+        sql = str(select(expr).compile(faux_conn.engine))
+        assert "%(ST_Area_2:geography)s" in sql
+
+    assert expr.clauses.clauses[0].type is argument_type
+    assert not isinstance(argument_type, GEOGRAPHY)
+
+
+def test_geography_statements_are_cached(faux_conn):
+    import warnings
+
+    from sqlalchemy import Column, String, exc, select
+    from sqlalchemy.engine import default
+    from sqlalchemy_bigquery import GEOGRAPHY
+
+    lake_table = setup_table(
+        faux_conn, "lake", Column("name", String), Column("geog", GEOGRAPHY)
+    )
+    query = select(lake_table.c.name).where(lake_table.c.geog == "POINT(0 0)")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", exc.SAWarning)
+        contexts = [faux_conn.execute(query).context for _ in range(2)]
+
+    assert contexts[1].cache_hit == default.CACHE_HIT
@@ -10,7 +10,9 @@ from unittest import mock
 
 import google.auth
 import google.auth.credentials
+import google.auth.transport.requests
 import pytest
+import requests.adapters
 from google.oauth2 import service_account
 from sqlalchemy_bigquery import _helpers
 
@@ -189,6 +191,25 @@ def test_create_bigquery_client_with_default_credentials_respects_project(
     assert bqclient.project == "connection-url-project"
 
 
+def test_create_bigquery_client_with_job_creation_mode(monkeypatch, module_under_test):
+    def mock_default_credentials(*args, **kwargs):
+        return (google.auth.credentials.AnonymousCredentials(), "default-project")
+
+    monkeypatch.setattr(google.auth, "default", mock_default_credentials)
+
+    bqclient = module_under_test.create_bigquery_client(
+        default_job_creation_mode="JOB_CREATION_OPTIONAL"
+    )
+    assert bqclient.default_job_creation_mode == "JOB_CREATION_OPTIONAL"
+
+    # Older clients don't have a job creation mode.
+    monkeypatch.setattr(module_under_test.bigquery, "__version__", "3.33.0")
+    with pytest.raises(ValueError, match="google-cloud-bigquery 3.34.0 or later"):
+        module_under_test.create_bigquery_client(
+            default_job_creation_mode="JOB_CREATION_OPTIONAL"
+        )
+
+
 def test_substitute_string_re(module_under_test):
     import re
 
@@ -257,3 +278,81 @@ def test_substitute_re_func_self(module_under_test):
 def test_google_client_info(user_agent, expected_user_agent):
     client_info = _helpers.google_client_info(user_agent=user_agent)
     assert client_info.to_user_agent().startswith(expected_user_agent)
+
+
+def test_create_bigquery_client_with_http_pool_sizes(monkeypatch, module_under_test):
+    credentials = google.auth.credentials.AnonymousCredentials()
+    monkeypatch.setattr(
+        google.auth, "default", lambda *args, **kwargs: (credentials, "my-project")
+    )
+
+    bqclient = module_under_test.create_bigquery_client(
+        http_pool_connections=2, http_pool_maxsize=64
+    )
+
+    session = bqclient._http
+    assert session.credentials is credentials
+    for prefix in "https://", "http://":
+        adapter = session.get_adapter(prefix + "bigquery.googleapis.com")
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 64
+
+
+def test_create_bigquery_client_default_http_session(monkeypatch, module_under_test):
+    monkeypatch.setattr(
+        google.auth,
+        "default",
+        lambda *args, **kwargs: (
+            google.auth.credentials.AnonymousCredentials(),
+            "my-project",
+        ),
+    )
+
+    bqclient = module_under_test.create_bigquery_client()
+
+    assert bqclient._http_internal is None
+
+
+def test_create_http_session_defaults(module_under_test):
+    session = module_under_test.create_http_session(
+        google.auth.credentials.AnonymousCredentials(), pool_maxsize=16
+    )
+    adapter = session.get_adapter("https://bigquery.googleapis.com")
+    assert adapter._pool_connections == requests.adapters.DEFAULT_POOLSIZE
+    assert adapter._pool_maxsize == 16
+
+
+def test_create_http_session_keeps_mtls_channel(monkeypatch, module_under_test):
+    class MutualTlsAdapter(requests.adapters.HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs["ssl_context"] = "client-cert-context"
+            super().init_poolmanager(*args, **kwargs)
+
+    cert_sources = []
+
+    def configure_mtls_channel(self, client_cert_callback=None):
+        cert_sources.append(client_cert_callback)
+        self._is_mtls = True
+        self.mount("https://", MutualTlsAdapter())
+
+    monkeypatch.setattr(
+        google.auth.transport.requests.AuthorizedSession,
+        "configure_mtls_channel",
+        configure_mtls_channel,
+    )
+
+    session = module_under_test.create_http_session(
+        google.auth.credentials.AnonymousCredentials(),
+        pool_maxsize=64,
+        client_cert_source="cert-source",
+    )
+
+    assert cert_sources == ["cert-source"]
+    assert session.is_mtls
+    adapter = session.get_adapter("https://bigquery.googleapis.com")
+    assert isinstance(adapter, MutualTlsAdapter)
+    assert adapter._pool_maxsize == 64
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 64
+    assert adapter.poolmanager.connection_pool_kw["ssl_context"] == (
+        "client-cert-context"
+    )
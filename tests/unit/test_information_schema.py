@@ -0,0 +1,254 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from google.cloud.bigquery.schema import SchemaField
+import mock
+import pytest
+import sqlalchemy
+
+from sqlalchemy_bigquery import _types
+from sqlalchemy_bigquery._information_schema import (
+    QUERY,
+    InformationSchema,
+    parse_data_type,
+)
+
+from .conftest import sqlalchemy_2_0_or_higher
+
+
+def _row(
+    table_name,
+    column_name=None,
+    data_type=None,
+    field_path=None,
+    table_type="BASE TABLE",
+    description=None,
+    is_nullable="YES",
+    ordinal_position=None,
+    table_description=None,
+    view_definition=None,
+):
+    return dict(
+        table_name=table_name,
+        table_type=table_type,
+        view_definition=view_definition,
+        table_description=table_description,
+        column_name=column_name,
+        field_path=field_path or column_name,
+        data_type=data_type,
+        description=description,
+        is_nullable=is_nullable if field_path is None else None,
+        ordinal_position=ordinal_position if field_path is None else None,
+    )
+
+
+ROWS = [
+    _row("t1", "id", "INT64", is_nullable="NO", ordinal_position=1),
+    _row(
+        "t1",
+        "person",
+        "STRUCT<name STRING(10), `b day` DATE>",
+        ordinal_position=3,
+        description="a person",
+    ),
+    _row("t1", "person", "STRING(10)", field_path="person.name", description="name"),
+    _row("t1", "person", "DATE", field_path="person.b day"),
+    _row("t1", "price", "NUMERIC(10, 2)", ordinal_position=2),
+    _row("t1", "tags", "ARRAY<STRING>", ordinal_position=4),
+    _row("empty", table_description='"nothing \\"here\\""'),
+    _row(
+        "v1",
+        "x",
+        "INT64",
+        ordinal_position=1,
+        table_type="VIEW",
+        view_definition="select 1 as x",
+    ),
+]
+
+
+class FakeInformationSchema(InformationSchema):
+    """Serves INFORMATION_SCHEMA rows for the datasets it's given"""
+
+    def __init__(self, **datasets):
+        self.datasets = datasets
+        self.queries = []
+
+    def query_rows(self, client, project_id, dataset_id):
+        self.queries.append((project_id, dataset_id))
+        return self.datasets.get(dataset_id, [])
+
+
+@pytest.fixture()
+def information_schema(faux_conn):
+    faux_conn.dialect.reflection_source = "information_schema"
+    information_schema = FakeInformationSchema(mydataset=ROWS)
+    faux_conn.dialect.information_schema = information_schema
+    return information_schema
+
+
+@pytest.mark.parametrize(
+    "data_type,field",
+    [
+        ("INT64", dict(type="INTEGER", mode="NULLABLE")),
+        ("FLOAT64", dict(type="FLOAT", mode="NULLABLE")),
+        ("BOOL", dict(type="BOOLEAN", mode="NULLABLE")),
+        ("STRING(10)", dict(type="STRING", mode="NULLABLE", maxLength=10)),
+        ("BYTES(5)", dict(type="BYTES", mode="NULLABLE", maxLength=5)),
+        (
+            "NUMERIC(10, 2)",
+            dict(type="NUMERIC", mode="NULLABLE", precision=10, scale=2),
+        ),
+        ("BIGNUMERIC(40)", dict(type="BIGNUMERIC", mode="NULLABLE", precision=40)),
+        ("ARRAY<DATE>", dict(type="DATE", mode="REPEATED")),
+        ("RANGE<DATE>", dict(type="RANGE", mode="NULLABLE")),
+        (
+            "ARRAY<STRUCT<a INT64, `b c` STRUCT<d ARRAY<STRING>>>>",
+            dict(
+                type="RECORD",
+                mode="REPEATED",
+                fields=[
+                    dict(name="a", type="INTEGER", mode="NULLABLE"),
+                    dict(
+                        name="b c",
+                        type="RECORD",
+                        mode="NULLABLE",
+                        fields=[dict(name="d", type="STRING", mode="REPEATED")],
+                    ),
+                ],
+            ),
+        ),
+    ],
+)
+def test_parse_data_type(data_type, field):
+    assert parse_data_type(data_type) == field
+
+
+@pytest.mark.parametrize(
+    "data_type",
+    ["", "ARRAY<INT64", "STRUCT<", "STRUCT<a>", "STRING(10", "INT64 INT64"],
+)
+def test_parse_bad_data_type(data_type):
+    with pytest.raises(ValueError):
+        parse_data_type(data_type)
+
+
+def test_query_rows():
+    client = mock.Mock()
+    rows = InformationSchema().query_rows(client, "some-project", "some_dataset")
+    assert rows is client.query_and_wait.return_value
+    client.query_and_wait.assert_called_once_with(
+        QUERY.format(dataset="`some-project.some_dataset`")
+    )
+
+
+def test_query_rows_without_query_and_wait():
+    # google-cloud-bigquery < 3.14
+    client = mock.Mock(spec=["query"])
+    rows = InformationSchema().query_rows(client, "some-project", "some_dataset")
+    assert rows is client.query.return_value.result.return_value
+    client.query.assert_called_once_with(
+        QUERY.format(dataset="`some-project.some_dataset`")
+    )
+
+
+def test_get_table_and_view_names(faux_conn, information_schema):
+    dialect = faux_conn.dialect
+    assert dialect.get_table_names(faux_conn) == ["t1", "empty"]
+    assert dialect.get_view_names(faux_conn) == ["v1"]
+    assert information_schema.queries == [("myproject", "mydataset")] * 2
+
+
+def test_get_columns_match_api(faux_conn, information_schema):
+    # The columns the BigQuery API would report for t1.
+    schema = [
+        SchemaField("id", "INTEGER", mode="REQUIRED"),
+        SchemaField("price", "NUMERIC", precision=10, scale=2),
+        SchemaField(
+            "person",
+            "RECORD",
+            description="a person",
+            fields=[
+                SchemaField("name", "STRING", max_length=10, description="name"),
+                SchemaField("b day", "DATE"),
+            ],
+        ),
+        SchemaField("tags", "STRING", mode="REPEATED"),
+    ]
+
+    columns = faux_conn.dialect.get_columns(faux_conn, "t1")
+    assert [column["name"] for column in columns] == [
+        "id",
+        "price",
+        "person",
+        "person.name",
+        "person.b day",
+        "tags",
+    ]
+    assert repr(columns) == repr(_types.get_columns(schema))
+
+
+def test_get_table_comment(faux_conn, information_schema):
+    dialect = faux_conn.dialect
+    assert dialect.get_table_comment(faux_conn, "empty") == dict(text='nothing "here"')
+    assert dialect.get_table_comment(faux_conn, "t1") == dict(text=None)
+    assert dialect.get_columns(faux_conn, "empty") == []
+
+
+def test_get_view_definition(faux_conn, information_schema):
+    assert faux_conn.dialect.get_view_definition(faux_conn, "v1") == "select 1 as x"
+    assert faux_conn.dialect.get_view_definition(faux_conn, "t1") is None
+
+
+def test_has_table(faux_conn, information_schema):
+    assert faux_conn.dialect.has_table(faux_conn, "t1")
+    assert not faux_conn.dialect.has_table(faux_conn, "nope")
+    assert not faux_conn.dialect.has_table(faux_conn, "t1", schema="yourdataset")
+    with pytest.raises(sqlalchemy.exc.NoSuchTableError):
+        faux_conn.dialect.get_columns(faux_conn, "nope")
+
+
+# SQLAlchemy 1.4 checks that tables exist without the inspector's info_cache.
+@sqlalchemy_2_0_or_higher
+def test_reflect_queries_dataset_once(faux_conn, information_schema):
+    metadata = sqlalchemy.MetaData()
+    metadata.reflect(faux_conn, views=True)
+    assert sorted(metadata.tables) == ["empty", "t1", "v1"]
+    assert metadata.tables["empty"].comment == 'nothing "here"'
+    assert [c.name for c in metadata.tables["v1"].columns] == ["x"]
+    assert information_schema.queries == [("myproject", "mydataset")]
+
+
+def test_dataset_not_found(faux_conn, information_schema):
+    from google.api_core.exceptions import NotFound
+
+    information_schema.query_rows = mock.Mock(side_effect=NotFound("no dataset"))
+    assert not faux_conn.dialect.has_table(faux_conn, "t1")
+    assert faux_conn.dialect.get_table_names(faux_conn) == []
+
+
+def test_reflection_source_url_parameter(faux_conn):
+    dialect = faux_conn.dialect
+    assert dialect.reflection_source == "api"
+    url = sqlalchemy.engine.make_url(
+        "bigquery://myproject/mydataset?reflection_source=information_schema"
+    )
+    with mock.patch("sqlalchemy_bigquery._helpers.create_bigquery_client"):
+        dialect.create_connect_args(url)
+    assert dialect.reflection_source == "information_schema"
@@ -0,0 +1,113 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+import decimal
+
+import sqlalchemy
+
+from .conftest import (
+    executed_statements,
+    setup_some_table,
+    setup_table,
+    sqlalchemy_2_0_or_higher,
+)
+
+# insertmanyvalues is new in SQLAlchemy 2.0.
+pytestmark = sqlalchemy_2_0_or_higher
+
+
+def _rows(n):
+    return [dict(id=i, name=f"name{i}") for i in range(n)]
+
+
+def test_rows_inserted_in_one_statement(faux_conn):
+    table = setup_some_table(faux_conn)
+    result = faux_conn.execute(table.insert(), _rows(3))
+    assert result.rowcount == 3
+    assert executed_statements(faux_conn, "INSERT") == [
+        (
+            "INSERT INTO `some_table` (`id`, `name`) VALUES"
+            " (%(id__0:INT64)s, %(name__0:STRING)s),"
+            " (%(id__1:INT64)s, %(name__1:STRING)s),"
+            " (%(id__2:INT64)s, %(name__2:STRING)s)",
+            dict(
+                id__0=0,
+                name__0="name0",
+                id__1=1,
+                name__1="name1",
+                id__2=2,
+                name__2="name2",
+            ),
+        )
+    ]
+    assert faux_conn.execute(sqlalchemy.select(table.c.id)).scalars().all() == [0, 1, 2]
+
+
+def test_batches_limited_by_query_length(faux_conn):
+    table = setup_some_table(faux_conn)
+    faux_conn.dialect.max_query_bytes = 300
+    faux_conn.execute(table.insert(), _rows(20))
+
+    inserts = executed_statements(faux_conn, "INSERT")
+    assert len(inserts) > 1
+    assert all(len(sql.encode("utf-8")) <= 300 for sql, _ in inserts)
+    # Batches are as big as they can be.
+    assert len(inserts[0][0]) > 300 - len(" (%(id__99:INT64)s, %(name__99:STRING)s),")
+    assert sum(len(parameters) for _, parameters in inserts) == 40
+    assert (
+        faux_conn.execute(
+            sqlalchemy.select(sqlalchemy.func.count()).select_from(table)
+        ).scalar()
+        == 20
+    )
+
+
+def test_batches_limited_by_parameters(faux_conn):
+    table = setup_some_table(faux_conn)
+    faux_conn.dialect.insertmanyvalues_max_parameters = 6
+    faux_conn.execute(table.insert(), _rows(7))
+    assert [
+        len(parameters) for _, parameters in executed_statements(faux_conn, "INSERT")
+    ] == [6, 6, 2]
+
+
+def test_page_size_execution_option(faux_conn):
+    table = setup_some_table(faux_conn)
+    faux_conn.execution_options(insertmanyvalues_page_size=2).execute(
+        table.insert(), _rows(5)
+    )
+    assert [
+        len(parameters) for _, parameters in executed_statements(faux_conn, "INSERT")
+    ] == [4, 4, 2]
+
+
+def test_numeric_parameters_widened_per_row(faux_conn):
+    table = setup_table(
+        faux_conn, "some_table", sqlalchemy.Column("x", sqlalchemy.Numeric)
+    )
+    faux_conn.execute(
+        table.insert(),
+        [dict(x=decimal.Decimal("1.5")), dict(x=decimal.Decimal("1." + "1" * 12))],
+    )
+    [(sql, _)] = executed_statements(faux_conn, "INSERT")
+    assert sql == (
+        "INSERT INTO `some_table` (`x`)"
+        " VALUES (%(x__0:NUMERIC)s), (%(x__1:BIGNUMERIC)s)"
+    )
@@ -0,0 +1,127 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+from unittest import mock
+
+import google.auth.credentials
+import google.cloud.bigquery
+import pytest
+import sqlalchemy
+
+from sqlalchemy_bigquery import _cursor
+from .conftest import _faux_conn, _some_table_conn
+
+
+def _query(conn, **execution_options):
+    result = conn.execute(
+        sqlalchemy.text("select id from some_table order by id").execution_options(
+            **execution_options
+        )
+    )
+    assert result.scalars().all() == [1, 2]
+    return result.context.bigquery_job_stats
+
+
+@pytest.mark.parametrize(
+    "url,engine_kwargs",
+    [
+        ("bigquery://myproject/mydataset", dict(job_creation_mode="optional")),
+        ("bigquery://myproject/mydataset?job_creation_mode=optional", {}),
+    ],
+)
+def test_job_creation_optional(url, engine_kwargs):
+    with _faux_conn(url, **engine_kwargs) as conn:
+        assert conn.dialect.job_creation_mode == "optional"
+        client = conn.connection._client
+        assert client.default_job_creation_mode == "JOB_CREATION_OPTIONAL"
+
+        job_stats = conn.execute(sqlalchemy.text("select 1")).context.bigquery_job_stats
+        assert job_stats.job_id is None
+        assert job_stats.query_id is not None
+        assert job_stats.query_path == "jobless"
+
+
+def test_jobs_created_by_default(some_table_conn):
+    assert some_table_conn.dialect.job_creation_mode is None
+    job_stats = _query(some_table_conn)
+    assert job_stats.job_id is not None
+    assert job_stats.query_path == "jobs.query"
+
+
+def test_optional_execution_option_rejected(some_table_conn):
+    # Requests get their job creation mode from the client, so statements
+    # can't opt in to running without jobs.
+    with pytest.raises(
+        sqlalchemy.exc.StatementError, match="create the engine with job_creation_mode"
+    ) as info:
+        _query(some_table_conn, bigquery_job_creation_mode="optional")
+    assert isinstance(info.value.orig, sqlalchemy.exc.ArgumentError)
+
+
+def test_job_creation_required_execution_option():
+    with _some_table_conn(job_creation_mode="optional") as conn:
+        job_stats = _query(conn, bigquery_job_creation_mode="required")
+        assert job_stats.query_path == "jobs.insert"
+        assert job_stats.job_id == f"query_job{conn.test_data['query_jobs']}"
+
+        # The client's default isn't changed.
+        client = conn.connection._client
+        assert client.default_job_creation_mode == "JOB_CREATION_OPTIONAL"
+        assert _query(conn).query_path == "jobless"
+
+
+def test_cancellable_queries_started_as_jobs():
+    with _some_table_conn(job_creation_mode="optional") as conn:
+        job_stats = _query(conn, bigquery_cancel_jobs=True)
+        assert job_stats.query_path == "jobs.insert"
+
+
+def test_invalid_job_creation_mode(some_table_conn):
+    with pytest.raises(ValueError, match="job_creation_mode must be one of"):
+        sqlalchemy.create_engine("bigquery://", job_creation_mode="sometimes")
+    with pytest.raises(
+        sqlalchemy.exc.StatementError,
+        match="bigquery_job_creation_mode can only be 'required'",
+    ):
+        _query(some_table_conn, bigquery_job_creation_mode="sometimes")
+
+
+def test_complete_first_page_makes_no_more_requests():
+    client = google.cloud.bigquery.Client(
+        project="myproject",
+        credentials=google.auth.credentials.AnonymousCredentials(),
+        default_job_creation_mode="JOB_CREATION_OPTIONAL",
+    )
+    connection = mock.Mock(_client=client)
+    response = {
+        "jobComplete": True,
+        "queryId": "query1",
+        "schema": {"fields": [{"name": "id", "type": "INTEGER"}]},
+        "rows": [{"f": [{"v": "1"}]}, {"f": [{"v": "2"}]}],
+        "totalRows": "2",
+    }
+    with mock.patch.object(
+        google.cloud.bigquery.Client, "_call_api", return_value=response
+    ) as call_api:
+        cursor = _cursor.Cursor(connection)
+        cursor.execute("select id from some_table")
+        assert [tuple(row) for row in cursor.fetchall()] == [(1,), (2,)]
+
+    (call,) = call_api.call_args_list
+    assert call.kwargs["path"] == "/projects/myproject/queries"
+    assert call.kwargs["data"]["jobCreationMode"] == "JOB_CREATION_OPTIONAL"
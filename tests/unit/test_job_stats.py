@@ -0,0 +1,154 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import datetime
+
+import google.cloud.bigquery.table
+import pytest
+import sqlalchemy
+
+from sqlalchemy_bigquery._job_stats import JobStats, from_rows
+from .conftest import setup_table, sqlalchemy_2_0_or_higher
+
+
+@pytest.fixture()
+def table(faux_conn):
+    table = setup_table(
+        faux_conn,
+        "some_table",
+        sqlalchemy.Column("id", sqlalchemy.Integer),
+        initial_data=[dict(id=1), dict(id=2)],
+    )
+    faux_conn.test_data.update(total_bytes_processed=1000, slot_millis=42)
+    return table
+
+
+def test_from_rows():
+    created = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+    rows = google.cloud.bigquery.table.RowIterator(
+        client=None,
+        api_request=None,
+        path=None,
+        schema=[],
+        first_page_response={"rows": [], "cacheHit": True},
+        job_id="job1",
+        query_id="query1",
+        project="myproject",
+        location="US",
+        total_bytes_processed=1000,
+        slot_millis=42,
+        created=created,
+    )
+    assert from_rows(rows) == JobStats(
+        job_id="job1",
+        query_id="query1",
+        project="myproject",
+        location="US",
+        total_bytes_processed=1000,
+        slot_millis=42,
+        cache_hit=True,
+        created=created,
+        started=None,
+        ended=None,
+        query_path="jobs.query",
+    )
+    assert from_rows(rows, job_started=True).query_path == "jobs.insert"
+    assert from_rows(None) is None
+
+
+def test_from_rows_without_job():
+    rows = google.cloud.bigquery.table.RowIterator(
+        client=None,
+        api_request=None,
+        path=None,
+        schema=[],
+        first_page_response={"rows": []},
+        query_id="query1",
+    )
+    job_stats = from_rows(rows)
+    assert job_stats.job_id is None
+    assert job_stats.query_id == "query1"
+    assert job_stats.query_path == "jobless"
+
+
+def test_job_stats(faux_conn, table):
+    faux_conn.test_data["cache_hit"] = True
+    result = faux_conn.execute(sqlalchemy.select(table.c.id))
+    job_stats = result.context.bigquery_job_stats
+    assert job_stats.job_id == f"job{faux_conn.test_data['jobs']}"
+    assert job_stats.total_bytes_processed == 1000
+    assert job_stats.slot_millis == 42
+    assert job_stats.cache_hit is True
+
+
+def test_job_stats_native_query_parameters(native_faux_conn):
+    table = setup_table(
+        native_faux_conn, "some_table", sqlalchemy.Column("id", sqlalchemy.Integer)
+    )
+    native_faux_conn.test_data["total_bytes_processed"] = 1000
+    result = native_faux_conn.execute(
+        sqlalchemy.select(table.c.id).where(table.c.id == 1)
+    )
+    assert result.context.bigquery_job_stats.total_bytes_processed == 1000
+
+
+def test_no_job_stats_for_dry_runs(faux_conn, table):
+    result = faux_conn.execute(
+        sqlalchemy.select(table.c.id).execution_options(bigquery_dry_run=True)
+    )
+    assert result.context.bigquery_job_stats is None
+
+
+@pytest.mark.parametrize("target", ["engine", "connection", "dialect"])
+def test_after_bigquery_job_event(faux_conn, table, target):
+    events = []
+
+    def after_bigquery_job(conn, context, job_stats):
+        events.append((conn, context, job_stats))
+
+    target = dict(
+        engine=faux_conn.engine, connection=faux_conn, dialect=faux_conn.dialect
+    )[target]
+    sqlalchemy.event.listen(target, "after_bigquery_job", after_bigquery_job)
+    result = faux_conn.execute(sqlalchemy.select(table.c.id))
+
+    ((conn, context, job_stats),) = events
+    assert conn is faux_conn
+    assert context is result.context
+    assert job_stats is result.context.bigquery_job_stats
+
+    sqlalchemy.event.remove(target, "after_bigquery_job", after_bigquery_job)
+    faux_conn.execute(sqlalchemy.select(table.c.id))
+    assert len(events) == 1
+
+
+# Batches of rows are inserted with insertmanyvalues, new in SQLAlchemy 2.0.
+@sqlalchemy_2_0_or_higher
+def test_after_bigquery_job_event_for_each_batch(faux_conn, table):
+    job_ids = []
+
+    @sqlalchemy.event.listens_for(faux_conn.engine, "after_bigquery_job")
+    def after_bigquery_job(conn, context, job_stats):
+        job_ids.append(job_stats.job_id)
+
+    faux_conn.execute(
+        table.insert().execution_options(insertmanyvalues_page_size=2),
+        [dict(id=i) for i in range(5)],
+    )
+    assert len(set(job_ids)) == 3
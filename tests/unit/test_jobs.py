@@ -0,0 +1,242 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import concurrent.futures
+from unittest import mock
+
+import google.api_core.exceptions
+import pytest
+import sqlalchemy
+
+from sqlalchemy_bigquery import _cursor
+from sqlalchemy_bigquery._jobs import RunningJobs
+from sqlalchemy_bigquery.base import _driver_connection
+from . import fauxdbi
+from .conftest import _faux_conn, wait_until
+
+
+class Job:
+    def __init__(self, state="RUNNING", cancel_error=None):
+        self.state = state
+        self.cancel_error = cancel_error
+        self.cancel_calls = 0
+
+    def done(self, reload=True):
+        return self.state == "DONE"
+
+    def cancel(self):
+        self.cancel_calls += 1
+        if self.cancel_error is not None:
+            raise self.cancel_error
+        self.state = "DONE"
+
+
+def test_job_cancelled_if_waiting_fails():
+    jobs = RunningJobs()
+    job = Job()
+    with pytest.raises(KeyboardInterrupt):
+        with jobs.waiting("conn", job):
+            assert jobs.running("conn") == [job]
+            raise KeyboardInterrupt()
+
+    assert job.cancel_calls == 1
+    assert jobs.cancelled == 1
+    assert jobs.running("conn") == []
+
+
+def test_job_not_cancelled_after_waiting():
+    jobs = RunningJobs()
+    job = Job()
+    with jobs.waiting("conn", job):
+        job.state = "DONE"
+
+    assert not jobs.cancel(job)
+    assert job.cancel_calls == 0
+    assert jobs.cancelled == 0
+
+
+def test_finished_job_not_cancelled():
+    jobs = RunningJobs()
+    job = Job("DONE")
+    with pytest.raises(ValueError):
+        with jobs.waiting("conn", job):
+            raise ValueError()
+
+    assert job.cancel_calls == 0
+    assert jobs.cancelled == 0
+
+
+def test_job_cancelled_once():
+    jobs = RunningJobs()
+    job = Job()
+    with pytest.raises(ValueError):
+        with jobs.waiting("conn", job):
+            assert jobs.cancel(job)
+            raise ValueError()
+
+    assert job.cancel_calls == 1
+    assert jobs.cancelled == 1
+
+
+def test_failed_cancellation_not_counted():
+    jobs = RunningJobs()
+    job = Job(cancel_error=google.api_core.exceptions.NotFound("gone"))
+    with jobs.waiting("conn", job):
+        assert not jobs.cancel(job)
+
+    assert jobs.cancelled == 0
+
+
+def test_cancel_connection():
+    jobs = RunningJobs()
+    job1, job2, other = Job(), Job(), Job()
+    with jobs.waiting("conn", job1), jobs.waiting("conn", job2):
+        with jobs.waiting("other", other):
+            assert jobs.cancel_connection("conn") == 2
+
+    assert (job1.cancel_calls, job2.cancel_calls, other.cancel_calls) == (1, 1, 0)
+    assert jobs.cancelled == 2
+
+
+def _raise(exc):
+    def result(self, page_size=None, timeout=None):
+        raise exc
+
+    return result
+
+
+def _blocked_until_cancelled(self, page_size=None, timeout=None):
+    wait_until(lambda: self.state == "DONE")
+    raise google.api_core.exceptions.BadRequest("Job execution was cancelled")
+
+
+def test_queries_run_as_jobs():
+    with _faux_conn(cancel_jobs=True) as conn:
+        result = conn.execute(sqlalchemy.text("select 1"))
+        assert result.all() == [(1,)]
+        assert result.context.bigquery_job.job_id == "query_job1"
+        assert result.context.bigquery_job_stats.job_id == "query_job1"
+
+        result.close()
+        assert "cancelled_jobs" not in conn.test_data
+        assert conn.dialect.running_jobs.cancelled == 0
+
+        result = conn.execute(
+            sqlalchemy.text("select 1").execution_options(bigquery_cancel_jobs=False)
+        )
+        assert result.context.bigquery_job is None
+
+
+def test_queries_run_without_jobs_by_default(some_table_conn):
+    result = some_table_conn.execute(sqlalchemy.select(sqlalchemy.literal(1)))
+    assert result.context.bigquery_job is None
+    assert "query_jobs" not in some_table_conn.test_data
+
+
+def test_timeout(some_table_conn):
+    query = sqlalchemy.text("select id from some_table").execution_options(
+        bigquery_timeout=5
+    )
+    assert len(some_table_conn.execute(query).all()) == 2
+    assert some_table_conn.test_data["job_timeouts"] == [5]
+
+    with mock.patch.object(
+        fauxdbi.QueryJob, "result", _raise(concurrent.futures.TimeoutError())
+    ):
+        with pytest.raises(
+            sqlalchemy.exc.DatabaseError,
+            match="query_job2 didn't finish within 5 seconds",
+        ):
+            some_table_conn.execute(query)
+
+    assert some_table_conn.test_data["cancelled_jobs"] == ["query_job2"]
+    assert some_table_conn.dialect.running_jobs.cancelled == 1
+
+
+def test_keyboard_interrupt_cancels_job(some_table_conn):
+    query = sqlalchemy.text("select id from some_table").execution_options(
+        bigquery_cancel_jobs=True
+    )
+    with mock.patch.object(fauxdbi.QueryJob, "result", _raise(KeyboardInterrupt())):
+        with pytest.raises(KeyboardInterrupt):
+            some_table_conn.execute(query)
+
+    assert some_table_conn.test_data["cancelled_jobs"] == ["query_job1"]
+    assert some_table_conn.dialect.running_jobs.cancelled == 1
+
+
+def test_failed_job_not_cancelled(some_table_conn):
+    def fail(self, page_size=None, timeout=None):
+        self.state = "DONE"
+        raise google.api_core.exceptions.BadRequest("Syntax error")
+
+    query = sqlalchemy.text("select id from some_table").execution_options(
+        bigquery_cancel_jobs=True
+    )
+    with mock.patch.object(fauxdbi.QueryJob, "result", fail):
+        with pytest.raises(sqlalchemy.exc.DatabaseError, match="Syntax error"):
+            some_table_conn.execute(query)
+
+    assert "cancelled_jobs" not in some_table_conn.test_data
+    assert some_table_conn.dialect.running_jobs.cancelled == 0
+
+
+def test_closing_cursor_cancels_job(some_table_conn):
+    jobs = RunningJobs()
+    cursor = _cursor.Cursor(_driver_connection(some_table_conn.connection), jobs=jobs)
+    with mock.patch.object(fauxdbi.QueryJob, "result", _blocked_until_cancelled):
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            future = executor.submit(cursor.execute, "select id from some_table")
+            wait_until(lambda: cursor.job_running)
+            cursor.close()
+            with pytest.raises(Exception, match="cancelled"):
+                future.result()
+
+    assert some_table_conn.test_data["cancelled_jobs"] == ["query_job1"]
+    assert jobs.cancelled == 1
+    assert not cursor.job_running
+
+
+def test_invalidating_connection_cancels_job(some_table_conn):
+    dialect = some_table_conn.dialect
+    connections = []
+
+    def execute():
+        with some_table_conn.engine.connect() as conn:
+            connections.append(conn)
+            conn.execute(
+                sqlalchemy.text("select id from some_table").execution_options(
+                    bigquery_cancel_jobs=True
+                )
+            )
+
+    with mock.patch.object(fauxdbi.QueryJob, "result", _blocked_until_cancelled):
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            future = executor.submit(execute)
+            wait_until(lambda: connections)
+            (conn,) = connections
+            driver_connection = _driver_connection(conn.connection)
+            wait_until(lambda: dialect.running_jobs.running(driver_connection))
+
+            # E.g. by another thread, giving up on the statement.
+            conn.invalidate()
+            with pytest.raises(sqlalchemy.exc.DBAPIError, match="cancelled"):
+                future.result()
+
+    assert some_table_conn.test_data["cancelled_jobs"] == ["query_job1"]
+    assert dialect.running_jobs.cancelled == 1
@@ -27,15 +27,23 @@ import sqlalchemy.sql.operators
 import sqlalchemy.sql.schema
 import sqlalchemy_bigquery.base
 
+from .conftest import setup_table
+
 
 def _check(raw, escaped, escape=None, autoescape=True):
     col = sqlalchemy.sql.schema.Column()
     op = col.contains(raw, escape=escape, autoescape=autoescape)
+    original_value = op.right.value
     o2 = sqlalchemy_bigquery.base.BigQueryCompiler._maybe_reescape(op)
     assert o2.left.__dict__ == op.left.__dict__
     assert not o2.modifiers.get("escape")
 
-    assert o2.right.value == escaped
+    # The values are re-escaped when bound, so the original expression,
+    # which might be reused with a cached compilation, isn't modified.
+    assert op.right.value == original_value
+    dialect = sqlalchemy_bigquery.BigQueryDialect()
+    process = o2.right.type._cached_bind_processor(dialect)
+    assert (process(o2.right.value) if process else o2.right.value) == escaped
 
 
 def test_like_autoescape_reescape():
@@ -44,3 +52,19 @@ def test_like_autoescape_reescape():
     _check("ab%cd", "ab%cd", autoescape=False)
     _check("ab%c_d", "ab\\%c\\_d", escape="\\")
     _check("ab/%c/_/d", "ab/\\%c/\\_/d")
+
+
+def test_like_reescape_w_cached_statement(faux_conn):
+    table = setup_table(
+        faux_conn,
+        "t",
+        sqlalchemy.Column("name", sqlalchemy.String),
+        initial_data=[dict(name="a%b"), dict(name="axb")],
+    )
+
+    for _ in range(2):
+        stmt = sqlalchemy.select(table.c.name).where(
+            table.c.name.contains("a%b", autoescape=True)
+        )
+        faux_conn.execute(stmt)
+        assert faux_conn.test_data["execute"][-1][1] == {"name_1": "a\\%b"}
@@ -0,0 +1,146 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+import datetime
+import decimal
+import io
+import json
+
+from google.cloud.bigquery import SourceFormat, WriteDisposition
+import pytest
+import sqlalchemy
+
+from .conftest import _faux_conn, setup_some_table, setup_table
+
+
+@pytest.fixture()
+def load_job_conn():
+    with _faux_conn(insert_strategy="load_job") as conn:
+        yield conn
+
+
+def _table(conn):
+    return setup_some_table(
+        conn,
+        sqlalchemy.Column("day", sqlalchemy.Date),
+        sqlalchemy.Column("price", sqlalchemy.Numeric),
+    )
+
+
+ROWS = [
+    dict(
+        id=i,
+        name=f"name{i}",
+        day=datetime.date(2021, 1, i + 1),
+        price=decimal.Decimal(f"{i}.5"),
+    )
+    for i in range(3)
+]
+
+
+def test_insert_with_load_job(load_job_conn):
+    table = _table(load_job_conn)
+    result = load_job_conn.execute(table.insert(), ROWS)
+    assert result.rowcount == 3
+
+    [(destination, job_config, data)] = load_job_conn.test_data["load_jobs"]
+    assert (
+        destination.path == "/projects/myproject/datasets/mydataset/tables/some_table"
+    )
+    assert job_config.source_format == SourceFormat.NEWLINE_DELIMITED_JSON
+    assert job_config.write_disposition == WriteDisposition.WRITE_APPEND
+    assert [field.name for field in job_config.schema] == ["id", "name", "day", "price"]
+    assert [json.loads(line) for line in data.splitlines()] == [
+        dict(id="0", name="name0", day="2021-01-01", price="0.5"),
+        dict(id="1", name="name1", day="2021-01-02", price="1.5"),
+        dict(id="2", name="name2", day="2021-01-03", price="2.5"),
+    ]
+
+    # No DML was run.
+    assert not any(
+        sql.startswith("INSERT") for sql, _ in load_job_conn.test_data["execute"]
+    )
+    count = sqlalchemy.select(sqlalchemy.func.count()).select_from(table)
+    assert load_job_conn.execute(count).scalar() == 3
+
+
+def test_insert_with_parquet_load_job():
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    with _faux_conn(insert_strategy="load_job", load_job_format="parquet") as conn:
+        table = _table(conn)
+        conn.execute(table.insert(), ROWS)
+
+        [(_, job_config, data)] = conn.test_data["load_jobs"]
+        assert job_config.source_format == SourceFormat.PARQUET
+        rows = pyarrow_parquet.read_table(io.BytesIO(data)).to_pylist()
+        assert rows == ROWS
+
+
+def test_insert_strategy_execution_option(faux_conn):
+    table = _table(faux_conn)
+    faux_conn.execute(table.insert(), ROWS)
+    assert "load_jobs" not in faux_conn.test_data
+
+    faux_conn.execution_options(bigquery_insert_strategy="load_job").execute(
+        table.insert(), ROWS
+    )
+    assert len(faux_conn.test_data["load_jobs"]) == 1
+    count = sqlalchemy.select(sqlalchemy.func.count()).select_from(table)
+    assert faux_conn.execute(count).scalar() == 6
+
+
+@pytest.mark.parametrize(
+    "insert",
+    [
+        # Not executemany
+        lambda table: (table.insert(), ROWS[0]),
+        # SQL expressions
+        lambda table: (
+            table.insert().values(name=sqlalchemy.func.lower("X")),
+            [dict(id=1), dict(id=2)],
+        ),
+        lambda table: (table.insert().values(ROWS),),
+    ],
+)
+def test_insert_not_loadable_runs_dml(load_job_conn, insert):
+    load_job_conn.execute(*insert(_table(load_job_conn)))
+    assert "load_jobs" not in load_job_conn.test_data
+
+
+def test_insert_strategy_keeps_column_keys(load_job_conn):
+    table = setup_table(
+        load_job_conn,
+        "some_table",
+        sqlalchemy.Column("the_id", sqlalchemy.Integer, key="id"),
+    )
+    load_job_conn.execute(table.insert(), [dict(id=1), dict(id=2)])
+    [(_, _, data)] = load_job_conn.test_data["load_jobs"]
+    assert data == b'{"the_id": "1"}\n{"the_id": "2"}\n'
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [dict(insert_strategy="nope"), dict(load_job_format="csv")],
+)
+def test_bad_insert_strategy(kwargs):
+    from sqlalchemy_bigquery import BigQueryDialect
+
+    with pytest.raises(ValueError):
+        BigQueryDialect(**kwargs)
@@ -0,0 +1,161 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+import pytest
+import sqlalchemy
+
+from sqlalchemy_bigquery import STRUCT, merge
+
+metadata = sqlalchemy.MetaData()
+target = sqlalchemy.Table(
+    "target",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer),
+    sqlalchemy.Column("name", sqlalchemy.String),
+)
+updates = sqlalchemy.Table(
+    "updates",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer),
+    sqlalchemy.Column("name", sqlalchemy.String),
+)
+rows = sqlalchemy.bindparam(
+    "rows",
+    type_=sqlalchemy.ARRAY(STRUCT(id=sqlalchemy.Integer, name=sqlalchemy.String)),
+)
+
+
+def _sql(faux_conn, stmt):
+    return stmt.compile(faux_conn).string
+
+
+def test_merge_table(faux_conn):
+    stmt = (
+        merge(target)
+        .using(updates)
+        .on(target.c.id == updates.c.id)
+        .when_matched_then_update({"name": updates.c.name})
+        .when_not_matched_then_insert({"id": updates.c.id, target.c.name: "new"})
+    )
+    assert _sql(faux_conn, stmt) == (
+        "MERGE `target` USING `updates` ON `target`.`id` = `updates`.`id`"
+        " WHEN MATCHED THEN UPDATE SET `name`=`updates`.`name`"
+        " WHEN NOT MATCHED THEN INSERT (`id`, `name`)"
+        " VALUES (`updates`.`id`, %(name_1:STRING)s)"
+    )
+    assert stmt.compile(faux_conn).params == dict(name_1="new")
+
+
+def test_merge_subquery(faux_conn):
+    stmt = merge(target).using(
+        sqlalchemy.select(updates).where(updates.c.id > 3), name="recent"
+    )
+    source = stmt.source
+    stmt = (
+        stmt.on(target.c.id == source.c.id)
+        .when_matched_then_delete(where=source.c.name.is_(None))
+        .when_matched_then_update({target.c.name: source.c.name})
+        .when_not_matched_by_source_then_delete()
+    )
+    assert _sql(faux_conn, stmt) == (
+        "MERGE `target` USING (SELECT `updates`.`id` AS `id`,"
+        " `updates`.`name` AS `name` \n"
+        "FROM `updates` \n"
+        "WHERE `updates`.`id` > %(id_1:INT64)s) AS `recent`"
+        " ON `target`.`id` = `recent`.`id`"
+        " WHEN MATCHED AND `recent`.`name` IS NULL THEN DELETE"
+        " WHEN MATCHED THEN UPDATE SET `name`=`recent`.`name`"
+        " WHEN NOT MATCHED BY SOURCE THEN DELETE"
+    )
+
+
+def test_merge_parameter(faux_conn):
+    stmt = merge(target).using(rows)
+    source = stmt.source
+    stmt = (
+        stmt.on(target.c.id == source.c.id)
+        .when_not_matched_then_insert()
+        .when_not_matched_by_source_then_update(
+            {"name": "gone"}, where=target.c.name.is_not(None)
+        )
+    )
+    assert _sql(faux_conn, stmt) == (
+        "MERGE `target`"
+        " USING unnest(%(rows:ARRAY<STRUCT<id INT64, name STRING>>)s) AS `source`"
+        " ON `target`.`id` = `source`.`id`"
+        " WHEN NOT MATCHED THEN INSERT ROW"
+        " WHEN NOT MATCHED BY SOURCE AND `target`.`name` IS NOT NULL"
+        " THEN UPDATE SET `name`=%(name_1:STRING)s"
+    )
+
+
+def test_merge_native_query_parameters(native_faux_conn):
+    stmt = merge(target).using(rows)
+    stmt = stmt.on(target.c.id == stmt.source.c.id).when_not_matched_then_insert()
+    compiled = stmt.compile(native_faux_conn)
+    assert compiled.string == (
+        "MERGE `target` USING unnest(@rows) AS `source`"
+        " ON `target`.`id` = `source`.`id` WHEN NOT MATCHED THEN INSERT ROW"
+    )
+    parameter = compiled.bigquery_parameter_factories["rows"](
+        "rows", [dict(id=1, name="a")]
+    )
+    assert parameter.to_api_repr()["parameterType"] == {
+        "type": "ARRAY",
+        "arrayType": {
+            "type": "STRUCT",
+            "structTypes": [
+                {"name": "id", "type": {"type": "INT64"}},
+                {"name": "name", "type": {"type": "STRING"}},
+            ],
+        },
+    }
+
+
+def test_merge_is_generative_and_cacheable():
+    stmt = merge(target).using(updates).on(target.c.id == updates.c.id)
+    insert = stmt.when_not_matched_then_insert()
+    delete = stmt.when_matched_then_delete()
+    assert stmt.whens == ()
+    assert insert._generate_cache_key() != delete._generate_cache_key()
+    assert (
+        stmt.when_matched_then_update({"name": "a"})._generate_cache_key()
+        == stmt.when_matched_then_update({"name": "b"})._generate_cache_key()
+    )
+
+
+@pytest.mark.parametrize(
+    "stmt",
+    [
+        merge(target).when_matched_then_delete(),
+        merge(target).using(updates).when_matched_then_delete(),
+        merge(target).using(updates).on(target.c.id == updates.c.id),
+    ],
+)
+def test_merge_incomplete(faux_conn, stmt):
+    with pytest.raises(sqlalchemy.exc.CompileError):
+        _sql(faux_conn, stmt)
+
+
+def test_merge_bad_source():
+    with pytest.raises(TypeError):
+        merge(target).using(sqlalchemy.bindparam("x", type_=sqlalchemy.Integer))
+    with pytest.raises(TypeError):
+        merge(target).using(42)
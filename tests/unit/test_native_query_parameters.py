@@ -0,0 +1,256 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import datetime
+from decimal import Decimal
+
+from google.cloud.bigquery import (
+    ArrayQueryParameter,
+    QueryJobConfig,
+    ScalarQueryParameter,
+    StructQueryParameter,
+)
+import mock
+import pytest
+import sqlalchemy
+
+from .conftest import setup_some_table, setup_table, sqlalchemy_2_0_or_higher
+
+
+def test_native_parameters_rendered_as_named_parameters(
+    native_faux_conn, native_last_query
+):
+    table = setup_some_table(
+        native_faux_conn, initial_data=[dict(id=1, name="a"), dict(id=2, name="b")]
+    )
+
+    rows = native_faux_conn.execute(
+        sqlalchemy.select(table.c.name).where(table.c.id == 2)
+    ).fetchall()
+
+    assert [tuple(row) for row in rows] == [("b",)]
+    native_last_query(
+        "SELECT `some_table`.`name` \nFROM `some_table` \n"
+        "WHERE `some_table`.`id` = @id_1",
+        [ScalarQueryParameter("id_1", "INT64", 2)],
+    )
+
+
+@sqlalchemy_2_0_or_higher
+def test_native_parameters_executemany(native_faux_conn, native_last_query):
+    table = setup_some_table(native_faux_conn)
+
+    result = native_faux_conn.execute(
+        table.insert(), [dict(id=1, name="a"), dict(id=2, name="b")]
+    )
+
+    assert result.rowcount == 2
+    sql, params = native_faux_conn.test_data["execute"][-1]
+    assert sql == (
+        "INSERT INTO `some_table` (`id`, `name`)"
+        " VALUES (@id__0, @name__0), (@id__1, @name__1)"
+    )
+    # The order of insertmanyvalues batch parameters isn't defined.
+    assert sorted(params, key=lambda param: param.name) == [
+        ScalarQueryParameter("id__0", "INT64", 1),
+        ScalarQueryParameter("id__1", "INT64", 2),
+        ScalarQueryParameter("name__0", "STRING", "a"),
+        ScalarQueryParameter("name__1", "STRING", "b"),
+    ]
+    assert sorted(
+        tuple(row) for row in native_faux_conn.execute(sqlalchemy.select(table))
+    ) == [(1, "a"), (2, "b")]
+
+
+def test_native_parameters_in_unnest(native_faux_conn, native_last_query):
+    table = setup_some_table(native_faux_conn)
+
+    native_faux_conn.execute(
+        sqlalchemy.select(table.c.name).where(table.c.id.in_([1, 2]))
+    )
+    native_last_query(
+        "SELECT `some_table`.`name` \nFROM `some_table` \n"
+        "WHERE `some_table`.`id` IN UNNEST(@id_1)",
+        [ArrayQueryParameter("id_1", "INT64", [1, 2])],
+    )
+
+
+def test_native_parameters_untyped_in(native_faux_conn, native_last_query):
+    table = setup_some_table(native_faux_conn)
+
+    native_faux_conn.execute(
+        sqlalchemy.select(table.c.name).where(
+            sqlalchemy.column("id").in_(sqlalchemy.bindparam("ids", expanding=True))
+        ),
+        dict(ids=[1, 2]),
+    )
+    native_last_query(
+        "SELECT `some_table`.`name` \nFROM `some_table` \n"
+        "WHERE `id` IN UNNEST([ @ids_1, @ids_2 ])",
+        [
+            ScalarQueryParameter("ids_1", "INT64", 1),
+            ScalarQueryParameter("ids_2", "INT64", 2),
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "value,bq_type",
+    [
+        (Decimal("1.5"), "NUMERIC"),
+        (Decimal("1." + "1" * 10), "BIGNUMERIC"),
+    ],
+)
+def test_native_parameters_numeric_type_depends_on_value(
+    native_faux_conn, native_last_query, value, bq_type
+):
+    table = setup_table(
+        native_faux_conn, "some_table", sqlalchemy.Column("x", sqlalchemy.Numeric)
+    )
+
+    native_faux_conn.execute(sqlalchemy.select(table).where(table.c.x == value))
+    native_last_query(
+        "SELECT `some_table`.`x` \nFROM `some_table` \nWHERE `some_table`.`x` = @x_1",
+        [ScalarQueryParameter("x_1", bq_type, value)],
+    )
+
+
+@pytest.mark.parametrize(
+    "values,bq_type",
+    [
+        ([Decimal("1.5"), Decimal("2")], "NUMERIC"),
+        ([Decimal("1.5"), Decimal("1." + "1" * 10)], "BIGNUMERIC"),
+        ([Decimal("1.5"), Decimal("1" * 39)], "BIGNUMERIC"),
+    ],
+)
+def test_native_parameters_numeric_array_type_depends_on_values(
+    native_faux_conn, native_last_query, values, bq_type
+):
+    table = setup_table(
+        native_faux_conn, "some_table", sqlalchemy.Column("x", sqlalchemy.Numeric)
+    )
+
+    native_faux_conn.execute(sqlalchemy.select(table).where(table.c.x.in_(values)))
+    native_last_query(
+        "SELECT `some_table`.`x` \nFROM `some_table` \n"
+        "WHERE `some_table`.`x` IN UNNEST(@x_1)",
+        [ArrayQueryParameter("x_1", bq_type, values)],
+    )
+
+
+def test_native_parameters_struct(native_faux_conn, native_last_query):
+    from sqlalchemy_bigquery import STRUCT
+
+    # sqlite can't create STRUCT columns.
+    native_faux_conn.ex("create table some_table (person)")
+    table = sqlalchemy.Table(
+        "some_table",
+        sqlalchemy.MetaData(),
+        sqlalchemy.Column(
+            "person", STRUCT(name=sqlalchemy.String, bdate=sqlalchemy.DATE)
+        ),
+    )
+
+    native_faux_conn.execute(
+        table.insert().values(person=dict(name="bob", bdate=datetime.date(2020, 1, 1)))
+    )
+    native_last_query(
+        "INSERT INTO `some_table` (`person`) VALUES (@person)",
+        [
+            StructQueryParameter(
+                "person",
+                ScalarQueryParameter("name", "STRING", "bob"),
+                ScalarQueryParameter("bdate", "DATE", datetime.date(2020, 1, 1)),
+            )
+        ],
+    )
+
+
+def test_native_parameters_names_are_identifiers(native_faux_conn):
+    table = sqlalchemy.Table(
+        "some_table",
+        sqlalchemy.MetaData(),
+        sqlalchemy.Column("some-id", sqlalchemy.Integer),
+    )
+
+    sql = str(
+        sqlalchemy.select(table)
+        .where(table.c["some-id"] == 1)
+        .compile(native_faux_conn.engine)
+    )
+    assert sql.endswith("WHERE `some_table`.`some-id` = @some_id_1")
+
+
+def test_native_parameters_dont_escape_percents(native_faux_conn):
+    table = setup_some_table(native_faux_conn)
+
+    sql = str(
+        sqlalchemy.select(sqlalchemy.literal_column("'100%'"))
+        .where(table.c.name.like("%x%"))
+        .compile(native_faux_conn.engine)
+    )
+    assert sql.startswith("SELECT '100%' ")
+
+    literal = sqlalchemy.select(sqlalchemy.literal("100%")).compile(
+        native_faux_conn.engine, compile_kwargs=dict(literal_binds=True)
+    )
+    assert str(literal) == "SELECT '100%' AS `anon_1`"
+
+
+def test_native_parameters_dont_modify_job_config(native_faux_conn):
+    table = setup_some_table(native_faux_conn)
+    job_config = QueryJobConfig(use_query_cache=False)
+
+    with mock.patch.object(
+        native_faux_conn.connection._client,
+        "query_and_wait",
+        wraps=native_faux_conn.connection._client.query_and_wait,
+    ) as query_and_wait:
+        native_faux_conn.execution_options(job_config=job_config).execute(
+            sqlalchemy.select(table).where(table.c.id == 1)
+        )
+
+    config = query_and_wait.call_args.kwargs["job_config"]
+    assert config.use_query_cache is False
+    assert config.query_parameters == [ScalarQueryParameter("id_1", "INT64", 1)]
+    assert job_config.query_parameters == []
+
+
+def test_native_parameters_use_arraysize_as_page_size(native_faux_conn):
+    table = setup_some_table(native_faux_conn)
+    native_faux_conn.execute(sqlalchemy.select(table))
+    assert native_faux_conn.test_data["page_size"] == 5000
+
+
+def test_native_parameters_not_used_by_default(faux_conn):
+    table = setup_some_table(faux_conn)
+    sql = str(sqlalchemy.select(table).where(table.c.id == 1).compile(faux_conn.engine))
+    assert sql.endswith("WHERE `some_table`.`id` = %(id_1:INT64)s")
+
+
+def test_native_parameters_ddl_doesnt_escape_percents(native_faux_conn):
+    table = sqlalchemy.Table(
+        "some_table",
+        sqlalchemy.MetaData(),
+        sqlalchemy.Column("x", sqlalchemy.Integer, comment="100%"),
+        comment="50%",
+    )
+    sql = str(sqlalchemy.schema.CreateTable(table).compile(native_faux_conn.engine))
+    assert "OPTIONS(description='100%')" in sql
+    assert "OPTIONS(description='50%')" in sql
@@ -52,6 +52,10 @@ def url_with_everything():
         "&location=some-location"
         "&arraysize=1000"
         "&list_tables_page_size=5000"
+        "&reflection_source=information_schema"
+        "&job_creation_mode=optional"
+        "&http_pool_connections=4"
+        "&http_pool_maxsize=64"
         "&clustering_fields=a,b,c"
         "&create_disposition=CREATE_IF_NEEDED"
         "&destination=different-project.different-dataset.table"
@@ -77,6 +81,10 @@ def test_basic(url_with_everything):
         credentials_base64,
         job_config,
         list_tables_page_size,
+        reflection_source,
+        job_creation_mode,
+        http_pool_connections,
+        http_pool_maxsize,
         user_supplied_client,
     ) = parse_url(url_with_everything)
 
@@ -85,6 +93,10 @@ def test_basic(url_with_everything):
     assert dataset_id == "some-dataset"
     assert arraysize == 1000
     assert list_tables_page_size == 5000
+    assert reflection_source == "information_schema"
+    assert job_creation_mode == "optional"
+    assert http_pool_connections == 4
+    assert http_pool_maxsize == 64
     assert credentials_path == "/some/path/to.json"
     assert credentials_base64 == "eyJrZXkiOiJ2YWx1ZSJ9Cg=="
     assert isinstance(job_config, QueryJobConfig)
@@ -146,6 +158,14 @@ def test_all_values(url_with_everything, param, value, default):
     [
         ("arraysize", "not-int"),
         ("list_tables_page_size", "not-int"),
+        ("reflection_source", "not-a-source"),
+        ("job_creation_mode", "not-a-mode"),
+        ("http_pool_connections", "not-int"),
+        ("http_pool_connections", "0"),
+        ("http_pool_connections", "-1"),
+        ("http_pool_maxsize", "not-int"),
+        ("http_pool_maxsize", "0"),
+        ("http_pool_maxsize", "-1"),
         ("create_disposition", "not-attribute"),
         ("destination", "not.fully-qualified"),
         ("dry_run", "not-bool"),
@@ -190,6 +210,10 @@ def test_empty_with_non_config():
         credentials_base64,
         job_config,
         list_tables_page_size,
+        reflection_source,
+        job_creation_mode,
+        http_pool_connections,
+        http_pool_maxsize,
         user_supplied_credentials,
     ) = url
 
@@ -201,6 +225,10 @@ def test_empty_with_non_config():
     assert credentials_base64 is None
     assert job_config is None
     assert list_tables_page_size is None
+    assert reflection_source is None
+    assert job_creation_mode is None
+    assert http_pool_connections is None
+    assert http_pool_maxsize is None
     assert not user_supplied_credentials
 
 
@@ -215,6 +243,10 @@ def test_only_dataset():
         credentials_base64,
         job_config,
         list_tables_page_size,
+        reflection_source,
+        job_creation_mode,
+        http_pool_connections,
+        http_pool_maxsize,
         user_supplied_credentials,
     ) = url
 
@@ -225,6 +257,10 @@ def test_only_dataset():
     assert credentials_path is None
     assert credentials_base64 is None
     assert list_tables_page_size is None
+    assert reflection_source is None
+    assert job_creation_mode is None
+    assert http_pool_connections is None
+    assert http_pool_maxsize is None
     assert isinstance(job_config, QueryJobConfig)
     assert not user_supplied_credentials
     # we can't actually test that the dataset is on the job_config,
@@ -0,0 +1,166 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import google.api_core.exceptions
+import google.auth.exceptions
+import pytest
+import requests.exceptions
+
+from sqlalchemy_bigquery._ping import Pinger
+from sqlalchemy_bigquery.base import _driver_connection
+from .conftest import _faux_conn
+
+
+class Client:
+    def __init__(self, error=None, credentials=None):
+        self.error = error
+        self._credentials = credentials
+        self.requests = []
+
+    def get_dataset(self, dataset_ref, retry=None, timeout=None):
+        self.requests.append((dataset_ref, retry, timeout))
+        if self.error is not None:
+            raise self.error
+
+
+class Credentials:
+    def __init__(self, valid, error=None):
+        self.valid = valid
+        self.error = error
+        self.refreshed = 0
+
+    def refresh(self, request):
+        self.refreshed += 1
+        if self.error is not None:
+            raise self.error
+        self.valid = True
+
+
+def test_ping_gets_dataset():
+    client = Client()
+    assert Pinger(60, timeout=5).ping(client, "myproject.mydataset")
+    assert client.requests == [("myproject.mydataset", None, 5)]
+
+
+def test_ping_skipped_within_interval(timer):
+    pinger = Pinger(60, timer=timer)
+    client = Client()
+    assert pinger.ping(client, "myproject.mydataset")
+    timer.now = 59
+    assert pinger.ping(client, "myproject.mydataset")
+    assert len(client.requests) == 1
+    timer.now = 60
+    assert pinger.ping(client, "myproject.mydataset")
+    assert len(client.requests) == 2
+
+
+def test_clients_pinged_separately():
+    pinger = Pinger(60)
+    clients = Client(), Client()
+    for client in clients:
+        assert pinger.ping(client, "myproject.mydataset")
+        assert len(client.requests) == 1
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        google.auth.exceptions.RefreshError("token expired"),
+        google.api_core.exceptions.Unauthorized("bad credentials"),
+        requests.exceptions.ConnectionError("no route to host"),
+    ],
+)
+def test_ping_fails_if_client_cant_make_requests(error):
+    pinger = Pinger(60)
+    client = Client(error)
+    assert not pinger.ping(client, "myproject.mydataset")
+    assert not pinger.ping(client, "myproject.mydataset")
+    assert len(client.requests) == 2
+
+
+def test_ping_succeeds_if_bigquery_responds():
+    client = Client(google.api_core.exceptions.NotFound("no such dataset"))
+    assert Pinger(60).ping(client, "myproject.mydataset")
+
+
+def test_ping_without_dataset_checks_credentials():
+    credentials = Credentials(valid=True)
+    client = Client(credentials=credentials)
+    assert Pinger(0).ping(client)
+    assert credentials.refreshed == 0
+    assert client.requests == []
+
+
+def test_ping_without_dataset_refreshes_expired_credentials():
+    credentials = Credentials(valid=False)
+    assert Pinger(0).ping(Client(credentials=credentials))
+    assert credentials.refreshed == 1
+
+
+def test_ping_fails_if_credentials_cant_be_refreshed():
+    credentials = Credentials(
+        valid=False, error=google.auth.exceptions.RefreshError("revoked")
+    )
+    assert not Pinger(0).ping(Client(credentials=credentials))
+
+
+def test_ping_interval_must_not_be_negative():
+    with pytest.raises(ValueError, match="ping_interval"):
+        with _faux_conn(ping_interval=-1):
+            pass
+
+
+def _reconnect(conn):
+    conn.close()
+    return conn.engine.connect()
+
+
+def test_pre_ping_gets_dataset_without_query():
+    with _faux_conn(pool_pre_ping=True) as conn:
+        executed = len(conn.test_data["execute"])
+        with _reconnect(conn):
+            pass
+        assert conn.test_data["get_dataset"] == [("myproject.mydataset", None, 10)]
+        assert len(conn.test_data["execute"]) == executed
+        assert "query_jobs" not in conn.test_data
+
+
+def test_pre_ping_interval():
+    with _faux_conn(pool_pre_ping=True) as conn:
+        for _ in range(3):
+            with _reconnect(conn):
+                pass
+        assert len(conn.test_data["get_dataset"]) == 1
+
+
+def test_pre_ping_every_checkout():
+    with _faux_conn(pool_pre_ping=True, ping_interval=0) as conn:
+        for _ in range(3):
+            with _reconnect(conn):
+                pass
+        assert len(conn.test_data["get_dataset"]) == 3
+
+
+def test_pre_ping_failure_reconnects():
+    with _faux_conn(pool_pre_ping=True) as conn:
+        dbapi_connection = _driver_connection(conn.connection)
+        conn.test_data["ping_error"] = google.auth.exceptions.RefreshError("revoked")
+        with _reconnect(conn) as reconnected:
+            assert _driver_connection(reconnected.connection) is not dbapi_connection
+            assert len(conn.test_data["get_dataset"]) == 1
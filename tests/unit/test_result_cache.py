@@ -0,0 +1,160 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import pytest
+import sqlalchemy
+
+from sqlalchemy_bigquery._result_cache import ResultCache, snapshot
+from .conftest import _faux_conn, executed_selects, setup_some_table
+
+ROWS = [dict(id=1, name="a"), dict(id=2, name="b")]
+
+
+@pytest.fixture()
+def table(faux_conn):
+    return setup_some_table(faux_conn, initial_data=ROWS)
+
+
+def _names(conn, table, **kw):
+    result = conn.execute(
+        sqlalchemy.select(table.c.name)
+        .where(table.c.id >= kw.pop("min_id", 1))
+        .order_by(table.c.id)
+        .execution_options(bigquery_result_cache=True, **kw)
+    )
+    return result.scalars().all(), result.context.bigquery_result_cache_hit
+
+
+def test_results_cached(faux_conn, table):
+    assert _names(faux_conn, table) == (["a", "b"], False)
+    assert _names(faux_conn, table) == (["a", "b"], True)
+    assert len(executed_selects(faux_conn)) == 1
+    cache = faux_conn.dialect.result_cache.cache
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_results_not_cached_without_option(faux_conn, table):
+    for _ in range(2):
+        faux_conn.execute(sqlalchemy.select(table.c.name)).all()
+    assert len(executed_selects(faux_conn)) == 2
+    assert len(faux_conn.dialect.result_cache.cache) == 0
+
+
+def test_results_cached_by_parameters(faux_conn, table):
+    assert _names(faux_conn, table, min_id=1) == (["a", "b"], False)
+    assert _names(faux_conn, table, min_id=2) == (["b"], False)
+    assert _names(faux_conn, table, min_id=2) == (["b"], True)
+
+
+def test_results_cached_with_native_query_parameters(native_faux_conn):
+    table = setup_some_table(native_faux_conn, initial_data=ROWS)
+    assert _names(native_faux_conn, table) == (["a", "b"], False)
+    assert _names(native_faux_conn, table) == (["a", "b"], True)
+
+
+def test_results_expire(faux_conn, table):
+    cache = faux_conn.dialect.result_cache.cache
+    cache.timer = lambda: 0
+    _names(faux_conn, table)
+    cache.timer = lambda: 60
+    assert _names(faux_conn, table) == (["a", "b"], False)
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda conn, table: conn.execute(table.insert(), dict(id=3, name="c")),
+        lambda conn, table: conn.execute(table.update().values(name="c")),
+        lambda conn, table: conn.execute(table.delete().where(table.c.id == 1)),
+        lambda conn, table: conn.exec_driver_sql("delete from `some_table`"),
+        lambda conn, table: conn.execute(
+            sqlalchemy.text("update `some_table` set name = 'c'")
+        ),
+        lambda conn, table: table.drop(conn),
+    ],
+)
+def test_results_invalidated_by_changes(faux_conn, table, change):
+    _names(faux_conn, table)
+    change(faux_conn, table)
+    assert len(faux_conn.dialect.result_cache.cache) == 0
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        lambda conn, table: conn.execute(sqlalchemy.select(table.c.id)),
+        lambda conn, table: conn.exec_driver_sql("select * from `some_table`"),
+        lambda conn, table: conn.execute(sqlalchemy.text("-- comment\nselect 1;")),
+    ],
+)
+def test_results_not_invalidated_by_queries(faux_conn, table, query):
+    _names(faux_conn, table)
+    query(faux_conn, table).all()
+    assert _names(faux_conn, table) == (["a", "b"], True)
+
+
+def test_results_not_invalidated_by_changes_to_other_tables(faux_conn, table):
+    other_table = setup_some_table(faux_conn, name="other_table", initial_data=ROWS)
+    _names(faux_conn, table)
+    faux_conn.execute(other_table.delete())
+    assert _names(faux_conn, table) == (["a", "b"], True)
+    faux_conn.execute(table.delete())
+    assert _names(faux_conn, table) == ([], False)
+
+
+def test_textual_results_invalidated_by_any_change(faux_conn, table):
+    other_table = setup_some_table(faux_conn, name="other_table", initial_data=ROWS)
+    query = sqlalchemy.text("select name from `some_table`").execution_options(
+        bigquery_result_cache=True
+    )
+    faux_conn.execute(query).all()
+    assert faux_conn.execute(query).context.bigquery_result_cache_hit
+    faux_conn.execute(other_table.delete())
+    assert not faux_conn.execute(query).context.bigquery_result_cache_hit
+
+
+def test_result_cache_max_bytes():
+    with _faux_conn(result_cache_max_bytes=100) as conn:
+        table = setup_some_table(conn, initial_data=ROWS)
+        _names(conn, table)
+        assert _names(conn, table) == (["a", "b"], False)
+
+
+def test_result_cache_disabled():
+    with _faux_conn(result_cache_ttl=0) as conn:
+        table = setup_some_table(conn, initial_data=ROWS)
+        _names(conn, table)
+        assert _names(conn, table) == (["a", "b"], False)
+
+
+def test_mutable_values_copied():
+    rows = [([1, 2],)]
+    cache = ResultCache(10, 10, 10000)
+    cache.set("key", snapshot(None, 1, rows, None), cache.generation)
+    rows[0][0].append(3)
+    cache.get("key").rows[0][0].append(3)
+    assert cache.get("key").rows == (([1, 2],),)
+
+
+def test_results_of_queries_run_before_invalidation_not_cached():
+    cache = ResultCache(10, 10, 10000)
+    generation = cache.generation
+    cache.invalidate(["myproject.mydataset.some_table"])
+    cache.set("key", snapshot(None, 1, [(1,)], None), generation)
+    assert cache.get("key") is None
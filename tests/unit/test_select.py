@@ -20,8 +20,10 @@
 import datetime
 from decimal import Decimal
 
+import mock
 import pytest
 import sqlalchemy
+import sqlalchemy.engine.default
 from sqlalchemy import not_
 
 import sqlalchemy_bigquery
@@ -306,6 +308,69 @@ def test_disable_quote(faux_conn):
     assert faux_conn.test_data["execute"][-1][0] == ("SELECT `t`.foo \nFROM `t`")
 
 
+@pytest.mark.parametrize(
+    "val,ptype",
+    [
+        (Decimal("4.25"), "NUMERIC"),
+        (Decimal("4.2500000001"), "BIGNUMERIC"),
+        (Decimal("1" * 39), "BIGNUMERIC"),
+    ],
+)
+def test_numeric_parameter_type_depends_on_value(faux_conn, last_query, val, ptype):
+    type_ = sqlalchemy.Numeric()
+    faux_conn.execute(sqlalchemy.select(sqlalchemy.literal(val, type_)))
+    last_query(f"SELECT %(param_1:{ptype})s AS `anon_1`", {"param_1": val})
+
+    # The type isn't modified, so the statement can be reused.
+    assert type_.precision is None and type_.scale is None
+
+
+def test_cached_numeric_parameter_type_depends_on_value(faux_conn, last_query):
+    table = setup_table(faux_conn, "t", sqlalchemy.Column("n", sqlalchemy.Numeric))
+
+    def select(val):
+        return sqlalchemy.select(table.c.n).where(table.c.n == val)
+
+    faux_conn.execute(select(Decimal("4.25")))
+    last_query(
+        "SELECT `t`.`n` \nFROM `t` \nWHERE `t`.`n` = %(n_1:NUMERIC)s",
+        {"n_1": Decimal("4.25")},
+    )
+
+    result = faux_conn.execute(select(Decimal("4.2500000001")))
+    assert result.context.cache_hit == sqlalchemy.engine.default.CACHE_HIT
+    last_query(
+        "SELECT `t`.`n` \nFROM `t` \nWHERE `t`.`n` = %(n_1:BIGNUMERIC)s",
+        {"n_1": Decimal("4.2500000001")},
+    )
+
+
+def test_statement_is_compiled_once(faux_conn):
+    table = setup_table(
+        faux_conn,
+        "t",
+        sqlalchemy.Column("id", sqlalchemy.Integer),
+        initial_data=[dict(id=1), dict(id=2)],
+    )
+
+    compile = sqlalchemy_bigquery.base.BigQueryCompiler.__init__
+    with mock.patch.object(
+        sqlalchemy_bigquery.base.BigQueryCompiler,
+        "__init__",
+        autospec=True,
+        side_effect=compile,
+    ) as compiler:
+        results = [
+            list(
+                faux_conn.execute(sqlalchemy.select(table.c.id).where(table.c.id == i))
+            )
+            for i in (1, 2)
+        ]
+
+    assert results == [[(1,)], [(2,)]]
+    assert compiler.call_count == 1
+
+
 def test_select_in_lit(faux_conn, last_query):
     faux_conn.execute(sqlalchemy.select(sqlalchemy.literal(1).in_([1, 2, 3])))
     last_query(
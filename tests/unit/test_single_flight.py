@@ -0,0 +1,171 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import concurrent.futures
+import threading
+from unittest import mock
+
+import pytest
+import sqlalchemy
+
+from sqlalchemy_bigquery._single_flight import SingleFlight
+from . import fauxdbi
+from .conftest import _some_table_conn, executed_statements, wait_until
+
+
+def test_identical_calls_coalesced():
+    single_flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(10)
+        return "result"
+
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(single_flight.call, "key", fn) for _ in range(4)]
+        wait_until(lambda: single_flight.coalesced == 3)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert sorted(results) == [("result", False)] + [("result", True)] * 3
+
+    # Calls made after the first finished aren't coalesced with it.
+    assert single_flight.call("key", lambda: "again") == ("again", False)
+
+
+def test_different_calls_not_coalesced():
+    single_flight = SingleFlight()
+    assert single_flight.call("a", lambda: 1) == (1, False)
+    assert single_flight.call("b", lambda: 2) == (2, False)
+    assert single_flight.coalesced == 0
+
+
+def test_errors_shared():
+    single_flight = SingleFlight()
+    release = threading.Event()
+
+    def fn():
+        release.wait(10)
+        raise ValueError("nope")
+
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        futures = [executor.submit(single_flight.call, "key", fn) for _ in range(2)]
+        wait_until(lambda: single_flight.coalesced == 1)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError, match="nope"):
+                future.result()
+
+
+def test_interrupted_calls_made_again():
+    single_flight = SingleFlight()
+    release = threading.Event()
+
+    def interrupted():
+        release.wait(10)
+        raise KeyboardInterrupt()
+
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(single_flight.call, "key", interrupted)
+        wait_until(lambda: "key" in single_flight._calls)
+        follower = executor.submit(single_flight.call, "key", lambda: "result")
+        wait_until(lambda: single_flight.coalesced == 1)
+        release.set()
+        with pytest.raises(KeyboardInterrupt):
+            leader.result()
+        assert follower.result() == ("result", False)
+
+
+@pytest.fixture()
+def faux_conn():
+    with _some_table_conn(coalesce_queries=True) as conn:
+        yield conn
+
+
+def _execute_concurrently(engine, statements):
+    """Execute statements at the same time, on different connections
+
+    Queries are held until all but one of the statements are waiting for
+    identical queries.
+    """
+    single_flight = engine.dialect.single_flight
+    query_and_wait = fauxdbi.FauxClient.query_and_wait
+
+    def blocked_query_and_wait(*args, **kwargs):
+        wait_until(lambda: single_flight.coalesced >= len(statements) - 1)
+        return query_and_wait(*args, **kwargs)
+
+    def execute(statement):
+        with engine.connect() as conn:
+            result = conn.execute(statement)
+            return [list(row) for row in result], result.context.bigquery_coalesced
+
+    with mock.patch.object(
+        fauxdbi.FauxClient, "query_and_wait", blocked_query_and_wait
+    ):
+        with concurrent.futures.ThreadPoolExecutor(len(statements)) as executor:
+            return list(executor.map(execute, statements))
+
+
+def test_identical_queries_share_a_job(faux_conn):
+    query = sqlalchemy.text("select tags from some_table order by id")
+    results = _execute_concurrently(faux_conn.engine, [query] * 4)
+
+    assert len(executed_statements(faux_conn, "select")) == 1
+    assert sorted(coalesced for _, coalesced in results) == [False, True, True, True]
+    assert [rows for rows, _ in results] == [[[["a"]], [["b"]]]] * 4
+
+    # Each execution has its own copy of the results.
+    assert len({id(rows[0][0]) for rows, _ in results}) == 4
+
+
+def test_different_queries_not_coalesced(faux_conn):
+    def execute(id):
+        with faux_conn.engine.connect() as conn:
+            return conn.execute(
+                sqlalchemy.text("select tags from some_table where id = :id"),
+                dict(id=id),
+            ).all()
+
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        assert list(executor.map(execute, [1, 2])) == [[(["a"],)], [(["b"],)]]
+    assert faux_conn.engine.dialect.single_flight.coalesced == 0
+    assert len(executed_statements(faux_conn, "select")) == 2
+
+
+def test_dml_not_coalesced(faux_conn):
+    assert not faux_conn.execute(
+        sqlalchemy.text("delete from some_table where id = 1")
+    ).context.bigquery_coalesced
+    assert (
+        faux_conn.execute(sqlalchemy.text("select count(*) from some_table")).scalar()
+        == 1
+    )
+
+
+def test_coalescing_disabled_with_execution_option(faux_conn):
+    result = faux_conn.execute(
+        sqlalchemy.text("select id from some_table").execution_options(
+            bigquery_coalesce_queries=False
+        )
+    )
+    assert not faux_conn.dialect._is_client_cursor(result.context.cursor)
@@ -4,6 +4,9 @@
 # license that can be found in the LICENSE file or at
 # https://opensource.org/licenses/MIT.
 
+import re
+import threading
+import time
 from unittest import mock
 
 import google.api_core.exceptions
@@ -145,25 +148,151 @@ def test_get_view_names(
     assert list(sorted(view_names)) == list(sorted(expected))
 
 
+def test_get_table_names_with_schema_skips_listing_datasets(
+    engine_under_test, mock_bigquery_client
+):
+    mock_bigquery_client.project = "some-project-id"
+    mock_bigquery_client.list_tables.return_value = [
+        table_item("dataset_2", "d2t1"),
+        table_item("dataset_2", "d2view", type_="VIEW"),
+    ]
+    inspector = sqlalchemy.inspect(engine_under_test)
+    assert inspector.get_table_names(schema="dataset_2") == ["dataset_2.d2t1"]
+    assert inspector.get_view_names(schema="other-project.dataset_2") == [
+        "dataset_2.d2view"
+    ]
+    mock_bigquery_client.list_datasets.assert_not_called()
+    assert [
+        call.args[0] for call in mock_bigquery_client.list_tables.call_args_list
+    ] == [
+        bigquery.DatasetReference("some-project-id", "dataset_2"),
+        bigquery.DatasetReference("other-project", "dataset_2"),
+    ]
+
+
+def test_get_table_names_lists_datasets_concurrently(
+    engine_under_test, mock_bigquery_client
+):
+    dataset_ids = [f"dataset_{i}" for i in range(10)]
+    mock_bigquery_client.list_datasets.return_value = [
+        dataset_item(dataset_id) for dataset_id in dataset_ids
+    ]
+    running = []
+    max_at_once = 0
+    lock = threading.Lock()
+
+    def list_tables(dataset_ref, page_size):
+        nonlocal max_at_once
+        with lock:
+            running.append(dataset_ref)
+            max_at_once = max(max_at_once, len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(dataset_ref)
+        return [table_item(dataset_ref.dataset_id, "t")]
+
+    mock_bigquery_client.list_tables.side_effect = list_tables
+    engine_under_test.dialect.reflection_max_workers = 3
+    table_names = sqlalchemy.inspect(engine_under_test).get_table_names()
+    assert table_names == [f"{dataset_id}.t" for dataset_id in dataset_ids]
+    assert max_at_once == 3
+
+
+def test_iter_table_names(engine_under_test, mock_bigquery_client):
+    mock_bigquery_client.list_datasets.return_value = [
+        dataset_item(f"dataset_{i}") for i in range(10)
+    ]
+    mock_bigquery_client.list_tables.side_effect = lambda dataset_ref, page_size: [
+        table_item(dataset_ref.dataset_id, "t1"),
+        table_item(dataset_ref.dataset_id, "v1", type_="VIEW"),
+    ]
+    dialect = engine_under_test.dialect
+    dialect.reflection_max_workers = 2
+    with engine_under_test.connect() as conn:
+        table_names = dialect.iter_table_names(conn)
+        assert next(table_names) == "dataset_0.t1"
+        assert next(table_names) == "dataset_1.t1"
+        table_names.close()
+        assert mock_bigquery_client.list_tables.call_count < 10
+
+        assert list(dialect.iter_view_names(conn)) == [
+            f"dataset_{i}.v1" for i in range(10)
+        ]
+
+
 @pytest.mark.parametrize(
-    "inp, outp",
+    "op, values, sql, params",
     [
-        ("(NULL IN UNNEST([ NULL) AND (1 != 1 ]))", "(NULL IN(NULL) AND (1 != 1))"),
         (
-            "(NULL IN UNNEST([ NULL) AND (1 != 1:INT64 ]))",
-            "(NULL IN(NULL) AND (1 != 1))",
+            "in_",
+            [],
+            "SELECT `t`.`x` \nFROM `t` \nWHERE `x` IN UNNEST([  ])",
+            {},
         ),
         (
-            "(NULL IN UNNEST([ (NULL, NULL)) AND (1 != 1:INT64 ]))",
-            "(NULL IN((NULL, NULL)) AND (1 != 1))",
+            "not_in",
+            [],
+            "SELECT `t`.`x` \nFROM `t` \nWHERE (`x` NOT IN UNNEST([  ]))",
+            {},
+        ),
+        (
+            "in_",
+            [1, 2],
+            "SELECT `t`.`x` \nFROM `t` \nWHERE `x` IN UNNEST([ %(q_1)s, %(q_2)s ])",
+            {"q_1": 1, "q_2": 2},
+        ),
+        (
+            "not_in",
+            [1],
+            "SELECT `t`.`x` \nFROM `t` \nWHERE (`x` NOT IN UNNEST([ %(q_1)s ]))",
+            {"q_1": 1},
         ),
     ],
 )
-def test__remove_type_from_empty_in(inp, outp):
-    from sqlalchemy_bigquery.base import BigQueryExecutionContext
+def test_expanding_in_rendered_by_compiler(
+    faux_conn, last_query, op, values, sql, params
+):
+    # An untyped column, so the parameter is left for SQLAlchemy to expand.
+    table = setup_table(faux_conn, "t", sqlalchemy.Column("x", sqlalchemy.Integer))
+    q = sqlalchemy.bindparam("q", expanding=True)
+    faux_conn.execute(
+        sqlalchemy.select(table.c.x).where(getattr(sqlalchemy.column("x"), op)(q)),
+        dict(q=values),
+    )
+    last_query(sql, params)
+
+
+def test_expanding_in_compiled_to_string(faux_conn):
+    x = sqlalchemy.column("x")
+    q = sqlalchemy.bindparam(
+        "q", [1, 2], expanding=True, type_=sqlalchemy.types.NullType()
+    )
+    stmt = sqlalchemy.select(x).where(x.in_(q))
+
+    # The placeholder is shown where the parameters get expanded.
+    sql = str(stmt.compile(faux_conn.engine))
+    assert re.fullmatch(
+        r"SELECT `x` \nWHERE `x` IN UNNEST\(\[ (__)?\[POSTCOMPILE_q\] \]\)", sql
+    )
+
+    sql = str(
+        stmt.compile(faux_conn.engine, compile_kwargs=dict(render_postcompile=True))
+    )
+    assert sql == "SELECT `x` \nWHERE `x` IN UNNEST([ %(q_1)s, %(q_2)s ])"
+
+
+def test_pre_exec_leaves_statement_alone(faux_conn):
+    table = setup_table(
+        faux_conn,
+        "t",
+        *[sqlalchemy.Column(f"c{i}", sqlalchemy.Integer) for i in range(100)],
+    )
+    result = faux_conn.execute(
+        sqlalchemy.select(table).where(table.c.c0.in_([1, 2, 3]))
+    )
 
-    r = BigQueryExecutionContext._BigQueryExecutionContext__remove_type_from_empty_in
-    assert r(None, inp) == outp
+    # No per-execution rewriting, so no work that grows with the statement.
+    assert result.context.statement is result.context.compiled.string
 
 
 def test_multi_value_insert(faux_conn, last_query):
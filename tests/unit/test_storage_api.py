@@ -0,0 +1,154 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from google.cloud.bigquery import ScalarQueryParameter
+import mock
+import pytest
+import sqlalchemy
+
+from .conftest import setup_some_table, setup_table
+
+pyarrow = pytest.importorskip("pyarrow")
+
+from sqlalchemy_bigquery._cursor import StorageApiFetcher  # noqa: E402
+
+
+class FakeStorageApiFetcher(StorageApiFetcher):
+    """Returns results as Arrow record batches of 2 rows"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def record_batches(self, rows, connection):
+        self.calls += 1
+        names = [field.name for field in rows.schema]
+        data = list(rows)
+        for i in range(0, len(data), 2):
+            yield pyarrow.RecordBatch.from_pylist(
+                [dict(zip(names, row)) for row in data[i : i + 2]]
+            )
+
+
+@pytest.fixture()
+def fetcher(faux_conn):
+    fetcher = faux_conn.dialect.storage_api_fetcher = FakeStorageApiFetcher()
+    return fetcher
+
+
+@pytest.fixture()
+def table(faux_conn):
+    return setup_some_table(
+        faux_conn, initial_data=[dict(id=i, name=f"name{i}") for i in range(5)]
+    )
+
+
+def _execute(faux_conn, stmt):
+    return faux_conn.execution_options(bigquery_use_storage_api=True).execute(stmt)
+
+
+def test_storage_api_rows(faux_conn, fetcher, table):
+    result = _execute(faux_conn, sqlalchemy.select(table).order_by(table.c.id))
+    assert [tuple(row) for row in result] == [(i, f"name{i}") for i in range(5)]
+    assert result.keys() == ["id", "name"]
+    assert fetcher.calls == 1
+
+
+def test_storage_api_partitions(faux_conn, fetcher, table):
+    result = _execute(faux_conn, sqlalchemy.select(table.c.id).order_by(table.c.id))
+    assert [[tuple(row) for row in p] for p in result.partitions(2)] == [
+        [(0,), (1,)],
+        [(2,), (3,)],
+        [(4,)],
+    ]
+
+
+def test_storage_api_record_batches(faux_conn, fetcher, table):
+    result = _execute(faux_conn, sqlalchemy.select(table).order_by(table.c.id))
+    batches = list(result.context.record_batches())
+    assert [batch.num_rows for batch in batches] == [2, 2, 1]
+    assert batches[0].to_pydict() == dict(id=[0, 1], name=["name0", "name1"])
+
+
+def test_storage_api_record_batches_after_fetching_rows(faux_conn, fetcher, table):
+    from google.cloud.bigquery.dbapi import InterfaceError
+
+    result = _execute(faux_conn, sqlalchemy.select(table))
+    result.fetchone()
+    with pytest.raises(InterfaceError):
+        result.context.record_batches()
+
+
+def test_storage_api_with_parameters(faux_conn, last_query, fetcher, table):
+    result = _execute(
+        faux_conn,
+        sqlalchemy.select(table.c.name).where(table.c.id == 3),
+    )
+    assert [tuple(row) for row in result] == [("name3",)]
+    last_query(
+        "SELECT `some_table`.`name` \nFROM `some_table` \n"
+        "WHERE `some_table`.`id` = @`id_1`",
+        [ScalarQueryParameter("id_1", "INT64", 3)],
+    )
+
+
+def test_storage_api_with_native_query_parameters(native_faux_conn):
+    fetcher = native_faux_conn.dialect.storage_api_fetcher = FakeStorageApiFetcher()
+    table = setup_table(
+        native_faux_conn,
+        "some_table",
+        sqlalchemy.Column("id", sqlalchemy.Integer),
+        initial_data=[dict(id=1), dict(id=2)],
+    )
+
+    result = _execute(native_faux_conn, sqlalchemy.select(table).where(table.c.id > 1))
+    assert [tuple(row) for row in result] == [(2,)]
+    assert fetcher.calls == 1
+
+
+def test_record_batches_without_storage_api(faux_conn, table):
+    result = faux_conn.execute(sqlalchemy.select(table))
+    with pytest.raises(NotImplementedError):
+        result.context.record_batches()
+
+
+def test_record_batches_with_native_query_parameters(native_faux_conn):
+    table = setup_table(
+        native_faux_conn,
+        "some_table",
+        sqlalchemy.Column("id", sqlalchemy.Integer),
+        initial_data=[dict(id=1), dict(id=2)],
+    )
+
+    result = native_faux_conn.execute(sqlalchemy.select(table))
+    batches = list(result.context.record_batches())
+    assert [batch.to_pydict() for batch in batches] == [dict(id=[1, 2])]
+
+
+def test_storage_api_fetcher_uses_bqstorage_client():
+    rows = mock.Mock()
+    rows.to_arrow_iterable.return_value = iter(
+        [pyarrow.RecordBatch.from_pydict(dict(x=[1, 2], y=["a", "b"]))]
+    )
+    connection = mock.Mock()
+
+    fetcher = StorageApiFetcher()
+    assert list(fetcher.pages(rows, connection)) == [[(1, "a"), (2, "b")]]
+    rows.to_arrow_iterable.assert_called_once_with(
+        bqstorage_client=connection._bqstorage_client
+    )
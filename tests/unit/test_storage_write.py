@@ -0,0 +1,300 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+import collections
+import concurrent.futures
+import contextlib
+import datetime
+import decimal
+import threading
+import time
+
+from google.cloud.bigquery.dbapi import exceptions
+from google.cloud.bigquery.schema import SchemaField
+from google.protobuf import json_format
+import pytest
+import sqlalchemy
+import sqlalchemy.orm
+
+from sqlalchemy_bigquery._storage_write import ProtoRowSerializer
+
+from .conftest import _faux_conn, executed_statements, setup_some_table, setup_table
+
+RowError = collections.namedtuple("RowError", "index message")
+
+
+class AppendRowsResponse:
+    def __init__(self, row_errors=()):
+        self.row_errors = list(row_errors)
+
+
+class FakeTransport:
+    """Appends rows to the faux connection's tables, on a thread pool"""
+
+    def __init__(self, delay=0.0, row_errors=()):
+        self.delay = delay
+        self.row_errors = row_errors
+        self.appends = []
+        self.closed = 0
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+        self.executor = concurrent.futures.ThreadPoolExecutor(8)
+
+    def open(self, client, table):
+        return FakeStream(self, client, table)
+
+
+class FakeStream:
+    def __init__(self, transport, client, table):
+        self.transport = transport
+        self.client = client
+        self.table = table
+        self.serialize = ProtoRowSerializer(table.schema)
+
+    def append(self, serialized_rows):
+        rows = [
+            json_format.MessageToDict(
+                self.serialize.message_class.FromString(serialized_row),
+                preserving_proto_field_name=True,
+            )
+            for serialized_row in serialized_rows
+        ]
+        self.transport.appends.append(rows)
+        return self.transport.executor.submit(self._write, rows)
+
+    def _write(self, rows):
+        transport = self.transport
+        with transport.lock:
+            transport.running += 1
+            transport.max_running = max(transport.max_running, transport.running)
+        time.sleep(transport.delay)
+        with transport.lock:
+            transport.running -= 1
+            if transport.row_errors:
+                return AppendRowsResponse(transport.row_errors)
+            with contextlib.closing(self.client.connection.cursor()) as cursor:
+                for row in rows:
+                    cursor.execute(
+                        f"insert into `{self.table.table_id}` ({', '.join(row)})"
+                        f" values ({', '.join(f'%({name})s' for name in row)})",
+                        row,
+                    )
+        return AppendRowsResponse()
+
+    def close(self):
+        self.transport.closed += 1
+
+
+@contextlib.contextmanager
+def _storage_write_conn(transport=None, **engine_kwargs):
+    with _faux_conn(insert_strategy="storage_write", **engine_kwargs) as conn:
+        conn.dialect.storage_writer.transport = transport or FakeTransport()
+        yield conn
+
+
+@pytest.fixture()
+def transport():
+    return FakeTransport()
+
+
+def _table(conn):
+    return setup_some_table(conn, sqlalchemy.Column("price", sqlalchemy.Numeric))
+
+
+def _rows(n):
+    return [
+        dict(id=i, name=f"name{i}", price=decimal.Decimal(f"{i}.5")) for i in range(n)
+    ]
+
+
+def _count(conn, table):
+    count = sqlalchemy.select(sqlalchemy.func.count()).select_from(table)
+    return conn.execute(count).scalar()
+
+
+def test_insert_with_storage_write(transport):
+    with _storage_write_conn(transport) as conn:
+        table = _table(conn)
+        result = conn.execute(table.insert(), _rows(3))
+        assert result.rowcount == 3
+        assert transport.appends == [
+            [
+                dict(id="0", name="name0", price="0.5"),
+                dict(id="1", name="name1", price="1.5"),
+                dict(id="2", name="name2", price="2.5"),
+            ]
+        ]
+        assert transport.closed == 1
+
+        [batch] = result.context.bigquery_write_batches
+        assert batch.rows == 3
+        assert batch.bytes > 0
+        assert batch.latency >= 0
+
+        assert executed_statements(conn, "INSERT") == []
+        assert _count(conn, table) == 3
+
+
+def test_batches_limited_by_rows(transport):
+    with _storage_write_conn(transport, storage_write_max_batch_rows=4) as conn:
+        table = _table(conn)
+        result = conn.execute(table.insert(), _rows(10))
+        assert [batch.rows for batch in result.context.bigquery_write_batches] == [
+            4,
+            4,
+            2,
+        ]
+        assert [len(rows) for rows in transport.appends] == [4, 4, 2]
+        assert _count(conn, table) == 10
+
+
+def test_batches_limited_by_bytes(transport):
+    with _storage_write_conn(transport) as conn:
+        table = _table(conn)
+        conn.dialect.storage_writer.max_batch_bytes = 100
+        rows = [dict(id=i, name="x" * 40) for i in range(5)]
+        result = conn.execute(table.insert(), rows)
+        batches = result.context.bigquery_write_batches
+        assert [batch.rows for batch in batches] == [2, 2, 1]
+        assert all(batch.bytes <= 100 for batch in batches)
+
+
+def test_appends_pipelined():
+    transport = FakeTransport(delay=0.02)
+    with _storage_write_conn(
+        transport, storage_write_max_batch_rows=1, storage_write_max_inflight=3
+    ) as conn:
+        table = _table(conn)
+        result = conn.execute(table.insert(), _rows(8))
+        assert len(result.context.bigquery_write_batches) == 8
+        assert transport.max_running == 3
+        assert all(
+            batch.latency >= 0.02 for batch in result.context.bigquery_write_batches
+        )
+
+
+def test_row_errors():
+    transport = FakeTransport(row_errors=[RowError(1, "bad row")])
+    with _storage_write_conn(transport) as conn:
+        table = _table(conn)
+        with pytest.raises(sqlalchemy.exc.DatabaseError, match="row 1: bad row"):
+            conn.execute(table.insert(), _rows(3))
+        assert transport.closed == 1
+
+
+def test_bad_timestamp(transport):
+    with _storage_write_conn(transport) as conn:
+        table = setup_table(
+            conn,
+            "some_table",
+            sqlalchemy.Column("id", sqlalchemy.Integer),
+            sqlalchemy.Column("ts", sqlalchemy.TIMESTAMP),
+        )
+        with pytest.raises(sqlalchemy.exc.DatabaseError, match="Value of ts"):
+            conn.execute(
+                table.insert(),
+                [dict(id=1, ts=None), dict(id=2, ts="2021-02-03 04:05:06")],
+            )
+        assert transport.appends == []
+        assert transport.closed == 1
+
+
+def test_orm_add_all(transport):
+    class Base(sqlalchemy.orm.declarative_base()):
+        __abstract__ = True
+
+    class Thing(Base):
+        __tablename__ = "things"
+        id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+        name = sqlalchemy.Column(sqlalchemy.String)
+
+    with _storage_write_conn(transport) as conn:
+        Base.metadata.create_all(conn)
+        with sqlalchemy.orm.Session(conn) as session:
+            session.add_all([Thing(id=i, name=f"name{i}") for i in range(5)])
+            session.commit()
+        assert len(transport.appends) == 1
+        assert _count(conn, Thing.__table__) == 5
+
+
+def test_proto_row_serializer():
+    serialize = ProtoRowSerializer(
+        [
+            SchemaField("i", "INTEGER"),
+            SchemaField("f", "FLOAT"),
+            SchemaField("b", "BOOLEAN"),
+            SchemaField("by", "BYTES"),
+            SchemaField("d", "DATE"),
+            SchemaField("dt", "DATETIME"),
+            SchemaField("ts", "TIMESTAMP"),
+            SchemaField("n", "NUMERIC"),
+            SchemaField("tags", "STRING", mode="REPEATED"),
+            SchemaField(
+                "people",
+                "RECORD",
+                mode="REPEATED",
+                fields=[
+                    SchemaField("name", "STRING"),
+                    SchemaField(
+                        "address", "RECORD", fields=[SchemaField("zip", "INT64")]
+                    ),
+                ],
+            ),
+            SchemaField("missing", "STRING"),
+        ]
+    )
+    data = serialize(
+        dict(
+            i=1,
+            f=decimal.Decimal("1.5"),
+            b=True,
+            by=b"\x00\x01",
+            d=datetime.date(2021, 2, 3),
+            dt=datetime.datetime(2021, 2, 3, 4, 5, 6, 7),
+            ts=datetime.datetime(1970, 1, 1, 0, 0, 1, 5, tzinfo=datetime.timezone.utc),
+            n=decimal.Decimal("1.25"),
+            tags=["a", "b"],
+            people=[dict(name="x", address=dict(zip=12345)), dict(name="y")],
+            missing=None,
+        )
+    )
+    message = serialize.message_class.FromString(data)
+    assert message.i == 1
+    assert message.f == 1.5
+    assert message.b
+    assert message.by == b"\x00\x01"
+    assert message.d == "2021-02-03"
+    assert message.dt == "2021-02-03 04:05:06.000007"
+    assert message.ts == 1000005
+    assert message.n == "1.25"
+    assert list(message.tags) == ["a", "b"]
+    assert [p.name for p in message.people] == ["x", "y"]
+    assert message.people[0].address.zip == 12345
+    assert not message.people[1].HasField("address")
+    assert not message.HasField("missing")
+    assert serialize.descriptor.name == "Row"
+
+
+@pytest.mark.parametrize("value", ["false", "", 0])
+def test_proto_row_serializer_bad_boolean(value):
+    serialize = ProtoRowSerializer([SchemaField("b", "BOOLEAN")])
+    with pytest.raises(exceptions.DatabaseError, match="Value of b"):
+        serialize(dict(b=value))
@@ -0,0 +1,235 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import gc
+import time
+import tracemalloc
+
+import mock
+import packaging.version
+import pytest
+import sqlalchemy
+
+from sqlalchemy_bigquery._cursor import Cursor, PagePrefetcher, RestApiFetcher
+
+from .conftest import setup_some_table, sqlalchemy_version, wait_until
+
+
+@pytest.fixture()
+def table(faux_conn):
+    return setup_some_table(
+        faux_conn, initial_data=[dict(id=i, name=f"name{i}") for i in range(5)]
+    )
+
+
+class FakePages:
+    """Generates pages of (id, name) rows, regardless of the query"""
+
+    def __init__(self, npages, page_size):
+        self.npages = npages
+        self.page_size = page_size
+        self.fetched = 0
+
+    def __call__(self, rows, connection):
+        for p in range(self.npages):
+            self.fetched += 1
+            start = p * self.page_size
+            yield [(i, f"name{i:032}") for i in range(start, start + self.page_size)]
+
+
+def test_stream_results_uses_server_side_cursor(faux_conn, table):
+    result = faux_conn.execution_options(stream_results=True).execute(
+        sqlalchemy.select(table).order_by(table.c.id)
+    )
+    assert isinstance(result.cursor, Cursor)
+    assert [tuple(row) for row in result] == [(i, f"name{i}") for i in range(5)]
+
+
+def test_stream_results_fetches_pages_as_rows_are_consumed(faux_conn, table):
+    pages = FakePages(10, 100)
+    with mock.patch.object(RestApiFetcher, "pages", pages):
+        result = faux_conn.execution_options(stream_results=True).execute(
+            sqlalchemy.select(table)
+        )
+        # SQLAlchemy buffers the first row when the statement is executed.
+        assert pages.fetched == 1
+        result.fetchone()
+        assert pages.fetched == 1
+        result.fetchmany(150)
+        assert pages.fetched == 2
+        assert len(result.fetchall()) == 1000 - 151
+        assert pages.fetched == 10
+
+
+@pytest.mark.skipif(
+    sqlalchemy_version < packaging.version.parse("1.4.40"),
+    reason="the yield_per execution option is new in SQLAlchemy 1.4.40",
+)
+def test_yield_per_sets_page_size(faux_conn, table):
+    result = faux_conn.execution_options(yield_per=2).execute(sqlalchemy.select(table))
+    assert faux_conn.test_data["page_size"] == 2
+    assert [len(p) for p in result.partitions()] == [2, 2, 1]
+
+
+def test_without_stream_results_uses_dbapi_cursor(faux_conn, table):
+    result = faux_conn.execute(sqlalchemy.select(table))
+    assert not isinstance(result.cursor, Cursor)
+    assert faux_conn.test_data["arraysize"] == 5000
+
+
+def _peak_memory(f):
+    tracemalloc.start()
+    try:
+        f()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_stream_results_memory(faux_conn, table):
+    # Memory benchmark: iterate over 200,000 rows, in pages of 1,000.
+    # Streaming should only ever hold a page or so of rows, a small
+    # fraction of what holding the whole result would take.
+    npages, page_size = 200, 1000
+
+    def stream():
+        result = faux_conn.execution_options(stream_results=True).execute(
+            sqlalchemy.select(table)
+        )
+        count = 0
+        for _ in result:
+            count += 1
+        assert count == npages * page_size
+
+    def hold():
+        rows = [
+            row for page in FakePages(npages, page_size)(None, None) for row in page
+        ]
+        assert len(rows) == npages * page_size
+
+    with mock.patch.object(RestApiFetcher, "pages", FakePages(npages, page_size)):
+        stream_peak = _peak_memory(stream)
+
+    hold_peak = _peak_memory(hold)
+    assert stream_peak * 20 < hold_peak
+
+
+def test_prefetch_pages_results(faux_conn, table):
+    result = faux_conn.execution_options(
+        bigquery_prefetch_pages=2, yield_per=2
+    ).execute(sqlalchemy.select(table).order_by(table.c.id))
+    assert isinstance(result.cursor, Cursor)
+    assert [tuple(row) for row in result] == [(i, f"name{i}") for i in range(5)]
+
+
+def test_prefetch_pages_without_streaming(faux_conn, table):
+    result = faux_conn.execution_options(bigquery_prefetch_pages=1).execute(
+        sqlalchemy.select(table.c.id).order_by(table.c.id)
+    )
+    assert isinstance(result.cursor, Cursor)
+    assert [row.id for row in result] == list(range(5))
+
+
+def test_prefetch_pages_fetches_ahead(faux_conn, table):
+    pages = FakePages(10, 100)
+    with mock.patch.object(RestApiFetcher, "pages", pages):
+        result = faux_conn.execution_options(
+            bigquery_prefetch_pages=3, stream_results=True
+        ).execute(sqlalchemy.select(table))
+        prefetcher = result.cursor._prefetcher
+        result.fetchone()
+
+        # The page being consumed and 3 more.
+        for _ in range(100):
+            if pages.fetched == 4:
+                break
+            time.sleep(0.01)
+        time.sleep(0.05)
+        assert pages.fetched == 4
+
+        result.close()
+        prefetcher._thread.join(1)
+        assert not prefetcher._thread.is_alive()
+        assert pages.fetched == 4
+
+
+def test_prefetch_pages_error(faux_conn, table):
+    def pages(fetcher, rows, connection):
+        yield [(1, "a")]
+        raise ValueError("oops")
+
+    with mock.patch.object(RestApiFetcher, "pages", pages):
+        result = faux_conn.execution_options(bigquery_prefetch_pages=2).execute(
+            sqlalchemy.select(table)
+        )
+        with pytest.raises(ValueError, match="oops"):
+            result.fetchall()
+
+
+def test_prefetch_pages_overlaps_fetching_and_processing():
+    # Throughput benchmark: fetching and processing a page take the same
+    # time, so overlapping them should take about half the time.
+    delay = 0.02
+
+    def pages():
+        for i in range(10):
+            time.sleep(delay)
+            yield [i]
+
+    def process(pages):
+        start = time.perf_counter()
+        for _ in pages:
+            time.sleep(delay)
+        return time.perf_counter() - start
+
+    sequential = process(pages())
+    prefetched = process(PagePrefetcher(pages(), 2))
+    assert prefetched < sequential * 0.75
+
+
+def test_prefetcher_close_stops_worker():
+    fetched = []
+
+    def pages():
+        for i in range(10):
+            fetched.append(i)
+            yield [i]
+
+    prefetcher = PagePrefetcher(pages(), 2)
+    assert next(prefetcher) == [0]
+    prefetcher.close()
+    prefetcher._thread.join(1)
+    assert not prefetcher._thread.is_alive()
+    assert len(fetched) <= 3
+    assert list(prefetcher) == []
+
+
+def test_prefetch_pages_stops_for_unclosed_result(faux_conn, table):
+    pages = FakePages(10, 100)
+    with mock.patch.object(RestApiFetcher, "pages", pages):
+        result = faux_conn.execution_options(
+            bigquery_prefetch_pages=3, stream_results=True
+        ).execute(sqlalchemy.select(table))
+        thread = result.cursor._prefetcher._thread
+        result.fetchone()
+
+        del result
+        gc.collect()
+        wait_until(lambda: not thread.is_alive())
+        assert pages.fetched <= 4
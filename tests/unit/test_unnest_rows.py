@@ -0,0 +1,235 @@
+# Copyright (c) 2021 The sqlalchemy-bigquery Authors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+import decimal
+
+from google.cloud.bigquery import ArrayQueryParameter, StructQueryParameter
+from google.cloud.bigquery.query import ScalarQueryParameter
+import pytest
+import sqlalchemy
+
+from .conftest import executed_statements, setup_some_table
+
+
+def _table(conn, *columns):
+    return setup_some_table(
+        conn, *columns, initial_data=[dict(id=i, name=f"name{i}") for i in range(5)]
+    )
+
+
+def _rows(conn, table):
+    return [
+        tuple(row)
+        for row in conn.execute(
+            sqlalchemy.select(table.c.id, table.c.name).order_by(table.c.id)
+        )
+    ]
+
+
+def test_update(faux_conn):
+    table = _table(faux_conn)
+    result = faux_conn.execute(
+        table.update().where(table.c.id == sqlalchemy.bindparam("k")),
+        [dict(k=1, name="one"), dict(k=3, name="three"), dict(k=9, name="nine")],
+    )
+    assert result.rowcount == 2
+    assert executed_statements(faux_conn, "UPDATE") == [
+        (
+            "UPDATE `some_table` SET `name`=`bigquery_rows`.`name`"
+            " FROM unnest(%(bigquery_rows:ARRAY<STRUCT<name STRING, k INT64>>)s)"
+            " AS `bigquery_rows` WHERE `some_table`.`id` = `bigquery_rows`.`k`",
+            dict(
+                bigquery_rows=[
+                    dict(name="one", k=1),
+                    dict(name="three", k=3),
+                    dict(name="nine", k=9),
+                ]
+            ),
+        )
+    ]
+    assert _rows(faux_conn, table) == [
+        (0, "name0"),
+        (1, "one"),
+        (2, "name2"),
+        (3, "three"),
+        (4, "name4"),
+    ]
+
+
+def test_update_with_constants_and_expressions(faux_conn):
+    table = _table(faux_conn, sqlalchemy.Column("x", sqlalchemy.Integer))
+    faux_conn.execute(
+        table.update()
+        .where(table.c.id == sqlalchemy.bindparam("k"))
+        .where(table.c.name != "name3")
+        .values(x=sqlalchemy.bindparam("new_x", type_=sqlalchemy.Integer) + 1),
+        [dict(k=1, new_x=10), dict(k=3, new_x=30)],
+    )
+    [(sql, parameters)] = executed_statements(faux_conn, "UPDATE")
+    assert sql == (
+        "UPDATE `some_table` SET `x`=(`bigquery_rows`.`new_x` + %(param_1:INT64)s)"
+        " FROM unnest(%(bigquery_rows:ARRAY<STRUCT<new_x INT64, k INT64>>)s)"
+        " AS `bigquery_rows` WHERE `some_table`.`id` = `bigquery_rows`.`k`"
+        " AND `some_table`.`name` != %(name_1:STRING)s"
+    )
+    assert parameters == dict(
+        param_1=1,
+        name_1="name3",
+        bigquery_rows=[dict(k=1, new_x=10), dict(k=3, new_x=30)],
+    )
+    assert [
+        tuple(row)
+        for row in faux_conn.execute(
+            sqlalchemy.select(table.c.id, table.c.x).order_by(table.c.id)
+        )
+    ] == [(0, None), (1, 11), (2, None), (3, None), (4, None)]
+
+
+def test_delete(faux_conn):
+    table = _table(faux_conn)
+    result = faux_conn.execute(
+        table.delete().where(table.c.id == sqlalchemy.bindparam("k")),
+        [dict(k=1), dict(k=3), dict(k=3)],
+    )
+    assert result.rowcount == 2
+    assert executed_statements(faux_conn, "DELETE") == [
+        (
+            "DELETE FROM `some_table` WHERE EXISTS (SELECT * \n"
+            "FROM unnest(%(bigquery_rows:ARRAY<STRUCT<k INT64>>)s)"
+            " AS `bigquery_rows` \n"
+            "WHERE `some_table`.`id` = `bigquery_rows`.`k`)",
+            dict(bigquery_rows=[dict(k=1), dict(k=3), dict(k=3)]),
+        )
+    ]
+    assert _rows(faux_conn, table) == [(0, "name0"), (2, "name2"), (4, "name4")]
+
+
+def test_native_query_parameters(native_faux_conn):
+    table = _table(native_faux_conn)
+    native_faux_conn.execute(
+        table.update().where(table.c.id == sqlalchemy.bindparam("k")),
+        [dict(k=1, name="one"), dict(k=3, name="three")],
+    )
+    [(sql, parameters)] = executed_statements(native_faux_conn, "UPDATE")
+    assert sql == (
+        "UPDATE `some_table` SET `name`=`bigquery_rows`.`name`"
+        " FROM unnest(@bigquery_rows) AS `bigquery_rows`"
+        " WHERE `some_table`.`id` = `bigquery_rows`.`k`"
+    )
+    [parameter] = parameters
+    assert isinstance(parameter, ArrayQueryParameter)
+    assert parameter.name == "bigquery_rows"
+    assert parameter.values == [
+        StructQueryParameter(
+            None,
+            ScalarQueryParameter("name", "STRING", "one"),
+            ScalarQueryParameter("k", "INT64", 1),
+        ),
+        StructQueryParameter(
+            None,
+            ScalarQueryParameter("name", "STRING", "three"),
+            ScalarQueryParameter("k", "INT64", 3),
+        ),
+    ]
+    assert _rows(native_faux_conn, table)[1::2] == [(1, "one"), (3, "three")]
+
+
+def test_numeric_fields_widened(faux_conn):
+    table = _table(faux_conn, sqlalchemy.Column("x", sqlalchemy.Numeric))
+    faux_conn.execute(
+        table.update().where(table.c.id == sqlalchemy.bindparam("k")),
+        [dict(k=1, x=decimal.Decimal("1.5")), dict(k=2, x=decimal.Decimal("1.5"))],
+    )
+    faux_conn.execute(
+        table.update().where(table.c.id == sqlalchemy.bindparam("k")),
+        [
+            dict(k=1, x=decimal.Decimal("1.5")),
+            dict(k=2, x=decimal.Decimal("1." + "1" * 12)),
+        ],
+    )
+    [(sql1, _), (sql2, _)] = executed_statements(faux_conn, "UPDATE")
+    assert "ARRAY<STRUCT<x NUMERIC, k INT64>>" in sql1
+    assert "ARRAY<STRUCT<x BIGNUMERIC, k INT64>>" in sql2
+
+
+def test_pages(faux_conn):
+    table = _table(faux_conn)
+    faux_conn.dialect.unnest_executemany_page_size = 2
+    result = faux_conn.execute(
+        table.delete().where(table.c.id == sqlalchemy.bindparam("k")),
+        [dict(k=i) for i in range(5)],
+    )
+    assert result.rowcount == 5
+    assert [
+        len(parameters["bigquery_rows"])
+        for _, parameters in executed_statements(faux_conn, "DELETE")
+    ] == [2, 2, 1]
+    assert _rows(faux_conn, table) == []
+
+
+@pytest.mark.parametrize(
+    "where",
+    [
+        # Rows aren't picked by key.
+        lambda t: t.c.id > sqlalchemy.bindparam("k"),
+        lambda t: sqlalchemy.or_(
+            t.c.id == sqlalchemy.bindparam("k"), t.c.name == "name0"
+        ),
+        # Nothing picks rows.
+        lambda t: t.c.name != "x",
+    ],
+)
+def test_not_picked_by_key(faux_conn, where):
+    table = _table(faux_conn)
+    faux_conn.execute(
+        table.update().where(where(table)).values(name=sqlalchemy.bindparam("n")),
+        [dict(k=1, n="a"), dict(k=3, n="b")],
+    )
+    assert len(executed_statements(faux_conn, "UPDATE")) == 2
+    assert "unnest" not in executed_statements(faux_conn, "UPDATE")[0][0]
+
+
+def test_update_duplicate_keys_run_per_row(faux_conn):
+    table = _table(faux_conn)
+    faux_conn.execute(
+        table.update().where(table.c.id == sqlalchemy.bindparam("k")),
+        [dict(k=1, name="a"), dict(k=1, name="b")],
+    )
+    assert len(executed_statements(faux_conn, "UPDATE")) == 2
+    assert _rows(faux_conn, table)[1] == (1, "b")
+
+
+def test_disabled(faux_conn):
+    table = _table(faux_conn)
+    faux_conn.execution_options(bigquery_unnest_executemany=False).execute(
+        table.delete().where(table.c.id == sqlalchemy.bindparam("k")),
+        [dict(k=1), dict(k=3)],
+    )
+    assert len(executed_statements(faux_conn, "DELETE")) == 2
+
+
+def test_disabled_by_dialect(faux_conn):
+    table = _table(faux_conn)
+    faux_conn.dialect.unnest_executemany = False
+    faux_conn.execute(
+        table.delete().where(table.c.id == sqlalchemy.bindparam("k")),
+        [dict(k=1), dict(k=3)],
+    )
+    assert len(executed_statements(faux_conn, "DELETE")) == 2